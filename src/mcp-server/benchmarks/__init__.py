@@ -0,0 +1 @@
+"""Performance benchmarks for the orchestrator MCP server."""
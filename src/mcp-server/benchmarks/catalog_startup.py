@@ -0,0 +1,95 @@
+"""Benchmark tool catalog loading at startup.
+
+Generates synthetic tool definitions in a temporary directory and times a
+cold load, a cold load that writes the catalog cache and a warm load from
+the cache for each catalog size.
+
+Usage:
+    python -m benchmarks.catalog_startup [--sizes 1000 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from orchestrator.registry.catalog_cache import CatalogCache, load_catalog
+
+
+def write_catalog(tools_dir: Path, count: int) -> None:
+    """Write `count` valid tool definitions into `tools_dir`."""
+    for i in range(count):
+        definition = {
+            "name": f"bench.tool_{i:05d}",
+            "description": f"Synthetic benchmark tool number {i}.",
+            "adapter": "revit",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "element_id": {"type": "integer", "description": "Element id"},
+                    "category": {"type": "string", "description": "Category name"},
+                },
+                "required": ["element_id"],
+            },
+        }
+        (tools_dir / f"bench.tool_{i:05d}.json").write_text(
+            json.dumps(definition, indent=2), encoding="utf-8"
+        )
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(sizes: list[int]) -> list[dict[str, float | int]]:
+    rows = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            tools_dir = Path(tmp) / "tools"
+            tools_dir.mkdir()
+            write_catalog(tools_dir, size)
+            cache_path = Path(tmp) / "catalog.json"
+
+            serial_ms, _ = _timed(lambda: load_catalog(tools_dir))
+            cold_ms, _ = _timed(lambda: load_catalog(tools_dir, cache=CatalogCache(cache_path)))
+            warm_ms, warm = _timed(
+                lambda: load_catalog(tools_dir, cache=CatalogCache(cache_path))
+            )
+            assert warm.hits == size, f"expected {size} cache hits, got {warm.hits}"
+            rows.append({
+                "tools": size,
+                "cold_ms": serial_ms,
+                "cold_with_cache_write_ms": cold_ms,
+                "warm_cache_ms": warm_ms,
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = run(args.sizes)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'tools':>7} {'cold':>10} {'cache write':>12} {'warm':>10}")
+    for row in rows:
+        print(
+            f"{row['tools']:>7} {row['cold_ms']:>8.0f}ms "
+            f"{row['cold_with_cache_write_ms']:>10.0f}ms "
+            f"{row['warm_cache_ms']:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
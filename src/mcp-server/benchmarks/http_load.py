@@ -0,0 +1,259 @@
+"""Load-test the MCP server over HTTP with many concurrent client sessions.
+
+Starts the server with ``ORCHESTRATOR_TRANSPORT=streamable-http`` (or
+``sse``) on a free local port, or targets a running server with ``--url``.
+Each simulated client opens its own MCP session and makes `--calls` tool
+calls, `--concurrency` at a time. The report gives throughput, call
+latency percentiles, the spread of per-session throughput (how fairly the
+server schedules sessions) and the server's ``/status`` afterwards.
+
+The default call is ``results.read`` on a handle that does not exist. It
+runs the full MCP and dispatch path without needing Revit; pass `--tool`
+and `--args` to load a real tool.
+
+Usage:
+    python -m benchmarks.http_load [--clients 50] [--calls 20] [--concurrency 1]
+        [--transport streamable-http|sse] [--url http://127.0.0.1:8000]
+        [--tool results.read] [--args '{"result_handle": "r-missing"}'] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import httpx
+from mcp import ClientSession
+
+SERVER_DIR = Path(__file__).parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_up(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                if (await client.get(f"{base_url}/status")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Server at {base_url} did not start within {timeout:.0f} s")
+            await asyncio.sleep(0.2)
+
+
+@asynccontextmanager
+async def _server(transport: str) -> AsyncIterator[str]:
+    """Run the orchestrator in a subprocess; yields its base URL."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "ORCHESTRATOR_TRANSPORT": transport,
+        "ORCHESTRATOR_HTTP_PORT": str(port),
+        "ORCHESTRATOR_WATCH_TOOLS": "false",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "orchestrator.server"],
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_until_up(base_url)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+@asynccontextmanager
+async def _session(base_url: str, transport: str) -> AsyncIterator[ClientSession]:
+    if transport == "sse":
+        from mcp.client.sse import sse_client
+
+        streams = sse_client(f"{base_url}/sse")
+    else:
+        from mcp.client.streamable_http import streamablehttp_client
+
+        streams = streamablehttp_client(f"{base_url}/mcp")
+    async with streams as (read, write, *_):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+async def _client(
+    base_url: str,
+    transport: str,
+    tool: str,
+    tool_args: dict[str, Any],
+    calls: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """One simulated MCP client; returns its latencies and error counts."""
+    latencies: list[float] = []
+    failures = 0  # transport or protocol errors
+    tool_errors = 0  # calls answered with success=false
+    started = time.perf_counter()
+    async with _session(base_url, transport) as session:
+        remaining = iter(range(calls))
+
+        async def worker() -> None:
+            nonlocal failures, tool_errors
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    result = await session.call_tool(tool, {"arguments": tool_args})
+                except Exception:
+                    failures += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                if result.isError:
+                    failures += 1
+                elif result.structuredContent is not None:
+                    payload = result.structuredContent.get("result", result.structuredContent)
+                    tool_errors += 0 if payload.get("success", True) else 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {
+        "latencies": latencies,
+        "failures": failures,
+        "tool_errors": tool_errors,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _run(
+    base_url: str,
+    transport: str,
+    clients: int,
+    calls: int,
+    concurrency: int,
+    tool: str,
+    tool_args: dict[str, Any],
+) -> dict[str, Any]:
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(_client(base_url, transport, tool, tool_args, calls, concurrency) for _ in range(clients)),
+        return_exceptions=True,
+    )
+    wall = time.perf_counter() - start
+    sessions = [o for o in outcomes if isinstance(o, dict)]
+    latencies = [ms for o in sessions for ms in o["latencies"]]
+    per_session = [len(o["latencies"]) / o["seconds"] for o in sessions if o["seconds"]]
+    async with httpx.AsyncClient() as http:
+        status = (await http.get(f"{base_url}/status")).json()
+    return {
+        "transport": transport,
+        "clients": clients,
+        "sessions_failed": len(outcomes) - len(sessions),
+        "calls": len(latencies),
+        "failures": sum(o["failures"] for o in sessions),
+        "tool_errors": sum(o["tool_errors"] for o in sessions),
+        "wall_seconds": round(wall, 3),
+        "calls_per_second": round(len(latencies) / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "session_calls_per_second": {
+            "min": round(min(per_session, default=0.0), 1),
+            "median": round(statistics.median(per_session), 1) if per_session else 0.0,
+            "max": round(max(per_session, default=0.0), 1),
+        },
+        "server": status,
+    }
+
+
+async def run(
+    clients: int,
+    calls: int,
+    concurrency: int,
+    transport: str,
+    tool: str,
+    tool_args: dict[str, Any],
+    url: str | None = None,
+) -> dict[str, Any]:
+    if url is not None:
+        return await _run(url.rstrip("/"), transport, clients, calls, concurrency, tool, tool_args)
+    async with _server(transport) as base_url:
+        return await _run(base_url, transport, clients, calls, concurrency, tool, tool_args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=20, help="Tool calls per client")
+    parser.add_argument("--concurrency", type=int, default=1, help="Calls in flight per client")
+    parser.add_argument("--transport", choices=["streamable-http", "sse"], default="streamable-http")
+    parser.add_argument("--url", default=None, help="Use a running server instead of starting one")
+    parser.add_argument("--tool", default="results.read")
+    parser.add_argument("--args", default='{"result_handle": "r-missing"}', help="Tool arguments (JSON)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(
+        run(
+            args.clients, args.calls, args.concurrency, args.transport,
+            args.tool, json.loads(args.args), args.url,
+        )
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    latency = report["latency_ms"]
+    spread = report["session_calls_per_second"]
+    print(
+        f"{report['clients']} clients over {report['transport']}: {report['calls']} calls "
+        f"in {report['wall_seconds']:.2f} s ({report['calls_per_second']:.0f} calls/s)"
+    )
+    print(
+        f"latency p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+        f"p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms"
+    )
+    print(
+        f"per-session calls/s min {spread['min']:.1f}, median {spread['median']:.1f}, "
+        f"max {spread['max']:.1f}"
+    )
+    print(
+        f"failures {report['failures']}, tool errors {report['tool_errors']}, "
+        f"failed sessions {report['sessions_failed']}"
+    )
+    scheduler = report["server"].get("scheduler") or {}
+    print(
+        f"server: {report['server']['sessions']['opened']} sessions opened, "
+        f"{scheduler.get('rejected', 0)} calls rejected as busy"
+    )
+
+
+if __name__ == "__main__":
+    main()
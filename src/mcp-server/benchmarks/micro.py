@@ -0,0 +1,520 @@
+"""Microbenchmarks for the orchestrator's hot paths, with saved baselines.
+
+Cases are grouped by the code they exercise:
+
+    protocol    encode_message / decode_payload for 1 KB to 8 MB payloads
+    validate    validate_tool_args on bundled tool schemas and examples
+    dispatch    Dispatcher.dispatch with a stub adapter, against a direct
+                adapter call
+    registry    ToolRegistry.load_from_directory with 10, 1k and 10k tools,
+                cold (serial parse and validation) and from the catalog cache
+    providers   Claude and OpenAI message conversion on long histories, cold
+                and through the per-provider conversion cache
+
+Each case is run in batches sized so one batch takes at least
+``--min-time`` seconds, and the per-operation time of ``--repeats``
+batches is reported (median and min). ``--save`` writes the results as a
+JSON baseline; ``compare`` (or ``run --compare``) reports the change in
+each case's fastest batch against a baseline and exits with status 1 when
+any case is slower by more than ``--threshold``. The fastest batch is the
+one least disturbed by other work on the machine, so it is the most
+repeatable figure to compare.
+
+Baselines are only comparable on the same machine and Python version.
+
+Usage:
+    python -m benchmarks.micro run [-k protocol] [--save base.json] [--compare base.json]
+    python -m benchmarks.micro compare base.json current.json [--threshold 0.2]
+    python -m benchmarks.micro list
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from orchestrator.adapters.base import BaseAdapter
+from orchestrator.dispatcher.dispatcher import Dispatcher
+from orchestrator.dispatcher.result import ToolResult
+from orchestrator.dispatcher.result_store import ResultStore
+from orchestrator.llm import claude_provider, openai_provider
+from orchestrator.llm.base import LLMToolCall, Message, MessageConversionCache
+from orchestrator.llm.claude_provider import ClaudeProvider
+from orchestrator.llm.openai_provider import OpenAIProvider
+from orchestrator.pipe.protocol import (
+    HEADER_SIZE,
+    decode_payload,
+    encode_message,
+    make_tool_result,
+)
+from orchestrator.registry.catalog_cache import CatalogCache
+from orchestrator.registry.registry import ToolRegistry
+from orchestrator.registry.schema_validator import validate_tool_args
+
+from .catalog_startup import write_catalog
+
+BASELINE_VERSION = 1
+SERVER_DIR = Path(__file__).parent.parent
+TOOLS_DIR = SERVER_DIR / "orchestrator" / "tools"
+HANDLERS_DIR = SERVER_DIR / "orchestrator" / "handlers"
+
+# A case's setup returns a function that performs the operation n times
+Runner = Callable[[int], None]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[ExitStack], Runner]
+
+
+def _loop_runner(loop: asyncio.AbstractEventLoop, op: Callable[[], Any]) -> Runner:
+    """Run an async operation n times inside one event loop turn."""
+
+    async def many(n: int) -> None:
+        for _ in range(n):
+            await op()
+
+    return lambda n: loop.run_until_complete(many(n))
+
+
+def _repeat(op: Callable[[], Any]) -> Runner:
+    def run(n: int) -> None:
+        for _ in range(n):
+            op()
+
+    return run
+
+
+# -- protocol ----------------------------------------------------------------
+
+PAYLOAD_SIZES = {"1KB": 1 << 10, "64KB": 64 << 10, "1MB": 1 << 20, "8MB": 8 << 20}
+
+
+def _tool_result_message(size: int) -> dict[str, Any]:
+    """A tool_result message whose JSON is roughly `size` bytes."""
+    element = {
+        "element_id": 100000,
+        "category": "Walls",
+        "name": "Basic Wall: Generic - 200mm",
+        "level": "Level 1",
+        "bounding_box": [12.5, 40.25, 0.0, 32.5, 41.0, 10.0],
+    }
+    per_element = len(json.dumps(element, separators=(",", ":"))) + 1
+    elements = [
+        {**element, "element_id": 100000 + i} for i in range(max(1, size // per_element))
+    ]
+    return make_tool_result("call-1", True, {"elements": elements}, 12)
+
+
+def protocol_cases() -> list[Case]:
+    cases = []
+    for label, size in PAYLOAD_SIZES.items():
+        def encode(stack: ExitStack, size: int = size) -> Runner:
+            message = _tool_result_message(size)
+            return _repeat(lambda: encode_message(message))
+
+        def decode(stack: ExitStack, size: int = size) -> Runner:
+            payload = encode_message(_tool_result_message(size))[HEADER_SIZE:]
+            return _repeat(lambda: decode_payload(payload))
+
+        cases.append(Case(f"protocol.encode_message[{label}]", encode))
+        cases.append(Case(f"protocol.decode_payload[{label}]", decode))
+    return cases
+
+
+# -- validate ----------------------------------------------------------------
+
+VALIDATED_TOOLS = ["revit.get_element_info", "revit.query_elements", "flow.sweep_dynamo_graph"]
+
+
+def _tool_definition(name: str) -> dict[str, Any]:
+    return json.loads((TOOLS_DIR / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def validate_cases() -> list[Case]:
+    cases = []
+    for name in VALIDATED_TOOLS:
+        def valid(stack: ExitStack, name: str = name) -> Runner:
+            definition = _tool_definition(name)
+            args = definition["examples"][0]["args"]
+            assert not validate_tool_args(args, definition["parameters"]), name
+            return _repeat(lambda: validate_tool_args(args, definition["parameters"]))
+
+        cases.append(Case(f"validate.valid[{name}]", valid))
+
+    def invalid(stack: ExitStack) -> Runner:
+        definition = _tool_definition("revit.query_elements")
+        args = {"categories": "Walls", "fields": ["colour"], "max_elements": 0}
+        assert validate_tool_args(args, definition["parameters"])
+        return _repeat(lambda: validate_tool_args(args, definition["parameters"]))
+
+    cases.append(Case("validate.invalid[revit.query_elements]", invalid))
+    return cases
+
+
+# -- dispatch ----------------------------------------------------------------
+
+
+class _StubAdapter(BaseAdapter):
+    """Answers every call immediately without running the handler."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._result = {"element_id": 12345, "category": "Walls"}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def execute(self, tool_name: str, args: dict[str, Any], handler: Any) -> ToolResult:
+        return ToolResult.ok(dict(self._result))
+
+    async def is_available(self) -> bool:
+        return True
+
+
+def _dispatcher(stack: ExitStack, with_store: bool = False) -> tuple[Dispatcher, asyncio.AbstractEventLoop]:
+    registry = ToolRegistry()
+    registry.load_from_directory(TOOLS_DIR)
+    adapters = {name: _StubAdapter(name) for name in ("revit", "pyrevit", "dynamo", "workflow")}
+    dispatcher = Dispatcher(registry, adapters, HANDLERS_DIR)
+    dispatcher.on_mutation(lambda tool_name, args, result: None)
+    if with_store:
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        dispatcher.set_result_store(ResultStore(spill_dir=tmp))
+    loop = asyncio.new_event_loop()
+    stack.callback(loop.close)
+    return dispatcher, loop
+
+
+def dispatch_cases() -> list[Case]:
+    def direct(stack: ExitStack) -> Runner:
+        adapter = _StubAdapter("revit")
+        loop = asyncio.new_event_loop()
+        stack.callback(loop.close)
+        args = {"element_id": 12345}
+        return _loop_runner(loop, lambda: adapter.execute("revit.get_element_info", args, None))
+
+    def call(tool: str, args: dict[str, Any], offload: bool = False) -> Callable[[ExitStack], Runner]:
+        def setup(stack: ExitStack) -> Runner:
+            dispatcher, loop = _dispatcher(stack, with_store=offload)
+            result = loop.run_until_complete(dispatcher.dispatch(tool, args, offload=offload))
+            assert result.success or result.error_code == "TOOL_NOT_FOUND", result.error_message
+            return _loop_runner(loop, lambda: dispatcher.dispatch(tool, args, offload=offload))
+
+        return setup
+
+    wall = _tool_definition("revit.create_wall")["examples"][0]["args"]
+    query = {"categories": ["Walls"], "fields": ["category", "name", "level"]}
+    return [
+        Case("dispatch.adapter_direct", direct),
+        Case("dispatch.read_only[revit.get_element_info]", call("revit.get_element_info", {"element_id": 12345})),
+        Case("dispatch.mutation[revit.create_wall]", call("revit.create_wall", wall)),
+        Case("dispatch.offload[revit.query_elements]", call("revit.query_elements", query, offload=True)),
+        Case("dispatch.unknown_tool", call("revit.no_such_tool", {})),
+    ]
+
+
+# -- registry ----------------------------------------------------------------
+
+REGISTRY_SIZES = [10, 1000, 10000]
+
+
+def _catalog_dir(stack: ExitStack, size: int) -> Path:
+    tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+    tools_dir = tmp / "tools"
+    tools_dir.mkdir()
+    write_catalog(tools_dir, size)
+    return tools_dir
+
+
+def registry_cases() -> list[Case]:
+    cases = []
+    for size in REGISTRY_SIZES:
+        def cold(stack: ExitStack, size: int = size) -> Runner:
+            tools_dir = _catalog_dir(stack, size)
+            return _repeat(lambda: ToolRegistry().load_from_directory(tools_dir))
+
+        def warm(stack: ExitStack, size: int = size) -> Runner:
+            tools_dir = _catalog_dir(stack, size)
+            cache_path = tools_dir.parent / "catalog.json"
+            ToolRegistry().load_from_directory(tools_dir, cache=CatalogCache(cache_path))
+            return _repeat(
+                lambda: ToolRegistry().load_from_directory(
+                    tools_dir, cache=CatalogCache(cache_path)
+                )
+            )
+
+        cases.append(Case(f"registry.load_cold[{size}]", cold))
+        cases.append(Case(f"registry.load_cached[{size}]", warm))
+    return cases
+
+
+# -- providers ---------------------------------------------------------------
+
+HISTORY_LENGTHS = [100, 1000]
+
+
+def _history(length: int) -> list[Message]:
+    """A conversation of user requests, tool calls and JSON tool results."""
+    result = json.dumps({
+        "elements": [
+            {"element_id": 2000 + i, "category": "Walls", "level": "Level 1", "length": 12.5 + i}
+            for i in range(20)
+        ]
+    })
+    messages = [Message(role="system", content="You operate Revit through tools.")]
+    turn = 0
+    while len(messages) < length:
+        call_id = f"call_{turn}"
+        messages += [
+            Message(role="user", content=f"List the walls on level {turn % 5 + 1} longer than 10 ft"),
+            Message(
+                role="assistant",
+                content="",
+                tool_calls=[LLMToolCall(
+                    id=call_id,
+                    name="revit.query_elements",
+                    arguments={"categories": ["Walls"], "fields": ["level"], "parameters": ["Length"]},
+                )],
+            ),
+            Message(role="tool", content=result, tool_call_id=call_id),
+            Message(role="assistant", content=f"There are 20 walls on level {turn % 5 + 1}."),
+        ]
+        turn += 1
+    return messages[:length]
+
+
+def provider_cases() -> list[Case]:
+    catalog = [_tool_definition(path.stem) for path in sorted(TOOLS_DIR.glob("*.json"))]
+    providers: dict[str, tuple[Any, Callable[[], Any]]] = {
+        "claude": (claude_provider._to_api_message, lambda: ClaudeProvider(api_key="benchmark")),
+        "openai": (openai_provider._to_api_message, lambda: OpenAIProvider(api_key="benchmark")),
+    }
+    cases = []
+    for provider_name, (to_api, make_provider) in providers.items():
+        for length in HISTORY_LENGTHS:
+            def cold(stack: ExitStack, to_api: Any = to_api, length: int = length) -> Runner:
+                history = _history(length)
+                return _repeat(lambda: MessageConversionCache(to_api).convert(history))
+
+            def cached(
+                stack: ExitStack, make_provider: Callable[[], Any] = make_provider, length: int = length
+            ) -> Runner:
+                history = _history(length)
+                provider = make_provider()
+                tools = provider.format_tools(catalog)
+                provider._build_request(history, tools, 0.0)
+                return _repeat(lambda: provider._build_request(history, tools, 0.0))
+
+            cases.append(Case(f"providers.{provider_name}.convert_cold[{length}]", cold))
+            cases.append(Case(f"providers.{provider_name}.build_request_cached[{length}]", cached))
+    return cases
+
+
+GROUPS: dict[str, Callable[[], list[Case]]] = {
+    "protocol": protocol_cases,
+    "validate": validate_cases,
+    "dispatch": dispatch_cases,
+    "registry": registry_cases,
+    "providers": provider_cases,
+}
+
+
+def all_cases() -> list[Case]:
+    return [case for make in GROUPS.values() for case in make()]
+
+
+# -- running -----------------------------------------------------------------
+
+
+def _time_batch(run: Runner, n: int) -> float:
+    """Seconds to run `n` operations, with garbage collection paused (as timeit)."""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        run(n)
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(run: Runner, min_time: float, repeats: int) -> dict[str, Any]:
+    """Time `run` in batches of at least `min_time` seconds."""
+    n = 1
+    elapsed = _time_batch(run, n)
+    while elapsed < min_time:
+        # Grow towards min_time, at most 10x per step
+        n = max(n + 1, min(n * 10, int(n * min_time * 1.2 / max(elapsed, 1e-9))))
+        elapsed = _time_batch(run, n)
+    samples = [elapsed] + [_time_batch(run, n) for _ in range(repeats - 1)]
+    per_op_us = sorted(s / n * 1e6 for s in samples)
+    return {
+        "median_us": round(statistics.median(per_op_us), 3),
+        "min_us": round(per_op_us[0], 3),
+        "max_us": round(per_op_us[-1], 3),
+        "ops_per_batch": n,
+        "repeats": repeats,
+    }
+
+
+def run_suite(
+    cases: list[Case], min_time: float, repeats: int, echo: Callable[[str], None] | None = None
+) -> dict[str, Any]:
+    results = {}
+    for case in cases:
+        with ExitStack() as stack:
+            runner = case.setup(stack)
+            results[case.name] = measure(runner, min_time, repeats)
+        if echo is not None:
+            echo(f"{case.name:<56} {_format_us(results[case.name]['median_us']):>10}")
+    return {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    report_missing: bool = True,
+) -> dict[str, Any]:
+    """Relative change of each case's fastest batch; slower than 1 + threshold regresses."""
+    rows = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            rows.append({"name": name, "status": "new", "current_us": now["min_us"]})
+            continue
+        change = now["min_us"] / before["min_us"] - 1 if before["min_us"] else 0.0
+        status = "regressed" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append({
+            "name": name,
+            "status": status,
+            "baseline_us": before["min_us"],
+            "current_us": now["min_us"],
+            "change": round(change, 4),
+        })
+    if report_missing:
+        for name in sorted(baseline["results"].keys() - current["results"].keys()):
+            rows.append({"name": name, "status": "missing", "baseline_us": baseline["results"][name]["min_us"]})
+    if baseline.get("python") != current.get("python") or baseline.get("machine") != current.get("machine"):
+        logging.warning(
+            "Baseline was recorded on Python %s/%s; this run is Python %s/%s",
+            baseline.get("python"), baseline.get("machine"),
+            current.get("python"), current.get("machine"),
+        )
+    return {
+        "threshold": threshold,
+        "regressions": sum(row["status"] == "regressed" for row in rows),
+        "rows": rows,
+    }
+
+
+def _format_us(us: float) -> str:
+    if us >= 1_000_000:
+        return f"{us / 1_000_000:.2f}s"
+    if us >= 1000:
+        return f"{us / 1000:.2f}ms"
+    return f"{us:.2f}us"
+
+
+def _print_comparison(report: dict[str, Any]) -> None:
+    print(f"\n{'case (fastest batch)':<56} {'baseline':>10} {'current':>10} {'change':>8}")
+    for row in report["rows"]:
+        baseline = _format_us(row["baseline_us"]) if "baseline_us" in row else "-"
+        current = _format_us(row["current_us"]) if "current_us" in row else "-"
+        change = f"{row['change']:+.1%}" if "change" in row else ""
+        flag = "" if row["status"] == "ok" else f"  {row['status']}"
+        print(f"{row['name']:<56} {baseline:>10} {current:>10} {change:>8}{flag}")
+    print(
+        f"\n{report['regressions']} case(s) slower than the baseline by more than "
+        f"{report['threshold']:.0%}"
+    )
+
+
+def _select(cases: list[Case], patterns: list[str] | None) -> list[Case]:
+    if not patterns:
+        return cases
+    return [case for case in cases if any(p in case.name for p in patterns)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("-k", dest="patterns", action="append", help="Only cases whose name contains this")
+    run_parser.add_argument("--min-time", type=float, default=0.1, help="Seconds per timed batch")
+    run_parser.add_argument("--repeats", type=int, default=7, help="Timed batches per case")
+    run_parser.add_argument("--save", type=Path, default=None, help="Write results to this JSON baseline")
+    run_parser.add_argument("--compare", type=Path, default=None, help="Compare against this baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved results")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    compare_parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    commands.add_parser("list", help="List benchmark cases")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == "list":
+        for case in all_cases():
+            print(case.name)
+        return
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        report = compare(baseline, current, args.threshold)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_comparison(report)
+        sys.exit(1 if report["regressions"] else 0)
+
+    cases = _select(all_cases(), args.patterns)
+    if not cases:
+        raise SystemExit("No benchmark cases match")
+    results = run_suite(cases, args.min_time, args.repeats, echo=print)
+    if args.save is not None:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved {len(results['results'])} results to {args.save}")
+    if args.compare is not None:
+        report = compare(
+            json.loads(args.compare.read_text(encoding="utf-8")),
+            results,
+            args.threshold,
+            report_missing=not args.patterns,
+        )
+        _print_comparison(report)
+        sys.exit(1 if report["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    main()
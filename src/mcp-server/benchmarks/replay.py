@@ -0,0 +1,311 @@
+"""Replay a captured workload against the dispatcher or a pipe endpoint.
+
+Reads a capture log written with ``ORCHESTRATOR_CAPTURE`` (see
+`orchestrator/traffic.py`) and issues its calls again at their captured
+times. ``--speed`` divides the gaps between calls (``1`` is the original
+pace, ``10`` ten times faster, ``0`` as fast as possible). Calls start on
+schedule whether or not earlier ones have finished, as they did in
+production; ``--concurrency`` caps how many are in flight, and the report
+shows how far behind schedule calls started.
+
+Targets:
+    dispatcher  Replays the MCP tool calls through the server's `Dispatcher`
+                in this process. With ``--pipe-name`` it first waits for the
+                Revit add-in to connect so revit tools reach Revit.
+    pipe        Replays the captured pipe tool_call messages. It listens on
+                ``--pipe-name`` and sends them to the endpoint that connects.
+
+Only tools marked ``read_only`` in the tool catalog are replayed by
+default, so a replay cannot create or change elements in the model it runs
+against. ``--include-mutations`` replays every call; use it only on a
+scratch copy of the model. Tools missing from the catalog count as
+mutating.
+
+The report gives throughput, latency percentiles overall and per tool, the
+error rate by code and the captured latencies for comparison.
+
+Usage:
+    python -m benchmarks.replay capture.jsonl.gz [--target dispatcher|pipe]
+        [--speed 1] [--concurrency 0] [--limit N] [--pipe-name NAME]
+        [--include-mutations] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager, nullcontext
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from orchestrator.config import Config
+from orchestrator.pipe.connection import PipeConnection
+from orchestrator.pipe.pipe_server import PipeServer
+from orchestrator.pipe.protocol import make_tool_call
+from orchestrator.registry.registry import ToolRegistry
+from orchestrator.traffic import CapturedCall, load_calls
+
+# Sends one call and returns (success, error code)
+Sender = Callable[[CapturedCall], Awaitable[tuple[bool, str | None]]]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _latency(values: list[float]) -> dict[str, float]:
+    return {
+        "p50": round(_percentile(values, 50), 2),
+        "p90": round(_percentile(values, 90), 2),
+        "p99": round(_percentile(values, 99), 2),
+        "max": round(max(values, default=0.0), 2),
+    }
+
+
+@asynccontextmanager
+async def _revit_connection(pipe_name: str, timeout: float) -> AsyncIterator[PipeConnection]:
+    """Listen on `pipe_name` and yield the first connection made to it."""
+    connected: asyncio.Future[PipeConnection] = asyncio.get_running_loop().create_future()
+
+    async def on_connect(connection: PipeConnection) -> None:
+        if not connected.done():
+            connected.set_result(connection)
+
+    server = PipeServer(pipe_name, timeout=timeout, on_connect=on_connect)
+    await server.start()
+    try:
+        print(f"Waiting for a client on {pipe_name} ...")
+        yield await connected
+    finally:
+        await server.stop()
+
+
+def _dispatcher_sender() -> Sender:
+    from orchestrator import server
+    from orchestrator.sessions import DEFAULT_SESSION, current_session
+
+    async def send(call: CapturedCall) -> tuple[bool, str | None]:
+        token = current_session.set(call.session or DEFAULT_SESSION)
+        try:
+            result = await server.dispatcher.dispatch(call.tool, call.args, offload=True)
+        finally:
+            current_session.reset(token)
+        return result.success, result.error_code
+
+    return send
+
+
+def _pipe_sender(connection: PipeConnection) -> Sender:
+    async def send(call: CapturedCall) -> tuple[bool, str | None]:
+        try:
+            response = await connection.send_and_wait(make_tool_call(call.tool, call.args))
+        except asyncio.TimeoutError:
+            return False, "PIPE_TIMEOUT"
+        except ConnectionError:
+            return False, "PIPE_DISCONNECTED"
+        payload = response.get("payload", {})
+        if response.get("type") == "error":
+            return False, payload.get("code")
+        error = payload.get("error") or {}
+        return bool(payload.get("success")), error.get("code")
+
+    return send
+
+
+def read_only_calls(
+    calls: list[CapturedCall], registry: ToolRegistry
+) -> tuple[list[CapturedCall], Counter[str]]:
+    """Split off calls to tools that may modify the model.
+
+    Returns:
+        The read-only calls and a count of the skipped calls per tool.
+    """
+    kept: list[CapturedCall] = []
+    skipped: Counter[str] = Counter()
+    for call in calls:
+        definition = registry.get(call.tool)
+        if definition is not None and definition.get("read_only", False):
+            kept.append(call)
+        else:
+            skipped[call.tool] += 1
+    return kept, skipped
+
+
+async def replay(
+    calls: list[CapturedCall], send: Sender, speed: float, concurrency: int
+) -> dict[str, Any]:
+    """Issue `calls` on their captured schedule and summarize the outcome."""
+    limit = asyncio.Semaphore(concurrency) if concurrency > 0 else nullcontext()
+    origin = calls[0].at if calls else 0.0
+    outcomes: list[dict[str, Any]] = []
+
+    async def run(call: CapturedCall, due: float) -> None:
+        async with limit:
+            started = time.perf_counter()
+            try:
+                ok, code = await send(call)
+            except Exception as e:
+                ok, code = False, type(e).__name__
+            outcomes.append({
+                "tool": call.tool,
+                "ok": ok,
+                "code": code,
+                "ms": (time.perf_counter() - started) * 1000,
+                "lag_ms": max(0.0, (started - due) * 1000),
+            })
+
+    start = time.perf_counter()
+    tasks = []
+    for call in calls:
+        due = start + ((call.at - origin) / speed if speed > 0 else 0.0)
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(run(call, due)))
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - start
+
+    captured_span = (calls[-1].at - origin) if calls else 0.0
+    errors = Counter(o["code"] or "UNKNOWN" for o in outcomes if not o["ok"])
+    per_tool: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for o in outcomes:
+        per_tool[o["tool"]].append(o)
+    captured_ms = [c.ms for c in calls if c.ms is not None]
+    return {
+        "calls": len(outcomes),
+        "speed": speed,
+        "captured_seconds": round(captured_span, 3),
+        "wall_seconds": round(wall, 3),
+        "calls_per_second": round(len(outcomes) / wall, 1) if wall else 0.0,
+        "error_rate": round(sum(errors.values()) / len(outcomes), 4) if outcomes else 0.0,
+        "errors": dict(errors.most_common()),
+        "latency_ms": _latency([o["ms"] for o in outcomes]),
+        "captured_latency_ms": _latency(captured_ms) if captured_ms else None,
+        "start_lag_ms": _latency([o["lag_ms"] for o in outcomes]),
+        "tools": {
+            tool: {
+                "calls": len(items),
+                "errors": sum(not o["ok"] for o in items),
+                "latency_ms": _latency([o["ms"] for o in items]),
+            }
+            for tool, items in sorted(per_tool.items(), key=lambda i: -len(i[1]))
+        },
+    }
+
+
+async def run(
+    capture: Path,
+    target: str,
+    speed: float,
+    concurrency: int,
+    limit: int | None,
+    pipe_name: str | None,
+    include_mutations: bool = False,
+) -> dict[str, Any]:
+    calls = load_calls(capture, source="pipe" if target == "pipe" else "mcp")
+    if limit is not None:
+        calls = calls[:limit]
+    config = Config.from_env()
+
+    if target == "pipe":
+        registry = ToolRegistry()
+        registry.load_from_directory(config.tools_dir)
+    else:
+        from orchestrator import server
+
+        await server.wait_for_catalog()
+        registry = server.registry
+    skipped: Counter[str] = Counter()
+    if not include_mutations:
+        calls, skipped = read_only_calls(calls, registry)
+    if not calls:
+        raise SystemExit(
+            f"No {target} calls to replay in {capture}"
+            + (f" ({sum(skipped.values())} mutating calls skipped)" if skipped else "")
+        )
+
+    if target == "pipe":
+        async with _revit_connection(pipe_name or config.pipe_name, config.pipe_timeout_seconds) as conn:
+            report = await replay(calls, _pipe_sender(conn), speed, concurrency)
+    elif pipe_name is None:
+        report = await replay(calls, _dispatcher_sender(), speed, concurrency)
+    else:
+        async with _revit_connection(pipe_name, config.pipe_timeout_seconds) as conn:
+            server.revit_adapter.set_connection(conn)
+            report = await replay(calls, _dispatcher_sender(), speed, concurrency)
+    report["skipped_mutations"] = dict(skipped.most_common())
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path, help="Capture log (ORCHESTRATOR_CAPTURE)")
+    parser.add_argument("--target", choices=["dispatcher", "pipe"], default="dispatcher")
+    parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="Replay speed: 1 = captured pace, N = N times faster, 0 = as fast as possible",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=0,
+        help="Calls in flight at most (0 = no limit; default 8 when --speed 0)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N calls")
+    parser.add_argument("--pipe-name", default=None, help="Pipe to listen on for the Revit add-in")
+    parser.add_argument(
+        "--include-mutations", action="store_true",
+        help="Also replay tools that may modify the model (use a scratch model)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    concurrency = args.concurrency or (8 if args.speed == 0 else 0)
+    report = asyncio.run(
+        run(
+            args.capture, args.target, args.speed, concurrency, args.limit,
+            args.pipe_name, args.include_mutations,
+        )
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    pace = "as fast as possible" if args.speed == 0 else f"{args.speed:g}x"
+    latency, lag = report["latency_ms"], report["start_lag_ms"]
+    print(
+        f"{report['calls']} calls replayed at {pace} in {report['wall_seconds']:.2f} s "
+        f"(captured over {report['captured_seconds']:.2f} s): "
+        f"{report['calls_per_second']:.1f} calls/s"
+    )
+    print(
+        f"latency p50 {latency['p50']:.1f} ms, p90 {latency['p90']:.1f} ms, "
+        f"p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms"
+    )
+    if report["captured_latency_ms"]:
+        captured = report["captured_latency_ms"]
+        print(
+            f"captured p50 {captured['p50']:.1f} ms, p90 {captured['p90']:.1f} ms, "
+            f"p99 {captured['p99']:.1f} ms, max {captured['max']:.1f} ms"
+        )
+    print(f"start lag p50 {lag['p50']:.1f} ms, p99 {lag['p99']:.1f} ms, max {lag['max']:.1f} ms")
+    errors = ", ".join(f"{code} {count}" for code, count in report["errors"].items())
+    print(f"error rate {report['error_rate']:.2%}" + (f" ({errors})" if errors else ""))
+    if report["skipped_mutations"]:
+        skipped = ", ".join(f"{tool} {count}" for tool, count in report["skipped_mutations"].items())
+        print(f"skipped mutating calls (--include-mutations to replay): {skipped}")
+    print(f"\n{'tool':<40} {'calls':>7} {'errors':>7} {'p50':>9} {'p99':>9}")
+    for tool, row in report["tools"].items():
+        print(
+            f"{tool:<40} {row['calls']:>7} {row['errors']:>7} "
+            f"{row['latency_ms']['p50']:>7.1f}ms {row['latency_ms']['p99']:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark spatial index queries against a linear scan.
+
+Fills a `SpatialIndex` with a synthetic floor plate of walls (with
+centerlines) and point-like elements, then times range, nearest-neighbour
+and box queries at random points. Each query is also answered by scanning
+every element, both to check the results and to show the speedup.
+
+Usage:
+    python -m benchmarks.spatial_index [--sizes 10000 100000] [--queries 1000] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Any, Callable
+
+from orchestrator.spatial_index import SpatialEntry, SpatialIndex
+
+PLATE_FT = 1000.0  # synthetic model extent in plan
+STOREY_FT = 12.0
+
+
+def make_entries(count: int, rng: random.Random) -> list[SpatialEntry]:
+    """Walls with centerlines for half the elements, small boxes for the rest."""
+    entries = []
+    for i in range(count):
+        x, y = rng.uniform(0, PLATE_FT), rng.uniform(0, PLATE_FT)
+        z = STOREY_FT * rng.randrange(5)
+        if i % 2 == 0:
+            length = rng.uniform(3, 40)
+            if rng.random() < 0.5:
+                box = (x, y - 0.4, z, x + length, y + 0.4, z + STOREY_FT)
+                segment = (x, y, z, x + length, y, z)
+            else:
+                box = (x - 0.4, y, z, x + 0.4, y + length, z + STOREY_FT)
+                segment = (x, y, z, x, y + length, z)
+            entries.append(SpatialEntry(i, "Walls", box, segment))
+        else:
+            size = rng.uniform(1, 4)
+            entries.append(SpatialEntry(i, "Furniture", (x, y, z, x + size, y + size, z + 3)))
+    return entries
+
+
+def _time_us(fn: Callable[[], Any], repeats: int) -> tuple[float, float]:
+    """Median and p95 microseconds of `fn` over `repeats` calls."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def run(sizes: list[int], queries: int, cell_size: float) -> list[dict[str, Any]]:
+    rows = []
+    for size in sizes:
+        rng = random.Random(size)
+        entries = make_entries(size, rng)
+        index = SpatialIndex(cell_size)
+        start = time.perf_counter()
+        for entry in entries:
+            index.insert(entry)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        points = [
+            (rng.uniform(0, PLATE_FT), rng.uniform(0, PLATE_FT), STOREY_FT * rng.randrange(5) + 4)
+            for _ in range(queries)
+        ]
+        it = iter(points * 3)
+
+        nearby_us = _time_us(lambda: index.nearby(next(it), 2.0), queries)
+        nearest_us = _time_us(lambda: index.nearest(next(it), 5), queries)
+
+        def box_query() -> None:
+            x, y, z = next(it)
+            index.intersecting((x, y, z, x + 20, y + 20, z + 1))
+
+        box_us = _time_us(box_query, queries)
+
+        # Check a sample against a linear scan and time the scan
+        scan_points = points[: min(50, queries)]
+        for point in scan_points:
+            expected = sorted(e.element_id for e in entries if e.distance(point) <= 2.0)
+            got = sorted(e.element_id for _, e in index.nearby(point, 2.0))
+            assert got == expected, f"nearby mismatch at {point}"
+        scan_it = iter(scan_points)
+
+        def linear_scan() -> None:
+            point = next(scan_it)
+            [e for e in entries if e.distance(point) <= 2.0]
+
+        scan_us = _time_us(linear_scan, len(scan_points))
+
+        rows.append({
+            "elements": size,
+            "build_ms": round(build_ms, 1),
+            "nearby_2ft_us": round(nearby_us[0], 1),
+            "nearby_2ft_p95_us": round(nearby_us[1], 1),
+            "nearest_5_us": round(nearest_us[0], 1),
+            "nearest_5_p95_us": round(nearest_us[1], 1),
+            "box_20ft_us": round(box_us[0], 1),
+            "box_20ft_p95_us": round(box_us[1], 1),
+            "linear_scan_us": round(scan_us[0], 1),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--cell-size", type=float, default=10.0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = run(args.sizes, args.queries, args.cell_size)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(
+        f"{'elements':>9} {'build':>9} {'nearby':>9} {'nearest':>9} {'box':>9} {'scan':>10}"
+    )
+    for row in rows:
+        print(
+            f"{row['elements']:>9} {row['build_ms']:>7.0f}ms {row['nearby_2ft_us']:>7.1f}us "
+            f"{row['nearest_5_us']:>7.1f}us {row['box_20ft_us']:>7.1f}us "
+            f"{row['linear_scan_us']:>8.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Benchmark relevance-ranked tool selection in LLMRouter.
+
+Builds a synthetic catalog of Revit-style tools (one per action and
+category, plus the bundled tools) and a set of paraphrased requests whose
+correct tool is known. For each `top_k` it reports how often the correct
+tool is among the tools sent (selection recall) and the estimated prompt
+tokens of the tool list compared with sending the whole catalog.
+
+Tokens are estimated as serialized characters / 4.
+
+Usage:
+    python -m benchmarks.tool_retrieval [--top-k 5 10 20] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from orchestrator.llm.base import BaseLLMProvider, LLMResponse, Message
+from orchestrator.llm.router import LLMRouter
+from orchestrator.registry.registry import ToolRegistry
+
+TOOLS_DIR = Path(__file__).parent.parent / "orchestrator" / "tools"
+
+# action -> (description verb phrase, request paraphrases)
+ACTIONS: dict[str, tuple[str, list[str]]] = {
+    "create": ("Creates a new {c} in the active model", [
+        "add a new {c} on level 2", "place a {c} at the origin", "create one more {c}",
+    ]),
+    "delete": ("Deletes an existing {c} from the model", [
+        "remove the {c} with id 4411", "get rid of that {c}", "delete every selected {c}",
+    ]),
+    "get": ("Retrieves properties and parameters of a {c}", [
+        "what are the parameters of this {c}", "show me details for the {c} 1201",
+        "look up the {c} properties",
+    ]),
+    "list": ("Lists all {c} instances in the model, optionally filtered by level", [
+        "how many {c}s are there on level 1", "list the {c}s in the project",
+        "enumerate every {c}",
+    ]),
+    "move": ("Moves a {c} by a translation vector", [
+        "shift the {c} 300mm to the left", "move this {c} north by 2 meters",
+        "translate the {c} along x",
+    ]),
+    "rotate": ("Rotates a {c} about its location point", [
+        "rotate the {c} by 90 degrees", "turn the {c} a quarter turn",
+        "spin this {c} 45 degrees",
+    ]),
+    "tag": ("Places an annotation tag on a {c} in a view", [
+        "tag the {c} in the current view", "annotate every {c} with a tag",
+        "add tags to the {c}s",
+    ]),
+    "export": ("Exports {c} data to a CSV schedule file", [
+        "export the {c} list to csv", "dump {c} data into a spreadsheet",
+        "write a csv of all {c}s",
+    ]),
+}
+
+CATEGORIES = [
+    "wall", "door", "window", "floor", "roof", "ceiling", "room", "sheet", "view",
+    "level", "grid", "column", "beam", "stair", "railing", "duct", "pipe", "furniture",
+    "light fixture", "sprinkler", "curtain panel", "topography", "area", "dimension",
+    "text note", "section", "elevation", "schedule", "family", "material",
+]
+
+
+class _Formatter(BaseLLMProvider):
+    """Provider stand-in that only formats tools (Anthropic tool format)."""
+
+    @property
+    def name(self) -> str:
+        return "bench"
+
+    async def chat(self, messages, tools=None, temperature=0.0) -> LLMResponse:
+        raise NotImplementedError
+
+    def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
+            {"name": d["name"], "description": d["description"], "input_schema": d["parameters"]}
+            for d in tool_definitions
+        ]
+
+
+def _slug(category: str) -> str:
+    return category.replace(" ", "_")
+
+
+def build_registry(copies: int) -> ToolRegistry:
+    """Return a registry with the bundled tools and the synthetic catalog.
+
+    `copies` > 1 adds variants of each synthetic tool (e.g. per discipline)
+    to grow the catalog.
+    """
+    registry = ToolRegistry()
+    registry.load_from_directory(TOOLS_DIR)
+    for copy in range(copies):
+        suffix = "" if copy == 0 else f"_v{copy}"
+        for action, (phrase, _) in ACTIONS.items():
+            for category in CATEGORIES:
+                registry.register({
+                    "name": f"revit.{action}_{_slug(category)}{suffix}",
+                    "adapter": "revit",
+                    "description": phrase.format(c=category) + ".",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "element_id": {"type": "integer", "description": "Target element id"},
+                            "level": {"type": "string", "description": "Level name"},
+                        },
+                    },
+                })
+    return registry
+
+
+def build_queries(seed: int = 7) -> list[tuple[str, str]]:
+    """Return (request text, expected tool name) pairs."""
+    queries = []
+    for action, (_, paraphrases) in ACTIONS.items():
+        for category in CATEGORIES:
+            for paraphrase in paraphrases:
+                queries.append((paraphrase.format(c=category), f"revit.{action}_{_slug(category)}"))
+    queries += [
+        ("run my dynamo graph with width 3000", "dynamo.run_graph"),
+        ("execute this pyrevit script", "pyrevit.run_script"),
+        ("sweep the graph over several heights", "flow.sweep_dynamo_graph"),
+        ("create walls along these lines", "flow.create_walls_from_lines"),
+    ]
+    random.Random(seed).shuffle(queries)
+    return queries
+
+
+def _tokens(tools: list[dict[str, Any]]) -> int:
+    return len(json.dumps(tools)) // 4
+
+
+def run(top_ks: list[int], copies: int) -> dict[str, Any]:
+    registry = build_registry(copies)
+    queries = build_queries()
+    full = LLMRouter(_Formatter(), registry)
+    full_tokens = _tokens(full._get_formatted_tools())
+
+    rows = []
+    for top_k in top_ks:
+        router = LLMRouter(_Formatter(), registry, top_k=top_k)
+        _, by_name, _ = router._formatted_tools()
+        hits = 0
+        tokens = 0
+        start = time.perf_counter()
+        for text, expected in queries:
+            selected = router.select_tools([Message(role="user", content=text)])
+            hits += expected in selected
+            tokens += _tokens([by_name[name] for name in selected])
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "top_k": top_k,
+            "recall": hits / len(queries),
+            "avg_tokens": tokens / len(queries),
+            "tokens_saved": 1 - tokens / (full_tokens * len(queries)),
+            "select_ms": elapsed * 1000 / len(queries),
+        })
+    return {
+        "tools": len(registry.list_tools()),
+        "queries": len(queries),
+        "full_catalog_tokens": full_tokens,
+        "results": rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, nargs="+", default=[3, 5, 10, 20])
+    parser.add_argument(
+        "--copies", type=int, default=1, help="Variants per synthetic tool (grows the catalog)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = run(args.top_k, args.copies)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(
+        f"{report['tools']} tools, {report['queries']} queries, "
+        f"full catalog ~{report['full_catalog_tokens']} tokens"
+    )
+    print(f"{'top_k':>6} {'recall':>8} {'tokens':>8} {'saved':>7} {'select':>9}")
+    for row in report["results"]:
+        print(
+            f"{row['top_k']:>6} {row['recall']:>8.1%} {row['avg_tokens']:>8.0f} "
+            f"{row['tokens_saved']:>7.1%} {row['select_ms']:>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import logging
 from typing import Any
 
 from .base import BaseAdapter
+from .dynamo_graphs import GraphIndex
 from ..dispatcher.result import ToolResult
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ class DynamoAdapter(BaseAdapter):
 
     def __init__(self) -> None:
         self._revit_adapter: Any | None = None
+        self._index: GraphIndex | None = None
 
     @property
     def name(self) -> str:
@@ -25,12 +27,16 @@ class DynamoAdapter(BaseAdapter):
         """Set the Revit adapter used to communicate with the add-in."""
         self._revit_adapter = revit_adapter
 
+    def set_graph_index(self, index: GraphIndex) -> None:
+        """Set the index used to check inputs against graph input nodes."""
+        self._index = index
+
     async def execute(
         self, tool_name: str, args: dict[str, Any], handler: Any
     ) -> ToolResult:
         """Execute a Dynamo graph via the handler module."""
         try:
-            result = await handler.execute(args)
+            result = await handler.execute(args, index=self._index)
             return result
         except Exception as e:
             logger.exception("Dynamo execution error for %s", tool_name)
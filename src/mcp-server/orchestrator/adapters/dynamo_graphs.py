@@ -0,0 +1,132 @@
+"""Dynamo graph metadata index.
+
+`GraphIndex` parses each .dyn file once and caches its input/output node
+metadata, keyed by mtime and content hash, so tool arguments can be checked
+against the graph before anything is sent to Revit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    """An input or output node exposed by a Dynamo graph."""
+
+    id: str
+    name: str
+    type: str = ""
+    description: str = ""
+
+
+@dataclass
+class GraphInfo:
+    """Parsed metadata for one .dyn file."""
+
+    path: Path
+    content_hash: str
+    mtime_ns: int
+    size: int
+    inputs: dict[str, GraphNode] | None = None  # None if the format is not understood
+    outputs: dict[str, GraphNode] = field(default_factory=dict)
+
+    def unknown_inputs(self, inputs: dict[str, Any]) -> list[str]:
+        """Return input names that do not match any input node of the graph."""
+        if self.inputs is None:
+            return []
+        return [name for name in inputs if name not in self.inputs]
+
+
+def parse_graph(data: bytes) -> tuple[dict[str, GraphNode] | None, dict[str, GraphNode]]:
+    """Extract input and output nodes from .dyn file contents.
+
+    Dynamo 2.x graphs are JSON with top-level ``Inputs`` and ``Outputs``
+    arrays. Older XML graphs are not parsed; their inputs are reported as
+    None so callers skip input checking.
+    """
+    try:
+        graph = json.loads(data.decode("utf-8-sig"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None, {}
+    if not isinstance(graph, dict):
+        return None, {}
+
+    def nodes(key: str) -> dict[str, GraphNode]:
+        result: dict[str, GraphNode] = {}
+        for node in graph.get(key) or []:
+            name = node.get("Name")
+            if name:
+                result[name] = GraphNode(
+                    id=str(node.get("Id", "")),
+                    name=name,
+                    type=str(node.get("Type", "")),
+                    description=str(node.get("Description") or ""),
+                )
+        return result
+
+    return nodes("Inputs"), nodes("Outputs")
+
+
+class GraphIndex:
+    """Caches parsed .dyn metadata by path, mtime and content hash."""
+
+    def __init__(self) -> None:
+        self._graphs: dict[Path, GraphInfo] = {}
+
+    def get(self, graph_path: str | Path) -> GraphInfo:
+        """Return metadata for a graph, re-parsing only if its contents changed.
+
+        Raises:
+            FileNotFoundError: If the graph file does not exist.
+        """
+        path = Path(graph_path)
+        stat = path.stat()
+        cached = self._graphs.get(path)
+        if cached is not None and (cached.mtime_ns, cached.size) == (
+            stat.st_mtime_ns, stat.st_size
+        ):
+            return cached
+
+        data = path.read_bytes()
+        content_hash = hashlib.sha256(data).hexdigest()
+        if cached is not None and cached.content_hash == content_hash:
+            # Touched but unchanged: keep the parsed metadata
+            cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+            return cached
+
+        inputs, outputs = parse_graph(data)
+        info = GraphInfo(
+            path=path,
+            content_hash=content_hash,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            inputs=inputs,
+            outputs=outputs,
+        )
+        self._graphs[path] = info
+        logger.debug(
+            "Indexed Dynamo graph %s (%s inputs, %d outputs)",
+            path, "?" if inputs is None else len(inputs), len(outputs),
+        )
+        return info
+
+    def scan(self, directory: Path) -> int:
+        """Index every .dyn file under a directory. Returns the number indexed."""
+        count = 0
+        for path in sorted(directory.rglob("*.dyn")):
+            try:
+                self.get(path)
+                count += 1
+            except OSError as e:
+                logger.warning("Failed to index Dynamo graph %s: %s", path, e)
+        logger.info("Indexed %d Dynamo graphs under %s", count, directory)
+        return count
+
@@ -0,0 +1,184 @@
+"""Background health probing for execution adapters.
+
+Adapter availability checks can be expensive (the pyRevit adapter spawns a
+``pyrevit --version`` process), so the monitor probes each adapter on a
+schedule and serves availability from an in-memory cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AdapterHealth:
+    """Result of a single adapter health probe."""
+
+    adapter: str
+    available: bool
+    checked_at: float  # time.monotonic() when the probe finished
+    latency_ms: float
+    error: str | None = None
+
+
+class AdapterHealthMonitor:
+    """Probes adapters on a background schedule and caches their state.
+
+    Reads (`get`, `is_available`) never touch the adapters — they return the
+    most recent probe result, or None if the adapter has not been probed yet
+    or its last result is older than the TTL. Subscribers registered with
+    `on_change` are called whenever an adapter's availability flips.
+    """
+
+    def __init__(
+        self,
+        adapters: dict[str, Any],
+        interval: float = 15.0,
+        ttl: float = 60.0,
+        probe_timeout: float = 10.0,
+        history_size: int = 100,
+    ) -> None:
+        self._adapters = adapters
+        self._interval = interval
+        self._ttl = ttl
+        self._probe_timeout = probe_timeout
+        self._state: dict[str, AdapterHealth] = {}
+        self._history: dict[str, deque[AdapterHealth]] = {
+            name: deque(maxlen=history_size) for name in adapters
+        }
+        self._history_size = history_size
+        self._on_change_callbacks: list[Callable[[str, AdapterHealth], None]] = []
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def set_schedule(self, interval: float, ttl: float) -> None:
+        """Change the probe interval and cache TTL (applies from the next probe)."""
+        self._interval = interval
+        self._ttl = ttl
+
+    async def start(self) -> None:
+        """Probe all adapters once, then keep probing in the background."""
+        if self.running:
+            return
+        await self.probe_all()
+        self._task = asyncio.create_task(self._probe_loop())
+        logger.info(
+            "Adapter health monitor started (interval=%.1fs, ttl=%.1fs)",
+            self._interval, self._ttl,
+        )
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Adapter health monitor stopped")
+
+    def get(self, name: str) -> AdapterHealth | None:
+        """Return the cached health of an adapter, or None if unknown or stale."""
+        health = self._state.get(name)
+        if health is None or time.monotonic() - health.checked_at > self._ttl:
+            return None
+        return health
+
+    def is_available(self, name: str) -> bool | None:
+        """Return cached availability, or None if unknown or stale."""
+        health = self.get(name)
+        return health.available if health is not None else None
+
+    def invalidate(self, *names: str) -> None:
+        """Forget cached state so reads return None until the next probe.
+
+        Adapters call this (through the server's wiring) when they know
+        their state just changed, e.g. when the Revit add-in connects, so
+        calls are not refused on a result that is out of date.
+        """
+        for name in names:
+            self._state.pop(name, None)
+
+    def snapshot(self) -> dict[str, AdapterHealth]:
+        """Return the latest probe result for every probed adapter."""
+        return dict(self._state)
+
+    def history(self, name: str) -> list[AdapterHealth]:
+        """Return recorded probe results for an adapter, oldest first."""
+        return list(self._history.get(name, ()))
+
+    def on_change(self, callback: Callable[[str, AdapterHealth], None]) -> None:
+        """Register a callback invoked when an adapter's availability changes."""
+        self._on_change_callbacks.append(callback)
+
+    async def probe_all(self) -> None:
+        """Probe every adapter concurrently and update the cache."""
+        await asyncio.gather(*(self.probe(name) for name in self._adapters))
+
+    async def probe(self, name: str) -> AdapterHealth:
+        """Probe a single adapter now and update the cache."""
+        adapter = self._adapters[name]
+        start = time.perf_counter()
+        error: str | None = None
+        try:
+            available = bool(
+                await asyncio.wait_for(adapter.is_available(), self._probe_timeout)
+            )
+        except asyncio.TimeoutError:
+            available = False
+            error = f"Probe timed out after {self._probe_timeout:g}s"
+        except Exception as e:
+            available = False
+            error = str(e)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        health = AdapterHealth(
+            adapter=name,
+            available=available,
+            checked_at=time.monotonic(),
+            latency_ms=latency_ms,
+            error=error,
+        )
+        self._record(health)
+        return health
+
+    def _record(self, health: AdapterHealth) -> None:
+        previous = self._state.get(health.adapter)
+        self._state[health.adapter] = health
+        history = self._history.setdefault(
+            health.adapter, deque(maxlen=self._history_size)
+        )
+        history.append(health)
+
+        if previous is None or previous.available != health.available:
+            logger.info(
+                "Adapter '%s' is now %s",
+                health.adapter, "available" if health.available else "unavailable",
+            )
+            self._notify_change(health)
+
+    def _notify_change(self, health: AdapterHealth) -> None:
+        for cb in self._on_change_callbacks:
+            try:
+                cb(health.adapter, health)
+            except Exception:
+                logger.exception("Error in adapter health change callback")
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.probe_all()
+            except Exception:
+                logger.exception("Error probing adapter health")
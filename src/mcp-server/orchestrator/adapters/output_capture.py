@@ -0,0 +1,181 @@
+"""Bounded, incremental capture of script output streams.
+
+Scripts can print far more than should be held in memory or handed back
+to the LLM. `OutputCapture` consumes a stream as it is produced, keeps at
+most `memory_bytes` in memory before spilling to a log file, reports each
+complete line to a listener, and summarizes the stream as a head/tail
+preview plus a path to the full log. Logs in `CaptureLimits.spill_dir`
+are pruned by age and total size whenever a new one is written.
+"""
+
+from __future__ import annotations
+
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING_LINE = 64 * 1024  # emit a line event even without a newline past this
+
+
+@dataclass
+class CaptureLimits:
+    """Limits applied to each captured stream."""
+
+    memory_bytes: int = 256 * 1024
+    preview_bytes: int = 4096
+    spill_dir: Path | None = None
+    log_ttl_seconds: float = 86400.0
+    log_max_bytes: int = 256 * 1024 * 1024
+
+
+def prune_logs(directory: Path, ttl_seconds: float, max_bytes: int) -> int:
+    """Delete output logs older than `ttl_seconds`, then oldest first past `max_bytes`.
+
+    Returns:
+        The number of log files deleted.
+    """
+    try:
+        logs = []
+        for path in directory.glob("orchestrator-*.log"):
+            stat = path.stat()
+            logs.append((stat.st_mtime, stat.st_size, path))
+    except OSError as e:
+        logger.debug("Could not list output logs in %s: %s", directory, e)
+        return 0
+    logs.sort()
+    cutoff = time.time() - ttl_seconds
+    total = sum(size for _, size, _ in logs)
+    deleted = 0
+    for mtime, size, path in logs:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        deleted += 1
+    return deleted
+
+
+class OutputCapture:
+    """Captures one output stream (stdout or stderr) incrementally."""
+
+    def __init__(
+        self,
+        stream: str,
+        limits: CaptureLimits | None = None,
+        on_line: Callable[[str, str], None] | None = None,
+    ) -> None:
+        self._stream = stream
+        self._limits = limits or CaptureLimits()
+        self._on_line = on_line
+        self._chunks: list[str] = []
+        self._memory_bytes = 0
+        self._total_bytes = 0
+        self._head = ""
+        self._tail = ""
+        self._pending_line = ""
+        self._spill: IO[str] | None = None
+        self._log_path: Path | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    @property
+    def truncated(self) -> bool:
+        """True if the preview does not contain the whole stream."""
+        return (
+            self._total_bytes > 2 * self._limits.preview_bytes
+            or self._log_path is not None
+        )
+
+    @property
+    def log_path(self) -> Path | None:
+        """Path to the full log, set once the stream has been spilled to disk."""
+        return self._log_path
+
+    def write(self, text: str) -> None:
+        """Append a chunk of decoded output."""
+        if not text:
+            return
+        size = len(text.encode("utf-8"))
+        self._total_bytes += size
+
+        preview = self._limits.preview_bytes
+        if len(self._head) < preview:
+            self._head += text[: preview - len(self._head)]
+        self._tail = (self._tail + text)[-preview:]
+
+        if self._spill is not None:
+            self._spill.write(text)
+        else:
+            self._chunks.append(text)
+            self._memory_bytes += size
+            if self._memory_bytes > self._limits.memory_bytes:
+                self._spill_to_disk()
+
+        if self._on_line is not None:
+            self._emit_lines(text)
+
+    def close(self) -> None:
+        """Flush any partial line and finish the log file if one is needed."""
+        if self._on_line is not None and self._pending_line:
+            self._emit(self._pending_line)
+            self._pending_line = ""
+        if self.truncated and self._spill is None:
+            # The caller only sees a preview, so keep the full text on disk
+            self._spill_to_disk()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def preview(self) -> str:
+        """Return the full text, or its head and tail if it was truncated."""
+        if not self.truncated:
+            return "".join(self._chunks)
+        shown = len(self._head.encode("utf-8")) + len(self._tail.encode("utf-8"))
+        omitted = max(0, self._total_bytes - shown)
+        return f"{self._head}\n... [{omitted} bytes truncated] ...\n{self._tail}"
+
+    def _spill_to_disk(self) -> None:
+        spill_dir = self._limits.spill_dir
+        if spill_dir is not None:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            prune_logs(spill_dir, self._limits.log_ttl_seconds, self._limits.log_max_bytes)
+        spill = tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            prefix="orchestrator-",
+            suffix=f".{self._stream}.log",
+            dir=spill_dir,
+            delete=False,
+        )
+        spill.write("".join(self._chunks))
+        self._chunks.clear()
+        self._memory_bytes = 0
+        self._spill = spill
+        self._log_path = Path(spill.name)
+        logger.debug("Spilled %s output to %s", self._stream, self._log_path)
+
+    def _emit_lines(self, text: str) -> None:
+        data = self._pending_line + text
+        lines = data.split("\n")
+        self._pending_line = lines.pop()
+        for line in lines:
+            self._emit(line.rstrip("\r"))
+        if len(self._pending_line) > MAX_PENDING_LINE:
+            self._emit(self._pending_line)
+            self._pending_line = ""
+
+    def _emit(self, line: str) -> None:
+        try:
+            self._on_line(self._stream, line)  # type: ignore[misc]
+        except Exception:
+            logger.exception("Error in output line listener")
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from typing import Any, Callable
 
 from .base import BaseAdapter
+from .output_capture import CaptureLimits
+from .pyrevit_pool import PyRevitWorkerPool
 from ..dispatcher.result import ToolResult
 
 logger = logging.getLogger(__name__)
@@ -15,16 +17,44 @@ logger = logging.getLogger(__name__)
 class PyRevitAdapter(BaseAdapter):
     """Executes tools by invoking pyRevit CLI scripts."""
 
+    def __init__(self) -> None:
+        self._pool: PyRevitWorkerPool | None = None
+        self._limits = CaptureLimits()
+        self._output_listener: Callable[[str, str, str], None] | None = None
+
     @property
     def name(self) -> str:
         return "pyrevit"
 
+    def set_worker_pool(self, pool: PyRevitWorkerPool | None) -> None:
+        """Set the warm worker pool handlers should run scripts on."""
+        self._pool = pool
+
+    def set_capture_limits(self, limits: CaptureLimits) -> None:
+        """Set the in-memory cap and preview size for script output."""
+        self._limits = limits
+
+    def set_output_listener(
+        self, listener: Callable[[str, str, str], None] | None
+    ) -> None:
+        """Set a callback receiving (tool_name, stream, line) while scripts run."""
+        self._output_listener = listener
+
     async def execute(
         self, tool_name: str, args: dict[str, Any], handler: Any
     ) -> ToolResult:
         """Execute a pyRevit script via the handler module."""
+        on_output = None
+        if self._output_listener is not None:
+            listener = self._output_listener
+
+            def on_output(stream: str, line: str) -> None:
+                listener(tool_name, stream, line)
+
         try:
-            result = await handler.execute(args)
+            result = await handler.execute(
+                args, pool=self._pool, limits=self._limits, on_output=on_output
+            )
             return result
         except Exception as e:
             logger.exception("pyRevit script error for %s", tool_name)
@@ -0,0 +1,217 @@
+"""Pool of warm pyRevit worker processes.
+
+Starting ``pyrevit run`` dominates the runtime of short scripts. The pool
+keeps a few `pyrevit_worker` processes alive and sends them script requests
+as newline-delimited JSON over stdin/stdout, so a warm run only pays for a
+pipe round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).parent / "pyrevit_worker.py"
+MAX_LINE_SIZE = 16 * 1024 * 1024  # 16 MiB, same cap as the pipe protocol
+
+
+class WorkerError(Exception):
+    """Raised when a worker process dies or violates the protocol."""
+
+
+class _PyRevitWorker:
+    """A single long-lived worker process."""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+        self.runs = 0
+        self.rss_mb = 0.0
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.returncode is None
+
+    @classmethod
+    async def spawn(cls, command: list[str], timeout: float) -> _PyRevitWorker:
+        """Start a worker and wait for its ready message."""
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=MAX_LINE_SIZE,
+        )
+        worker = cls(proc)
+        try:
+            message = await asyncio.wait_for(worker._read_message(), timeout)
+        except BaseException:
+            await worker.close()
+            raise
+        if message.get("type") != "ready":
+            await worker.close()
+            raise WorkerError(f"Unexpected worker handshake: {message!r}")
+        logger.info("pyRevit worker %d started", proc.pid)
+        return worker
+
+    async def run(
+        self,
+        request: dict[str, Any],
+        timeout: float,
+        on_output: Callable[[str, str], None] | None = None,
+    ) -> dict[str, Any]:
+        """Send a request, forward its output, and wait for its result message."""
+        assert self._proc.stdin is not None
+        line = json.dumps(request, separators=(",", ":")).encode("utf-8") + b"\n"
+        try:
+            self._proc.stdin.write(line)
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise WorkerError(f"pyRevit worker {self.pid} is gone") from e
+
+        async with asyncio.timeout(timeout):
+            while True:
+                message = await self._read_message()
+                msg_type = message.get("type")
+                if message.get("id") != request["id"] and msg_type != "error":
+                    continue
+                if msg_type == "output":
+                    if on_output is not None:
+                        on_output(message["stream"], message["data"])
+                elif msg_type == "result":
+                    self.runs += 1
+                    self.rss_mb = float(message.get("rss_mb") or 0.0)
+                    return message
+                elif msg_type == "error":
+                    raise WorkerError(message.get("message", "Worker error"))
+
+    async def close(self) -> None:
+        """Stop the worker, killing it if it does not exit promptly."""
+        if self._proc.stdin is not None and not self._proc.stdin.is_closing():
+            self._proc.stdin.close()
+        try:
+            await asyncio.wait_for(self._proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self._proc.kill()
+            await self._proc.wait()
+
+    async def _read_message(self) -> dict[str, Any]:
+        assert self._proc.stdout is not None
+        line = await self._proc.stdout.readline()
+        if not line:
+            raise WorkerError(f"pyRevit worker {self.pid} exited unexpectedly")
+        return json.loads(line)
+
+
+class PyRevitWorkerPool:
+    """Bounded pool of warm pyRevit workers.
+
+    Workers are started lazily, reused across calls and recycled after
+    `max_runs` scripts or once they report more than `max_memory_mb` of
+    resident memory. When every worker is busy, callers queue until one
+    is released.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        command: list[str] | None = None,
+        max_runs: int = 500,
+        max_memory_mb: float = 1024.0,
+        start_timeout: float = 60.0,
+    ) -> None:
+        self._size = size
+        self._command = command or ["pyrevit", "run", str(WORKER_SCRIPT)]
+        self._max_runs = max_runs
+        self._max_memory_mb = max_memory_mb
+        self._start_timeout = start_timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[_PyRevitWorker] = []
+        self._waiting = 0
+        self._closed = False
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return pool occupancy counters."""
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "waiting": self._waiting,
+        }
+
+    async def run(
+        self,
+        script_path: str,
+        arguments: dict[str, Any],
+        timeout: float = 120.0,
+        on_output: Callable[[str, str], None] | None = None,
+    ) -> dict[str, Any]:
+        """Run a script on a warm worker.
+
+        Output chunks are passed to `on_output(stream, data)` as the script
+        produces them. Returns the worker's result message (``exit_code``,
+        ``rss_mb``). Raises `WorkerError` if the worker dies mid-run and
+        `asyncio.TimeoutError` if the script exceeds `timeout`; in both
+        cases the worker is discarded.
+        """
+        if self._closed:
+            raise WorkerError("pyRevit worker pool is closed")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        worker: _PyRevitWorker | None = None
+        try:
+            worker = await self._checkout()
+            request = {
+                "id": str(uuid.uuid4()),
+                "script_path": script_path,
+                "arguments": arguments,
+            }
+            result = await worker.run(request, timeout, on_output)
+        except BaseException:
+            if worker is not None:
+                await worker.close()
+            self._slots.release()
+            raise
+
+        await self._checkin(worker)
+        self._slots.release()
+        return result
+
+    async def close(self) -> None:
+        """Stop all idle workers and reject further runs."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(w.close() for w in idle))
+
+    async def _checkout(self) -> _PyRevitWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                return worker
+            await worker.close()  # reap the exited process and its pipes
+        return await _PyRevitWorker.spawn(self._command, self._start_timeout)
+
+    async def _checkin(self, worker: _PyRevitWorker) -> None:
+        if self._closed or not worker.alive:
+            await worker.close()
+        elif worker.runs >= self._max_runs or worker.rss_mb > self._max_memory_mb:
+            logger.info(
+                "Recycling pyRevit worker %d (runs=%d, rss=%.0f MiB)",
+                worker.pid, worker.runs, worker.rss_mb,
+            )
+            await worker.close()
+        else:
+            self._idle.append(worker)
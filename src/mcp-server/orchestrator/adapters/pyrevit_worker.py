@@ -0,0 +1,176 @@
+#! python3
+"""Long-lived pyRevit worker process.
+
+Started by `PyRevitWorkerPool` (usually via ``pyrevit run``) and kept warm
+between script runs. Requests arrive as one JSON object per line on stdin.
+While a script runs, its output is streamed back as ``output`` messages,
+one per line; each request ends with a single ``result`` message.
+
+This module runs inside the pyRevit engine, so it must stay standalone —
+stdlib only, no imports from the orchestrator package. The ``#! python3``
+line makes pyRevit run it on its CPython engine; the default IronPython
+2.7 engine cannot parse it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import traceback
+from typing import Any, Callable
+
+Send = Callable[[dict[str, Any]], None]
+
+MAX_PENDING_LINE = 64 * 1024
+
+
+class _StreamWriter(io.TextIOBase):
+    """File-like object that forwards each written line as an output message."""
+
+    def __init__(self, send: Send, request_id: Any, stream: str) -> None:
+        self._send = send
+        self._request_id = request_id
+        self._stream = stream
+        self._pending = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._pending += text
+        if "\n" in self._pending:
+            complete, _, self._pending = self._pending.rpartition("\n")
+            self._forward(complete + "\n")
+        if len(self._pending) > MAX_PENDING_LINE:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._pending:
+            self._forward(self._pending)
+            self._pending = ""
+
+    def _forward(self, data: str) -> None:
+        self._send({
+            "type": "output",
+            "id": self._request_id,
+            "stream": self._stream,
+            "data": data,
+        })
+
+
+def _rss_mb() -> float:
+    """Return this process's current resident memory in MiB, or 0.0 if unknown."""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()  # type: ignore[attr-defined]
+            if ctypes.windll.psapi.GetProcessMemoryInfo(  # type: ignore[attr-defined]
+                handle, ctypes.byref(counters), counters.cb
+            ):
+                return counters.WorkingSetSize / (1024 * 1024)
+        except Exception:
+            pass
+        return 0.0
+    # Linux: the second field of statm is resident pages. ru_maxrss is the
+    # peak, which never falls, so it would recycle workers for a past spike.
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _run(request: dict[str, Any], send: Send) -> dict[str, Any]:
+    """Run one script, streaming its output, and return its result message."""
+    arguments = request.get("arguments") or {}
+
+    # Scripts read their arguments from environment variables; set only the
+    # requested keys and restore them afterwards.
+    saved_env = {key: os.environ.get(key) for key in arguments}
+    os.environ.update({key: str(value) for key, value in arguments.items()})
+
+    request_id = request.get("id")
+    stdout = _StreamWriter(send, request_id, "stdout")
+    stderr = _StreamWriter(send, request_id, "stderr")
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            runpy.run_path(
+                request["script_path"],
+                init_globals={"__args__": dict(arguments)},
+                run_name="__main__",
+            )
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            exit_code = 1
+            stderr.write(f"{e.code}\n")
+    except BaseException:
+        exit_code = 1
+        stderr.write(traceback.format_exc())
+    finally:
+        stdout.flush()
+        stderr.flush()
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    return {
+        "type": "result",
+        "id": request_id,
+        "exit_code": exit_code,
+        "rss_mb": _rss_mb(),
+    }
+
+
+def main() -> None:
+    protocol = sys.stdout
+    # Anything printed outside a request must not corrupt the protocol stream
+    sys.stdout = sys.stderr
+
+    def send(message: dict[str, Any]) -> None:
+        protocol.write(json.dumps(message, separators=(",", ":")) + "\n")
+        protocol.flush()
+
+    send({"type": "ready", "pid": os.getpid()})
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            send({"type": "error", "id": None, "message": f"Invalid request: {e}"})
+            continue
+        send(_run(request, send))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from typing import Any, Callable
 
 from .base import BaseAdapter
 from ..dispatcher.result import ToolResult
@@ -12,12 +12,15 @@ from ..pipe.protocol import make_tool_call, encode_message
 
 logger = logging.getLogger(__name__)
 
+PAGES_IN_FLIGHT = 2  # page requests outstanding for paged tools
+
 
 class RevitAddinAdapter(BaseAdapter):
     """Sends tool calls to the Revit add-in over the named pipe."""
 
     def __init__(self) -> None:
         self._connection: Any | None = None
+        self._on_connection_change: list[Callable[[bool], None]] = []
 
     @property
     def name(self) -> str:
@@ -26,17 +29,89 @@ class RevitAddinAdapter(BaseAdapter):
     def set_connection(self, connection: Any) -> None:
         """Set the active pipe connection."""
         self._connection = connection
+        self._notify_connection_change()
+
+    def on_connection_change(self, callback: Callable[[bool], None]) -> None:
+        """Register a callback invoked with the new state when the add-in connects or disconnects."""
+        self._on_connection_change.append(callback)
+
+    def _notify_connection_change(self) -> None:
+        connected = self._connection is not None
+        for cb in self._on_connection_change:
+            try:
+                cb(connected)
+            except Exception:
+                logger.exception("Error in connection change callback")
 
     async def execute(
         self, tool_name: str, args: dict[str, Any], handler: Any
     ) -> ToolResult:
-        """Send a tool call over the pipe and wait for the result."""
+        """Send a tool call over the pipe and wait for the result.
+
+        Tools whose handler module defines `merge_pages` are fetched page
+        by page (see `_execute_paged`).
+        """
         if self._connection is None:
             return ToolResult.fail(
                 "ADAPTER_NOT_AVAILABLE",
                 "Revit add-in is not connected",
             )
+        if hasattr(handler, "merge_pages"):
+            return await self._execute_paged(tool_name, args, handler)
+        return await self._call(tool_name, args)
+
+    async def _execute_paged(
+        self, tool_name: str, args: dict[str, Any], handler: Any
+    ) -> ToolResult:
+        """Read a large selection in pages of `handler.PAGE_SIZE` and merge them.
+
+        The first page reports how many elements match, how far it got
+        (``next_offset``; the add-in may cap the page size) and a
+        ``query_token`` under which the add-in keeps the matching ids. The
+        remaining pages pass the token and are requested with the first
+        page's stride and up to PAGES_IN_FLIGHT outstanding, so the add-in
+        has the next page queued while the previous one is on the pipe, and
+        no single message approaches the pipe's size limit.
+        """
+        wanted = args.get("max_elements")
 
+        def page_args(offset: int, size: int, token: str | None = None) -> dict[str, Any]:
+            limit = size if wanted is None else min(size, wanted - offset)
+            page = {**args, "offset": offset, "limit": limit}
+            if token is not None:
+                page["query_token"] = token
+            return page
+
+        first = await self._call(tool_name, page_args(0, handler.PAGE_SIZE))
+        if not first.success:
+            return first
+        total = first.data.get("total", 0)
+        end = total if wanted is None else min(total, wanted)
+        step = first.data.get("next_offset") or 0
+        token = first.data.get("query_token")
+        offsets = range(step, end, step) if step else range(0)
+
+        in_flight = asyncio.Semaphore(PAGES_IN_FLIGHT)
+
+        async def fetch(offset: int) -> ToolResult:
+            async with in_flight:
+                return await self._call(tool_name, page_args(offset, step, token))
+
+        rest = await asyncio.gather(*(fetch(offset) for offset in offsets))
+        for result in rest:
+            if not result.success:
+                return result
+        data = handler.merge_pages([first.data, *(result.data for result in rest)])
+        if end < total:
+            data["truncated"] = True
+        logger.debug("%s read %d elements in %d pages", tool_name, data["count"], len(rest) + 1)
+        return ToolResult.ok(
+            data, duration_ms=first.duration_ms + sum(r.duration_ms for r in rest)
+        )
+
+    async def _call(self, tool_name: str, args: dict[str, Any]) -> ToolResult:
+        if self._connection is None:
+            return ToolResult.fail("PIPE_DISCONNECTED", "Lost connection to Revit add-in")
         message = make_tool_call(tool_name, args)
         try:
             result = await self._connection.send_and_wait(message)
@@ -56,7 +131,7 @@ class RevitAddinAdapter(BaseAdapter):
         except asyncio.TimeoutError:
             return ToolResult.fail("PIPE_TIMEOUT", "Revit add-in did not respond in time")
         except ConnectionError:
-            self._connection = None
+            self.set_connection(None)
             return ToolResult.fail("PIPE_DISCONNECTED", "Lost connection to Revit add-in")
 
     async def is_available(self) -> bool:
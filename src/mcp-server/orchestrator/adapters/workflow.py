@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from .base import BaseAdapter
 from ..dispatcher.result import ToolResult
@@ -20,6 +21,8 @@ class WorkflowAdapter(BaseAdapter):
 
     def __init__(self) -> None:
         self._dispatcher: Any | None = None
+        self._state_dir: Path | None = None
+        self._progress_listener: Callable[[str, float, float | None, str], None] | None = None
 
     @property
     def name(self) -> str:
@@ -29,15 +32,38 @@ class WorkflowAdapter(BaseAdapter):
         """Set the dispatcher for sub-tool calls within workflows."""
         self._dispatcher = dispatcher
 
+    def set_state_dir(self, state_dir: Path) -> None:
+        """Set the directory workflows keep resumable state in."""
+        self._state_dir = state_dir
+
+    def set_progress_listener(
+        self, listener: Callable[[str, float, float | None, str], None] | None
+    ) -> None:
+        """Set a callback receiving (tool_name, progress, total, message) as workflows run."""
+        self._progress_listener = listener
+
     async def execute(
         self, tool_name: str, args: dict[str, Any], handler: Any
     ) -> ToolResult:
         """Execute a workflow via the handler module.
 
-        The handler receives the dispatcher so it can make sub-tool calls.
+        The handler receives the dispatcher so it can make sub-tool calls,
+        the state directory and a progress callback.
         """
+        on_progress = None
+        if self._progress_listener is not None:
+            listener = self._progress_listener
+
+            def on_progress(progress: float, total: float | None, message: str) -> None:
+                listener(tool_name, progress, total, message)
+
         try:
-            result = await handler.execute(args, dispatcher=self._dispatcher)
+            result = await handler.execute(
+                args,
+                dispatcher=self._dispatcher,
+                state_dir=self._state_dir,
+                on_progress=on_progress,
+            )
             return result
         except Exception as e:
             logger.exception("Workflow error for %s", tool_name)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -16,12 +17,41 @@ class Config:
     handlers_dir: Path = field(default_factory=lambda: Path(__file__).parent / "handlers")
 
     # LLM settings
-    llm_provider: str = "claude"  # "claude" or "openai"
+    llm_provider: str = "claude"  # "claude", "openai" or "stand-in"
     anthropic_api_key: str = ""
     anthropic_model: str = "claude-sonnet-4-20250514"
     openai_api_key: str = ""
     openai_model: str = "gpt-4o"
 
+    # Hedging and failover to a second provider ("" disables)
+    llm_fallback_provider: str = ""
+    llm_hedge_after_seconds: float = 10.0  # 0 disables hedging
+    llm_failover_threshold: int = 3
+    llm_failover_cooldown_seconds: float = 60.0
+
+    # Record/replay response cache: "off", "record", "replay" or "passthrough"
+    llm_cache_mode: str = "off"
+    llm_cache_max_mb: float = 256.0
+
+    # Shared LLM client pool and rate limiting (0 = learn limits from headers)
+    llm_max_connections: int = 20
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
+
+    # Per-session LLM usage budget (0 = unlimited)
+    llm_session_max_requests: int = 0
+    llm_session_max_tokens: int = 0
+
+    # MCP transport: "stdio", or "streamable-http"/"sse" to serve many sessions
+    transport: str = "stdio"
+    http_host: str = "127.0.0.1"
+    http_port: int = 8000
+
+    # Tool-call scheduling across sessions (HTTP transports only)
+    max_concurrent_calls: int = 16
+    session_max_concurrent_calls: int = 4
+    session_max_queued_calls: int = 64
+
     # Pipe settings
     pipe_timeout_seconds: float = 30.0
     ping_interval_seconds: float = 30.0
@@ -30,21 +60,187 @@ class Config:
     # Hot-reload
     watch_tools_dir: bool = True
 
+    # Answer the MCP handshake before the tool catalog has loaded
+    fast_start: bool = False
+
+    # Startup catalog cache
+    catalog_cache: bool = True
+    cache_dir: Path = field(
+        default_factory=lambda: Path(tempfile.gettempdir()) / "revit-orchestrator"
+    )
+
+    # pyRevit worker pool (0 disables pooling; experimental, off by default)
+    pyrevit_pool_size: int = 0
+    pyrevit_worker_max_runs: int = 500
+    pyrevit_worker_max_memory_mb: float = 1024.0
+
+    # Script output capture
+    script_output_memory_kb: int = 256
+    script_output_preview_bytes: int = 4096
+    script_output_log_ttl_seconds: float = 86400.0  # spilled logs older than this are deleted
+    script_output_log_max_mb: int = 256
+
+    # Dynamo graphs
+    dynamo_graphs_dir: Path | None = None  # pre-indexed at startup if set
+
+    # Large results kept server-side and read through results.read (0 disables)
+    result_inline_kb: int = 32
+    result_store_memory_mb: int = 64
+    result_store_disk_mb: int = 512
+    result_ttl_seconds: float = 900.0
+
+    # Grid cell size of the spatial index, in feet
+    spatial_cell_size_ft: float = 10.0
+
+    # Capture log of MCP calls and pipe messages for benchmarks/replay.py
+    capture_path: Path | None = None
+
+    # Adapter health probing
+    health_probe_interval_seconds: float = 15.0
+    health_ttl_seconds: float = 60.0
+
     @classmethod
     def from_env(cls) -> Config:
         """Load configuration from environment variables."""
         return cls(
             pipe_name=os.getenv("ORCHESTRATOR_PIPE_NAME", cls.pipe_name),
-            tools_dir=Path(os.getenv("ORCHESTRATOR_TOOLS_DIR", str(cls.tools_dir.fget(None)))),  # type: ignore[union-attr]
+            tools_dir=Path(os.getenv("ORCHESTRATOR_TOOLS_DIR", str(Path(__file__).parent / "tools"))),
             llm_provider=os.getenv("ORCHESTRATOR_LLM_PROVIDER", cls.llm_provider),
             anthropic_api_key=os.getenv("ANTHROPIC_API_KEY", ""),
             anthropic_model=os.getenv("ANTHROPIC_MODEL", cls.anthropic_model),
             openai_api_key=os.getenv("OPENAI_API_KEY", ""),
             openai_model=os.getenv("OPENAI_MODEL", cls.openai_model),
+            llm_fallback_provider=os.getenv(
+                "ORCHESTRATOR_LLM_FALLBACK_PROVIDER", cls.llm_fallback_provider
+            ),
+            llm_hedge_after_seconds=float(
+                os.getenv("ORCHESTRATOR_LLM_HEDGE_AFTER", str(cls.llm_hedge_after_seconds))
+            ),
+            llm_failover_threshold=int(
+                os.getenv("ORCHESTRATOR_LLM_FAILOVER_THRESHOLD", str(cls.llm_failover_threshold))
+            ),
+            llm_failover_cooldown_seconds=float(
+                os.getenv(
+                    "ORCHESTRATOR_LLM_FAILOVER_COOLDOWN", str(cls.llm_failover_cooldown_seconds)
+                )
+            ),
+            llm_cache_mode=os.getenv("ORCHESTRATOR_LLM_CACHE", cls.llm_cache_mode).lower(),
+            llm_cache_max_mb=float(
+                os.getenv("ORCHESTRATOR_LLM_CACHE_MAX_MB", str(cls.llm_cache_max_mb))
+            ),
+            llm_max_connections=int(
+                os.getenv("ORCHESTRATOR_LLM_MAX_CONNECTIONS", str(cls.llm_max_connections))
+            ),
+            llm_requests_per_minute=int(
+                os.getenv("ORCHESTRATOR_LLM_RPM", str(cls.llm_requests_per_minute))
+            ),
+            llm_tokens_per_minute=int(
+                os.getenv("ORCHESTRATOR_LLM_TPM", str(cls.llm_tokens_per_minute))
+            ),
+            llm_session_max_requests=int(
+                os.getenv(
+                    "ORCHESTRATOR_LLM_SESSION_MAX_REQUESTS", str(cls.llm_session_max_requests)
+                )
+            ),
+            llm_session_max_tokens=int(
+                os.getenv("ORCHESTRATOR_LLM_SESSION_MAX_TOKENS", str(cls.llm_session_max_tokens))
+            ),
             pipe_timeout_seconds=float(
                 os.getenv("ORCHESTRATOR_PIPE_TIMEOUT", str(cls.pipe_timeout_seconds))
             ),
             watch_tools_dir=os.getenv("ORCHESTRATOR_WATCH_TOOLS", "true").lower() == "true",
+            fast_start=os.getenv("ORCHESTRATOR_FAST_START", "false").lower() == "true",
+            catalog_cache=os.getenv("ORCHESTRATOR_CATALOG_CACHE", "true").lower() == "true",
+            cache_dir=Path(
+                os.getenv(
+                    "ORCHESTRATOR_CACHE_DIR",
+                    str(Path(tempfile.gettempdir()) / "revit-orchestrator"),
+                )
+            ),
+            pyrevit_pool_size=int(
+                os.getenv("ORCHESTRATOR_PYREVIT_POOL_SIZE", str(cls.pyrevit_pool_size))
+            ),
+            pyrevit_worker_max_runs=int(
+                os.getenv(
+                    "ORCHESTRATOR_PYREVIT_WORKER_MAX_RUNS", str(cls.pyrevit_worker_max_runs)
+                )
+            ),
+            pyrevit_worker_max_memory_mb=float(
+                os.getenv(
+                    "ORCHESTRATOR_PYREVIT_WORKER_MAX_MEMORY_MB",
+                    str(cls.pyrevit_worker_max_memory_mb),
+                )
+            ),
+            script_output_memory_kb=int(
+                os.getenv(
+                    "ORCHESTRATOR_SCRIPT_OUTPUT_MEMORY_KB", str(cls.script_output_memory_kb)
+                )
+            ),
+            script_output_preview_bytes=int(
+                os.getenv(
+                    "ORCHESTRATOR_SCRIPT_OUTPUT_PREVIEW_BYTES",
+                    str(cls.script_output_preview_bytes),
+                )
+            ),
+            script_output_log_ttl_seconds=float(
+                os.getenv(
+                    "ORCHESTRATOR_SCRIPT_OUTPUT_LOG_TTL",
+                    str(cls.script_output_log_ttl_seconds),
+                )
+            ),
+            script_output_log_max_mb=int(
+                os.getenv(
+                    "ORCHESTRATOR_SCRIPT_OUTPUT_LOG_MAX_MB", str(cls.script_output_log_max_mb)
+                )
+            ),
+            dynamo_graphs_dir=(
+                Path(os.environ["ORCHESTRATOR_DYNAMO_GRAPHS_DIR"])
+                if os.getenv("ORCHESTRATOR_DYNAMO_GRAPHS_DIR")
+                else None
+            ),
+            transport=os.getenv("ORCHESTRATOR_TRANSPORT", cls.transport),
+            http_host=os.getenv("ORCHESTRATOR_HTTP_HOST", cls.http_host),
+            http_port=int(os.getenv("ORCHESTRATOR_HTTP_PORT", str(cls.http_port))),
+            max_concurrent_calls=int(
+                os.getenv("ORCHESTRATOR_MAX_CONCURRENT_CALLS", str(cls.max_concurrent_calls))
+            ),
+            session_max_concurrent_calls=int(
+                os.getenv(
+                    "ORCHESTRATOR_SESSION_MAX_CONCURRENT_CALLS",
+                    str(cls.session_max_concurrent_calls),
+                )
+            ),
+            session_max_queued_calls=int(
+                os.getenv("ORCHESTRATOR_SESSION_MAX_QUEUED", str(cls.session_max_queued_calls))
+            ),
+            result_inline_kb=int(
+                os.getenv("ORCHESTRATOR_RESULT_INLINE_KB", str(cls.result_inline_kb))
+            ),
+            result_store_memory_mb=int(
+                os.getenv("ORCHESTRATOR_RESULT_STORE_MEMORY_MB", str(cls.result_store_memory_mb))
+            ),
+            result_store_disk_mb=int(
+                os.getenv("ORCHESTRATOR_RESULT_STORE_DISK_MB", str(cls.result_store_disk_mb))
+            ),
+            result_ttl_seconds=float(
+                os.getenv("ORCHESTRATOR_RESULT_TTL", str(cls.result_ttl_seconds))
+            ),
+            spatial_cell_size_ft=float(
+                os.getenv("ORCHESTRATOR_SPATIAL_CELL_SIZE", str(cls.spatial_cell_size_ft))
+            ),
+            capture_path=(
+                Path(os.environ["ORCHESTRATOR_CAPTURE"])
+                if os.getenv("ORCHESTRATOR_CAPTURE")
+                else None
+            ),
+            health_probe_interval_seconds=float(
+                os.getenv(
+                    "ORCHESTRATOR_HEALTH_INTERVAL", str(cls.health_probe_interval_seconds)
+                )
+            ),
+            health_ttl_seconds=float(
+                os.getenv("ORCHESTRATOR_HEALTH_TTL", str(cls.health_ttl_seconds))
+            ),
         )
 
     @classmethod
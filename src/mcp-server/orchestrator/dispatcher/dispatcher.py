@@ -6,11 +6,13 @@ import importlib
 import logging
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from ..adapters.health import AdapterHealthMonitor
 from ..registry.registry import ToolRegistry
 from ..registry.schema_validator import validate_tool_args
 from .result import ToolResult
+from .result_store import READ_TOOL, ResultStore
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +25,43 @@ class Dispatcher:
         registry: ToolRegistry,
         adapters: dict[str, Any],
         handlers_dir: Path,
+        health: AdapterHealthMonitor | None = None,
     ) -> None:
         self._registry = registry
         self._adapters = adapters
         self._handlers_dir = handlers_dir
+        self._health = health
         self._handler_cache: dict[str, Any] = {}
+        self._on_mutation_callbacks: list[
+            Callable[[str, dict[str, Any], ToolResult], None]
+        ] = []
+        self._result_store: ResultStore | None = None
 
-    async def dispatch(self, tool_name: str, args: dict[str, Any]) -> ToolResult:
+    @property
+    def registry(self) -> ToolRegistry:
+        return self._registry
+
+    @property
+    def result_store(self) -> ResultStore | None:
+        return self._result_store
+
+    def set_result_store(self, store: ResultStore | None) -> None:
+        """Store large results server-side when `dispatch` is asked to offload."""
+        self._result_store = store
+
+    def on_mutation(
+        self, callback: Callable[[str, dict[str, Any], ToolResult], None]
+    ) -> None:
+        """Register a callback invoked after a tool that may modify the model succeeds.
+
+        Tools whose definition sets ``read_only: true`` do not trigger it.
+        The callback receives the tool name, its arguments and its result.
+        """
+        self._on_mutation_callbacks.append(callback)
+
+    async def dispatch(
+        self, tool_name: str, args: dict[str, Any], offload: bool = False
+    ) -> ToolResult:
         """Dispatch a tool call to the appropriate adapter/handler.
 
         Steps:
@@ -37,6 +69,11 @@ class Dispatcher:
         2. Validate args against the tool's parameter schema
         3. Load the handler module
         4. Execute via the appropriate adapter
+
+        With `offload`, a large successful result is kept in the result
+        store and replaced by a summary and handle (see `ResultStore`).
+        Callers that hand results to a client or model pass it; workflow
+        sub-calls do not, so they always see the full data.
         """
         start = time.perf_counter_ns()
 
@@ -56,7 +93,11 @@ class Dispatcher:
         # 3. Determine adapter
         adapter_name = definition["adapter"]
         adapter = self._adapters.get(adapter_name)
-        if adapter is None:
+        # Cached health is a memory read; unknown or stale state is let through
+        if adapter is None or (
+            self._health is not None
+            and self._health.is_available(adapter_name) is False
+        ):
             return ToolResult.fail(
                 "ADAPTER_NOT_AVAILABLE",
                 f"Adapter '{adapter_name}' is not available",
@@ -68,12 +109,25 @@ class Dispatcher:
             result = await adapter.execute(tool_name, args, handler)
             elapsed_ms = int((time.perf_counter_ns() - start) / 1_000_000)
             result.duration_ms = elapsed_ms
+            if result.success and not definition.get("read_only", False):
+                self._notify_mutation(tool_name, args, result)
+            if offload and self._result_store is not None and tool_name != READ_TOOL:
+                result = self._result_store.offload(tool_name, result)
             return result
         except Exception as e:
             elapsed_ms = int((time.perf_counter_ns() - start) / 1_000_000)
             logger.exception("Handler error for tool %s", tool_name)
             return ToolResult.fail("HANDLER_ERROR", str(e), duration_ms=elapsed_ms)
 
+    def _notify_mutation(
+        self, tool_name: str, args: dict[str, Any], result: ToolResult
+    ) -> None:
+        for cb in self._on_mutation_callbacks:
+            try:
+                cb(tool_name, args, result)
+            except Exception:
+                logger.exception("Error in mutation callback")
+
     def _load_handler(self, tool_name: str) -> Any:
         """Load the handler module for a tool.
 
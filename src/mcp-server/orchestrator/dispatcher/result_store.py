@@ -0,0 +1,298 @@
+"""Server-side store for large tool results.
+
+A single element query can return megabytes of data, and handing all of it
+to the MCP client floods the client and the LLM context. When a result's
+serialized data is larger than `inline_bytes`, the dispatcher keeps the
+data in a `ResultStore`. The client gets a compact summary and a handle
+instead, and reads pages or projections of the data through the
+``results.read`` tool.
+
+Stored results live in memory up to `memory_bytes`. Past that, the least
+recently used ones spill to JSON files, and past `disk_bytes` they are
+dropped. Handles expire `ttl_seconds` after their last use. A handle can
+only be read from the MCP session that created it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import secrets
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..sessions import current_session
+from .result import ToolResult
+
+logger = logging.getLogger(__name__)
+
+READ_TOOL = "results.read"
+SUMMARY_MAX_KEYS = 20
+SUMMARY_MAX_STRING = 80
+
+
+class ResultNotFoundError(KeyError):
+    """Raised for unknown or expired result handles."""
+
+
+@dataclass
+class _Entry:
+    tool_name: str
+    session_id: str
+    size_bytes: int
+    expires_at: float
+    data: Any = None  # None once spilled
+    path: Path | None = None  # spill file
+
+
+class ResultStore:
+    """Bounded LRU store of large tool results, addressed by handle.
+
+    Args:
+        inline_bytes: Results up to this size are returned unchanged.
+        memory_bytes: Stored data kept in memory before spilling to disk.
+        disk_bytes: Spilled data kept before the oldest entries are dropped.
+        ttl_seconds: A handle expires this long after it was last used.
+        spill_dir: Directory for spill files (default: a temp directory).
+    """
+
+    def __init__(
+        self,
+        inline_bytes: int = 32 * 1024,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 900.0,
+        spill_dir: Path | None = None,
+    ) -> None:
+        self._inline_bytes = inline_bytes
+        self._memory_bytes = memory_bytes
+        self._disk_bytes = disk_bytes
+        self._ttl = ttl_seconds
+        self._spill_dir = spill_dir
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()  # least recent first
+        self._in_memory = 0
+        self._on_disk = 0
+        self.offloaded = 0
+        self.spilled = 0
+        self.evicted = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return store occupancy counters."""
+        return {
+            "entries": len(self._entries),
+            "memory_bytes": self._in_memory,
+            "disk_bytes": self._on_disk,
+            "offloaded": self.offloaded,
+            "spilled": self.spilled,
+            "evicted": self.evicted,
+        }
+
+    def offload(self, tool_name: str, result: ToolResult) -> ToolResult:
+        """Return `result`, or a summary and handle if its data is too large."""
+        if not result.success or self._inline_bytes <= 0:
+            return result
+        size = len(json.dumps(result.data, default=str).encode("utf-8"))
+        if size <= self._inline_bytes:
+            return result
+
+        self._purge_expired()
+        handle = f"r-{secrets.token_hex(8)}"
+        self._entries[handle] = _Entry(
+            tool_name=tool_name,
+            session_id=current_session.get(),
+            size_bytes=size,
+            expires_at=time.monotonic() + self._ttl,
+            data=result.data,
+        )
+        self._in_memory += size
+        self.offloaded += 1
+        self._enforce_limits()
+        logger.debug("Stored %d-byte result of %s as %s", size, tool_name, handle)
+        return ToolResult.ok(
+            {
+                "result_handle": handle,
+                "stored": True,
+                "size_bytes": size,
+                "expires_in_seconds": int(self._ttl),
+                "summary": summarize(result.data),
+                "hint": (
+                    f"The full result is stored on the server. Call {READ_TOOL} with "
+                    "this result_handle to read pages (offset/limit) or selected "
+                    "fields, optionally under a path."
+                ),
+            },
+            duration_ms=result.duration_ms,
+        )
+
+    def get(self, handle: str) -> Any:
+        """Return a stored result's data and refresh its TTL.
+
+        Handles of other sessions are reported as not found.
+        """
+        self._purge_expired()
+        entry = self._entries.get(handle)
+        if entry is None or entry.session_id != current_session.get():
+            raise ResultNotFoundError(handle)
+        self._entries.move_to_end(handle)
+        entry.expires_at = time.monotonic() + self._ttl
+        if entry.data is not None:
+            return entry.data
+        assert entry.path is not None
+        try:
+            return json.loads(entry.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Lost spilled result %s: %s", handle, e)
+            self._drop(handle)
+            raise ResultNotFoundError(handle) from e
+
+    def read(
+        self,
+        handle: str,
+        path: str = "",
+        offset: int = 0,
+        limit: int = 50,
+        fields: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return one page of a stored result.
+
+        `path` selects a nested value by dot-separated keys and list
+        indices. Lists are paged by item and objects by key; `fields` keeps
+        only those keys of each object item.
+        """
+        value = self.get(handle)
+        for part in [p for p in path.split(".") if p]:
+            if isinstance(value, list):
+                try:
+                    value = value[int(part)]
+                except (ValueError, IndexError):
+                    raise KeyError(f"No index {part!r} in list at path {path!r}")
+            elif isinstance(value, dict):
+                if part not in value:
+                    raise KeyError(f"No key {part!r} at path {path!r}")
+                value = value[part]
+            else:
+                raise KeyError(f"Cannot descend into {type(value).__name__} at {part!r}")
+
+        page: dict[str, Any] = {"result_handle": handle, "path": path}
+        if isinstance(value, list):
+            items = [_project(item, fields) for item in value[offset:offset + limit]]
+            total = len(value)
+        elif isinstance(value, dict):
+            keys = list(value)[offset:offset + limit]
+            items = {key: _project(value[key], fields) for key in keys}
+            total = len(value)
+        else:
+            page["value"] = value
+            return page
+        end = offset + len(items)
+        page.update({
+            "total": total,
+            "offset": offset,
+            "count": len(items),
+            "items": items,
+            "next_offset": end if end < total else None,
+        })
+        return page
+
+    def discard(self, handle: str) -> None:
+        self._drop(handle)
+
+    def discard_session(self, session_id: str) -> None:
+        """Drop every result stored by a session that has ended."""
+        for handle in [h for h, e in self._entries.items() if e.session_id == session_id]:
+            self._drop(handle)
+
+    def clear(self) -> None:
+        for handle in list(self._entries):
+            self._drop(handle)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for handle in [h for h, e in self._entries.items() if e.expires_at <= now]:
+            self._drop(handle)
+
+    def _enforce_limits(self) -> None:
+        """Spill least recently used entries, then drop spilled ones."""
+        for handle, entry in list(self._entries.items()):
+            if self._in_memory <= self._memory_bytes:
+                break
+            if entry.data is not None:
+                self._spill(handle, entry)
+        for handle, entry in list(self._entries.items()):
+            if self._on_disk <= self._disk_bytes:
+                break
+            if entry.path is not None:
+                self._drop(handle)
+                self.evicted += 1
+
+    def _spill(self, handle: str, entry: _Entry) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="orchestrator-results-"))
+        self._spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self._spill_dir / f"{handle}.json"
+        try:
+            path.write_text(json.dumps(entry.data, default=str), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Could not spill result %s, dropping it: %s", handle, e)
+            self._drop(handle)
+            self.evicted += 1
+            return
+        entry.data = None
+        entry.path = path
+        self._in_memory -= entry.size_bytes
+        self._on_disk += entry.size_bytes
+        self.spilled += 1
+
+    def _drop(self, handle: str) -> None:
+        entry = self._entries.pop(handle, None)
+        if entry is None:
+            return
+        if entry.path is not None:
+            self._on_disk -= entry.size_bytes
+            entry.path.unlink(missing_ok=True)
+        else:
+            self._in_memory -= entry.size_bytes
+
+
+def summarize(value: Any) -> dict[str, Any]:
+    """Describe a result's shape compactly: short scalars verbatim, the
+    length of lists and objects, and the keys of list items."""
+    if isinstance(value, list):
+        return _describe_list(value)
+    if isinstance(value, dict):
+        keys = list(value)
+        summary: dict[str, Any] = {}
+        for key in keys[:SUMMARY_MAX_KEYS]:
+            summary[key] = _describe(value[key])
+        if len(keys) > SUMMARY_MAX_KEYS:
+            summary["..."] = f"{len(keys) - SUMMARY_MAX_KEYS} more keys"
+        return summary
+    return {"value": _describe(value)}
+
+
+def _describe(value: Any) -> Any:
+    if isinstance(value, list):
+        return _describe_list(value)
+    if isinstance(value, dict):
+        return f"object with {len(value)} keys"
+    if isinstance(value, str) and len(value) > SUMMARY_MAX_STRING:
+        return f"string of {len(value)} characters"
+    return value
+
+
+def _describe_list(value: list[Any]) -> dict[str, Any]:
+    described: dict[str, Any] = {"list_length": len(value)}
+    if value and isinstance(value[0], dict):
+        described["item_keys"] = list(value[0])[:SUMMARY_MAX_KEYS]
+    return described
+
+
+def _project(item: Any, fields: list[str] | None) -> Any:
+    if fields and isinstance(item, dict):
+        return {f: item[f] for f in fields if f in item}
+    return item
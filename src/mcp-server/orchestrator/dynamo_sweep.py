@@ -0,0 +1,207 @@
+"""Parameter sweeps over a Dynamo graph.
+
+A sweep expands a cartesian grid (or an explicit list) of input sets and
+runs each one through ``dynamo.run_graph`` via the dispatcher, keeping at
+most `max_in_flight` runs queued to the add-in at a time. Each finished run
+is appended to a JSON-lines state file as it completes, so an interrupted
+sweep can resume where it left off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from .dispatcher.result import ToolResult
+
+logger = logging.getLogger(__name__)
+
+MAX_COMBINATIONS = 10_000
+
+
+@dataclass
+class SweepRun:
+    """Outcome of one input set in a sweep."""
+
+    index: int
+    inputs: dict[str, Any]
+    success: bool
+    data: dict[str, Any]
+    error: dict[str, str] | None = None
+    resumed: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "inputs": self.inputs,
+            "success": self.success,
+            "data": self.data,
+            "error": self.error,
+        }
+
+
+def expand_input_sets(
+    grid: dict[str, list[Any]] | None = None,
+    input_sets: list[dict[str, Any]] | None = None,
+    base_inputs: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Build the ordered list of input sets for a sweep.
+
+    `grid` maps input names to candidate values and is expanded as a
+    cartesian product; `input_sets` are used as given. `base_inputs` are
+    merged under every set.
+
+    Raises:
+        ValueError: If no input sets result or there are too many.
+    """
+    base = dict(base_inputs or {})
+    sets: list[dict[str, Any]] = []
+    if grid:
+        names = list(grid)
+        count = 1
+        for name in names:
+            count *= len(grid[name])
+        if count > MAX_COMBINATIONS:
+            raise ValueError(
+                f"Grid expands to {count} combinations (maximum {MAX_COMBINATIONS})"
+            )
+        for values in itertools.product(*(grid[name] for name in names)):
+            sets.append({**base, **dict(zip(names, values))})
+    for extra in input_sets or []:
+        sets.append({**base, **extra})
+
+    if not sets:
+        raise ValueError("Sweep needs a non-empty 'grid' or 'input_sets'")
+    if len(sets) > MAX_COMBINATIONS:
+        raise ValueError(f"Sweep has {len(sets)} input sets (maximum {MAX_COMBINATIONS})")
+    return sets
+
+
+def sweep_fingerprint(graph_path: str, sets: list[dict[str, Any]]) -> str:
+    """Hash identifying a sweep's graph and input sets."""
+    canonical = json.dumps(
+        [graph_path, sets], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SweepStore:
+    """JSON-lines state file for one sweep.
+
+    The first line is a header with the sweep fingerprint; every following
+    line is a finished `SweepRun`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self, fingerprint: str) -> dict[int, SweepRun]:
+        """Return successful runs recorded for this sweep.
+
+        Raises:
+            ValueError: If the file belongs to a different graph or input sets.
+        """
+        if not self._path.exists():
+            return {}
+        done: dict[int, SweepRun] = {}
+        with open(self._path, encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("fingerprint") != fingerprint:
+                raise ValueError(
+                    f"Sweep state {self._path.name} was created for a different "
+                    "graph or input sets"
+                )
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from an interrupted sweep
+                if record.get("success"):
+                    done[record["index"]] = SweepRun(
+                        index=record["index"],
+                        inputs=record["inputs"],
+                        success=True,
+                        data=record.get("data") or {},
+                        resumed=True,
+                    )
+        return done
+
+    def begin(self, fingerprint: str, graph_path: str, total: int) -> None:
+        """Create the state file if it does not exist yet."""
+        if self._path.exists():
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"fingerprint": fingerprint, "graph_path": graph_path, "total": total}
+        self._path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+
+    def append(self, run: SweepRun) -> None:
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run.to_dict(), default=str) + "\n")
+
+
+async def iter_sweep(
+    dispatcher: Any,
+    graph_path: str,
+    sets: list[dict[str, Any]],
+    max_in_flight: int = 4,
+    skip: set[int] | None = None,
+) -> AsyncIterator[SweepRun]:
+    """Run input sets through ``dynamo.run_graph`` and yield runs as they finish.
+
+    Work is fed through a bounded queue to `max_in_flight` workers, so at
+    most that many graph runs are outstanding at once. Indices in `skip`
+    are not run.
+    """
+    pending: asyncio.Queue[tuple[int, dict[str, Any]] | None] = asyncio.Queue(
+        maxsize=max_in_flight
+    )
+    finished: asyncio.Queue[SweepRun] = asyncio.Queue()
+    skip = skip or set()
+    remaining = sum(1 for i in range(len(sets)) if i not in skip)
+
+    async def produce() -> None:
+        for index, inputs in enumerate(sets):
+            if index not in skip:
+                await pending.put((index, inputs))
+        for _ in range(max_in_flight):
+            await pending.put(None)
+
+    async def work() -> None:
+        while (item := await pending.get()) is not None:
+            index, inputs = item
+            try:
+                result: ToolResult = await dispatcher.dispatch(
+                    "dynamo.run_graph", {"graph_path": graph_path, "inputs": inputs}
+                )
+            except Exception as e:
+                logger.exception("Sweep run %d failed", index)
+                result = ToolResult.fail("HANDLER_ERROR", str(e))
+            error = None
+            if not result.success:
+                error = {
+                    "code": result.error_code or "DYNAMO_EXECUTION_ERROR",
+                    "message": result.error_message or "",
+                }
+            await finished.put(
+                SweepRun(index, inputs, result.success, result.data, error)
+            )
+
+    tasks = [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(work()) for _ in range(max_in_flight)]
+    try:
+        for _ in range(remaining):
+            yield await finished.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
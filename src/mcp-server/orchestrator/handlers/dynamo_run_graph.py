@@ -2,22 +2,60 @@
 
 from __future__ import annotations
 
+import asyncio
+import difflib
+import logging
 from typing import Any
 
+from ..adapters.dynamo_graphs import GraphIndex, GraphInfo
 from ..dispatcher.result import ToolResult
 
+logger = logging.getLogger(__name__)
 
-async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
+
+async def execute(
+    args: dict[str, Any],
+    index: GraphIndex | None = None,
+    **kwargs: Any,
+) -> ToolResult:
     """Execute a Dynamo graph.
 
     The actual execution is handled by the Revit add-in's Dynamo integration.
-    This handler prepares the request to be sent over the pipe.
+    This handler checks the inputs against the graph's input nodes and
+    prepares the request to be sent over the pipe.
     """
     graph_path = args["graph_path"]
     inputs = args.get("inputs", {})
 
+    info: GraphInfo | None = None
+    if index is not None:
+        try:
+            # Reading and hashing a large graph should not block the event loop
+            info = await asyncio.to_thread(index.get, graph_path)
+        except OSError as e:
+            # Not readable from here (e.g. a path on the Revit machine): pass it on
+            logger.debug("Not checking Dynamo graph %s: %s", graph_path, e)
+        if info is not None:
+            unknown = info.unknown_inputs(inputs)
+            if unknown:
+                return ToolResult.fail(
+                    "SCHEMA_VALIDATION_FAILED", _unknown_inputs_message(info, unknown)
+                )
+
     return ToolResult.ok({
         "message": f"Delegated Dynamo graph execution: {graph_path}",
         "graph_path": graph_path,
         "inputs": inputs,
     })
+
+
+def _unknown_inputs_message(info: GraphInfo, unknown: list[str]) -> str:
+    known = sorted(info.inputs or {})
+    parts = []
+    for name in unknown:
+        close = difflib.get_close_matches(name, known, n=1)
+        parts.append(f"'{name}' (did you mean '{close[0]}'?)" if close else f"'{name}'")
+    return (
+        f"Unknown input(s) for graph {info.path.name}: {', '.join(parts)}. "
+        f"Graph inputs: {', '.join(known) or 'none'}"
+    )
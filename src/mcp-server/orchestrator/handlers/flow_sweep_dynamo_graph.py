@@ -0,0 +1,85 @@
+"""Handler for flow.sweep_dynamo_graph — runs a Dynamo graph over many input sets."""
+
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+from ..dispatcher.result import ToolResult
+from ..dynamo_sweep import (
+    SweepStore,
+    expand_input_sets,
+    iter_sweep,
+    sweep_fingerprint,
+)
+
+
+async def execute(
+    args: dict[str, Any],
+    dispatcher: Any = None,
+    state_dir: Path | None = None,
+    on_progress: Callable[[float, float | None, str], None] | None = None,
+    **kwargs: Any,
+) -> ToolResult:
+    """Run a parameter sweep over a Dynamo graph.
+
+    Each input set is dispatched as a dynamo.run_graph call. Finished runs
+    are appended to the sweep's state file under `state_dir` and reported
+    through `on_progress(done, total, message)` as they complete; passing
+    the returned `sweep_id` again resumes the sweep, re-running only input
+    sets that have not yet succeeded.
+    """
+    if dispatcher is None:
+        return ToolResult.fail(
+            "HANDLER_ERROR",
+            "Workflow handler requires a dispatcher for sub-tool calls",
+        )
+    if state_dir is None:
+        return ToolResult.fail(
+            "HANDLER_ERROR",
+            "Sweep handler requires a state directory for its run log",
+        )
+
+    graph_path = args["graph_path"]
+    try:
+        sets = expand_input_sets(
+            args.get("grid"), args.get("input_sets"), args.get("base_inputs")
+        )
+    except ValueError as e:
+        return ToolResult.fail("SCHEMA_VALIDATION_FAILED", str(e))
+
+    sweep_id = args.get("sweep_id") or uuid.uuid4().hex[:12]
+    fingerprint = sweep_fingerprint(graph_path, sets)
+    store = SweepStore(state_dir / "sweeps" / f"{sweep_id}.jsonl")
+    try:
+        runs = store.load(fingerprint)
+    except ValueError as e:
+        return ToolResult.fail("SCHEMA_VALIDATION_FAILED", str(e))
+    resumed_count = len(runs)
+    store.begin(fingerprint, graph_path, len(sets))
+
+    async for run in iter_sweep(
+        dispatcher,
+        graph_path,
+        sets,
+        max_in_flight=args.get("max_in_flight", 4),
+        skip=set(runs),
+    ):
+        runs[run.index] = run
+        store.append(run)
+        if on_progress is not None:
+            outcome = "ok" if run.success else run.error["code"]  # type: ignore[index]
+            on_progress(len(runs), len(sets), f"run {run.index} {run.inputs}: {outcome}")
+
+    ordered = [runs[i] for i in sorted(runs)]
+    failed = [run for run in ordered if not run.success]
+    return ToolResult.ok({
+        "sweep_id": sweep_id,
+        "total": len(sets),
+        "succeeded": len(ordered) - len(failed),
+        "failed": len(failed),
+        "resumed": resumed_count,
+        "state_path": str(store.path),
+        "results": [run.to_dict() for run in ordered],
+    })
@@ -3,51 +3,44 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 import os
-from typing import Any
+from typing import Any, Callable
 
+from ..adapters.output_capture import CaptureLimits, OutputCapture
+from ..adapters.pyrevit_pool import PyRevitWorkerPool, WorkerError
 from ..dispatcher.result import ToolResult
 
+SCRIPT_TIMEOUT_SECONDS = 120
+READ_CHUNK_SIZE = 64 * 1024
 
-async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
-    """Execute a pyRevit script via the CLI.
 
-    Runs the script as a subprocess and captures stdout/stderr.
+async def execute(
+    args: dict[str, Any],
+    pool: PyRevitWorkerPool | None = None,
+    limits: CaptureLimits | None = None,
+    on_output: Callable[[str, str], None] | None = None,
+    **kwargs: Any,
+) -> ToolResult:
+    """Execute a pyRevit script.
+
+    Runs the script on a warm worker when the adapter provides a pool,
+    otherwise as a one-off ``pyrevit run`` subprocess. Output is captured
+    incrementally within `limits`; each complete line is reported to
+    `on_output(stream, line)` while the script runs.
     """
     script_path = args["script_path"]
     script_args = args.get("arguments", {})
 
-    # Build environment with script arguments
-    env = os.environ.copy()
-    for key, value in script_args.items():
-        env[key] = str(value)
-
+    captures = {
+        stream: OutputCapture(stream, limits, on_line=on_output)
+        for stream in ("stdout", "stderr")
+    }
     try:
-        proc = await asyncio.create_subprocess_exec(
-            "pyrevit",
-            "run",
-            script_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=env,
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
-
-        stdout_str = stdout.decode("utf-8", errors="replace") if stdout else ""
-        stderr_str = stderr.decode("utf-8", errors="replace") if stderr else ""
-
-        if proc.returncode != 0:
-            return ToolResult.fail(
-                "PYREVIT_SCRIPT_ERROR",
-                f"Script exited with code {proc.returncode}: {stderr_str}",
-            )
-
-        return ToolResult.ok({
-            "stdout": stdout_str,
-            "stderr": stderr_str,
-            "exit_code": proc.returncode,
-        })
-
+        if pool is not None:
+            exit_code = await _run_pooled(pool, script_path, script_args, captures)
+        else:
+            exit_code = await _run_subprocess(script_path, script_args, captures)
     except FileNotFoundError:
         return ToolResult.fail(
             "PYREVIT_SCRIPT_ERROR",
@@ -56,5 +49,92 @@ async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
     except asyncio.TimeoutError:
         return ToolResult.fail(
             "PYREVIT_SCRIPT_ERROR",
-            "Script execution timed out after 120 seconds.",
+            f"Script execution timed out after {SCRIPT_TIMEOUT_SECONDS} seconds.",
+        )
+    except WorkerError as e:
+        return ToolResult.fail("PYREVIT_SCRIPT_ERROR", str(e))
+    finally:
+        for capture in captures.values():
+            capture.close()
+
+    stdout, stderr = captures["stdout"], captures["stderr"]
+    if exit_code != 0:
+        return ToolResult.fail(
+            "PYREVIT_SCRIPT_ERROR",
+            f"Script exited with code {exit_code}: {stderr.preview()}",
         )
+
+    return ToolResult.ok({
+        "stdout": stdout.preview(),
+        "stderr": stderr.preview(),
+        "exit_code": exit_code,
+        "truncated": stdout.truncated or stderr.truncated,
+        "output_bytes": {"stdout": stdout.total_bytes, "stderr": stderr.total_bytes},
+        "logs": {
+            name: str(capture.log_path)
+            for name, capture in captures.items()
+            if capture.log_path is not None
+        },
+    })
+
+
+async def _run_pooled(
+    pool: PyRevitWorkerPool,
+    script_path: str,
+    script_args: dict[str, Any],
+    captures: dict[str, OutputCapture],
+) -> int:
+    """Run the script on a pooled worker; arguments travel as JSON."""
+    result = await pool.run(
+        script_path,
+        script_args,
+        timeout=SCRIPT_TIMEOUT_SECONDS,
+        on_output=lambda stream, data: captures[stream].write(data),
+    )
+    return int(result["exit_code"])
+
+
+async def _run_subprocess(
+    script_path: str,
+    script_args: dict[str, Any],
+    captures: dict[str, OutputCapture],
+) -> int:
+    """Run the script as a one-off ``pyrevit run`` process."""
+    # Build environment with script arguments
+    env = os.environ.copy()
+    for key, value in script_args.items():
+        env[key] = str(value)
+
+    proc = await asyncio.create_subprocess_exec(
+        "pyrevit",
+        "run",
+        script_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    try:
+        async with asyncio.timeout(SCRIPT_TIMEOUT_SECONDS):
+            await asyncio.gather(
+                _pump(proc.stdout, captures["stdout"]),
+                _pump(proc.stderr, captures["stderr"]),
+            )
+            return await proc.wait()
+    finally:
+        # Timed out, cancelled or failed while reading: don't leave it running
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+
+async def _pump(stream: asyncio.StreamReader | None, capture: OutputCapture) -> None:
+    """Feed a process pipe into a capture as data arrives."""
+    if stream is None:
+        return
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while chunk := await stream.read(READ_CHUNK_SIZE):
+        capture.write(decoder.decode(chunk))
+    capture.write(decoder.decode(b"", final=True))
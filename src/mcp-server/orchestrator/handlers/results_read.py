@@ -0,0 +1,33 @@
+"""Handler for results.read — pages through results kept in the result store."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..dispatcher.result import ToolResult
+from ..dispatcher.result_store import ResultNotFoundError
+
+
+async def execute(args: dict[str, Any], dispatcher: Any = None, **kwargs: Any) -> ToolResult:
+    """Return one page of a stored result by handle."""
+    store = dispatcher.result_store if dispatcher is not None else None
+    if store is None:
+        return ToolResult.fail("HANDLER_ERROR", "Result store is not enabled")
+
+    handle = args["result_handle"]
+    try:
+        page = store.read(
+            handle,
+            path=args.get("path", ""),
+            offset=args.get("offset", 0),
+            limit=args.get("limit", 50),
+            fields=args.get("fields"),
+        )
+    except ResultNotFoundError:
+        return ToolResult.fail(
+            "RESULT_NOT_FOUND",
+            f"No stored result {handle!r}; it may have expired. Re-run the original tool.",
+        )
+    except KeyError as e:
+        return ToolResult.fail("RESULT_PATH_INVALID", str(e.args[0]))
+    return ToolResult.ok(page)
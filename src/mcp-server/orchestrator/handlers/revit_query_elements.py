@@ -0,0 +1,92 @@
+"""Handler for revit.query_elements — bulk element reads as columns.
+
+The C# command returns one page of elements per call. `RevitAddinAdapter`
+requests the pages (`PAGE_SIZE` elements each) and passes them to
+`merge_pages`, which joins them into one columnar result.
+
+A column is a list with one value per element, or, for string columns, a
+dictionary encoding ``{"dict": [...], "codes": [...]}`` where each code is
+an index into ``dict`` or None.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..dispatcher.result import ToolResult
+
+PAGE_SIZE = 1000
+
+
+async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
+    """Execute the query_elements tool.
+
+    Like other revit tools this is a pass-through; the adapter sends the
+    query to the add-in page by page and merges the pages with `merge_pages`.
+    """
+    return ToolResult.ok({"message": "Delegated to Revit add-in"})
+
+
+def merge_pages(pages: list[dict[str, Any]]) -> dict[str, Any]:
+    """Join pages returned by the add-in into one result.
+
+    String columns stay dictionary encoded, with one shared ``dict`` across
+    all pages.
+    """
+    names = list(dict.fromkeys(name for page in pages for name in page["columns"]))
+    columns = {
+        name: _merge_column([
+            page["columns"].get(name, [None] * page["count"]) for page in pages
+        ])
+        for name in names
+    }
+    merged: dict[str, Any] = {
+        "total": pages[0]["total"],
+        "count": sum(page["count"] for page in pages),
+        "columns": columns,
+    }
+    missing = [i for page in pages for i in page.get("missing_ids", [])]
+    if missing:
+        merged["missing_ids"] = missing
+    return merged
+
+
+def decode_column(column: list[Any] | dict[str, Any]) -> list[Any]:
+    """Return a column's values, expanding a dictionary encoding."""
+    if not _is_encoded(column):
+        return list(column)
+    strings = column["dict"]
+    return [None if code is None else strings[code] for code in column["codes"]]
+
+
+def _is_encoded(column: Any) -> bool:
+    return isinstance(column, dict) and "codes" in column
+
+
+def _merge_column(parts: list[Any]) -> list[Any] | dict[str, Any]:
+    encoded = [_is_encoded(part) for part in parts]
+    if any(encoded) and all(
+        is_encoded or all(value is None for value in part)
+        for part, is_encoded in zip(parts, encoded)
+    ):
+        strings: list[str] = []
+        index: dict[str, int] = {}
+        codes: list[int | None] = []
+        for part, is_encoded in zip(parts, encoded):
+            if not is_encoded:
+                codes.extend([None] * len(part))
+                continue
+            remap = []
+            for value in part["dict"]:
+                code = index.get(value)
+                if code is None:
+                    code = index[value] = len(strings)
+                    strings.append(value)
+                remap.append(code)
+            codes.extend(None if code is None else remap[code] for code in part["codes"])
+        return {"dict": strings, "codes": codes}
+
+    values: list[Any] = []
+    for part in parts:
+        values.extend(decode_column(part))
+    return values
@@ -0,0 +1,27 @@
+"""Handler for spatial.build_index — loads element geometry into the spatial index."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from ..dispatcher.result import ToolResult
+from ..spatial_index import DEFAULT_CATEGORIES, get_model_index
+
+
+async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
+    """Rebuild the spatial index from the elements in the given categories."""
+    index = get_model_index()
+    if index is None:
+        return ToolResult.fail("HANDLER_ERROR", "Spatial index is not enabled")
+    started = time.perf_counter()
+    result = await index.build(args.get("categories") or DEFAULT_CATEGORIES)
+    if not result.success:
+        return result
+    stats = index.index.stats
+    return ToolResult.ok({
+        **result.data,
+        "elements": stats["elements"],
+        "cell_size": stats["cell_size"],
+        "build_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
@@ -0,0 +1,28 @@
+"""Handler for spatial.find_intersecting — elements overlapping a box."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from ..dispatcher.result import ToolResult
+from ..spatial_index import (
+    NOT_BUILT_MESSAGE,
+    category_filter,
+    query_response,
+    synced_model_index,
+)
+
+
+async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
+    """Return indexed elements whose bounding box overlaps the given box."""
+    index = await synced_model_index()
+    if index is None:
+        return ToolResult.fail("SPATIAL_INDEX_NOT_BUILT", NOT_BUILT_MESSAGE)
+    low, high = args["min"], args["max"]
+    box = (*map(min, low, high), *map(max, low, high))
+    started = time.perf_counter()
+    found = index.index.intersecting(box, category_filter(args.get("categories")))
+    return ToolResult.ok(
+        query_response(index, [(None, e) for e in found], args.get("limit", 200), started)
+    )
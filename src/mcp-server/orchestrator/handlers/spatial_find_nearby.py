@@ -0,0 +1,26 @@
+"""Handler for spatial.find_nearby — elements within a distance of a point."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from ..dispatcher.result import ToolResult
+from ..spatial_index import (
+    NOT_BUILT_MESSAGE,
+    category_filter,
+    query_response,
+    synced_model_index,
+)
+
+
+async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
+    """Return indexed elements within `radius` of `point`, nearest first."""
+    index = await synced_model_index()
+    if index is None:
+        return ToolResult.fail("SPATIAL_INDEX_NOT_BUILT", NOT_BUILT_MESSAGE)
+    started = time.perf_counter()
+    found = index.index.nearby(
+        tuple(args["point"]), args["radius"], category_filter(args.get("categories"))
+    )
+    return ToolResult.ok(query_response(index, found, args.get("limit", 50), started))
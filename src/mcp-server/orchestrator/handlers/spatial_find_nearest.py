@@ -0,0 +1,30 @@
+"""Handler for spatial.find_nearest — the k elements nearest to a point."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from ..dispatcher.result import ToolResult
+from ..spatial_index import (
+    NOT_BUILT_MESSAGE,
+    category_filter,
+    query_response,
+    synced_model_index,
+)
+
+
+async def execute(args: dict[str, Any], **kwargs: Any) -> ToolResult:
+    """Return the `k` indexed elements nearest to `point`."""
+    index = await synced_model_index()
+    if index is None:
+        return ToolResult.fail("SPATIAL_INDEX_NOT_BUILT", NOT_BUILT_MESSAGE)
+    started = time.perf_counter()
+    k = args.get("k", 5)
+    found = index.index.nearest(
+        tuple(args["point"]),
+        k,
+        category_filter(args.get("categories")),
+        args.get("max_distance"),
+    )
+    return ToolResult.ok(query_response(index, found, k, started))
@@ -0,0 +1,148 @@
+"""Tool scheduling and bookkeeping for the `LLMRouter` agent loop.
+
+`ToolScheduler` starts each tool call as soon as the model emits it.
+Read-only tools run concurrently with each other; a tool that may modify
+the model waits for every call issued before it, and calls issued after it
+wait for it. The model's intended order of side effects is kept while
+independent reads overlap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .base import LLMResponse, LLMToolCall, Message
+from ..dispatcher.result import ToolResult
+
+if TYPE_CHECKING:
+    from ..dispatcher.dispatcher import Dispatcher
+    from ..registry.registry import ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ToolCallRecord:
+    """Timing and outcome of one tool call in an agent step."""
+
+    id: str
+    name: str
+    read_only: bool
+    success: bool = False
+    error_code: str | None = None
+    queued_ms: float = 0.0  # waiting for earlier calls it is ordered after
+    duration_ms: float = 0.0
+
+
+@dataclass
+class AgentStep:
+    """One model turn and the tool calls it made.
+
+    Times are milliseconds from the start of the step. `tools_ms` runs from
+    the first tool dispatch until the last tool finishes, so it overlaps
+    `model_ms` when tools start while the model is still streaming.
+    """
+
+    index: int
+    model_ms: float = 0.0
+    first_tool_call_ms: float | None = None
+    tools_ms: float = 0.0
+    total_ms: float = 0.0
+    usage: dict[str, int] = field(default_factory=dict)
+    tokens_compacted: int = 0  # history tokens removed before this turn
+    tool_calls: list[ToolCallRecord] = field(default_factory=list)
+
+
+@dataclass
+class AgentResult:
+    """Outcome of `LLMRouter.run`."""
+
+    messages: list[Message]  # input conversation plus every turn added
+    response: LLMResponse | None  # last model response
+    stop_reason: str  # "end_turn", "max_steps", "time_budget" or "budget"
+    steps: list[AgentStep] = field(default_factory=list)
+    total_ms: float = 0.0
+
+
+class ToolScheduler:
+    """Runs one turn's tool calls with read-only/mutating ordering."""
+
+    def __init__(self, dispatcher: Dispatcher, registry: ToolRegistry) -> None:
+        self._dispatcher = dispatcher
+        self._registry = registry
+        self._tasks: list[asyncio.Task[ToolResult]] = []
+        self._barrier: asyncio.Task[ToolResult] | None = None
+        self._calls: list[LLMToolCall] = []
+        self.records: list[ToolCallRecord] = []
+        self._started_at: float | None = None
+
+    def submit(self, tool_call: LLMToolCall) -> None:
+        """Schedule a tool call behind the calls it must follow."""
+        definition = self._registry.get(tool_call.name)
+        # Unknown tools are treated as mutating; the dispatcher rejects them
+        read_only = bool(definition and definition.get("read_only", False))
+        if read_only:
+            after = [self._barrier] if self._barrier is not None else []
+        else:
+            after = list(self._tasks)
+
+        record = ToolCallRecord(id=tool_call.id, name=tool_call.name, read_only=read_only)
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        task = asyncio.create_task(self._run(tool_call, record, after))
+        if not read_only:
+            self._barrier = task
+        self._tasks.append(task)
+        self._calls.append(tool_call)
+        self.records.append(record)
+
+    async def _run(
+        self,
+        tool_call: LLMToolCall,
+        record: ToolCallRecord,
+        after: list[asyncio.Task[ToolResult]],
+    ) -> ToolResult:
+        queued = time.perf_counter()
+        if after:
+            await asyncio.wait(after)
+        start = time.perf_counter()
+        record.queued_ms = (start - queued) * 1000
+        try:
+            result = await self._dispatcher.dispatch(
+                tool_call.name, tool_call.arguments, offload=True
+            )
+        except Exception as e:
+            logger.exception("Tool call %s failed", tool_call.name)
+            result = ToolResult.fail("HANDLER_ERROR", str(e))
+        record.duration_ms = (time.perf_counter() - start) * 1000
+        record.success = result.success
+        record.error_code = result.error_code
+        return result
+
+    async def results(self) -> list[Message]:
+        """Wait for every call and return ``tool`` messages in call order."""
+        results = await asyncio.gather(*self._tasks)
+        return [
+            Message(
+                role="tool",
+                content=json.dumps(result.to_dict(), default=str),
+                tool_call_id=call.id,
+            )
+            for call, result in zip(self._calls, results)
+        ]
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the first call was submitted."""
+        if self._started_at is None:
+            return 0.0
+        return (time.perf_counter() - self._started_at) * 1000
+
+    async def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
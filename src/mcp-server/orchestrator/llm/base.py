@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator, Callable
 
 
 @dataclass
@@ -15,18 +17,111 @@ class LLMToolCall:
     arguments: dict[str, Any]
 
 
+@dataclass
+class Usage:
+    """Token and latency accounting for one response, in the same terms for
+    every provider.
+
+    `input_tokens` includes tokens read from or written to the prompt cache.
+    (Anthropic reports those separately; OpenAI includes them in
+    ``prompt_tokens``.)
+    """
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0  # read from the prompt cache
+    cache_write_tokens: int = 0  # written to the prompt cache
+    latency_ms: float = 0.0  # request sent to response complete
+    first_token_ms: float | None = None  # streamed responses only
+    queue_wait_ms: float = 0.0  # held by the rate limiter before sending
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @classmethod
+    def from_response(cls, response: LLMResponse) -> Usage:
+        """Normalize a response's provider-specific ``usage`` and ``timings``."""
+        raw = response.usage
+        timings = response.timings
+        if "prompt_tokens" in raw:  # OpenAI
+            input_tokens = raw.get("prompt_tokens", 0)
+            output_tokens = raw.get("completion_tokens", 0)
+            cached = raw.get("cached_tokens", 0)
+            written = 0
+        else:  # Anthropic
+            cached = raw.get("cache_read_input_tokens", 0)
+            written = raw.get("cache_creation_input_tokens", 0)
+            input_tokens = raw.get("input_tokens", 0) + cached + written
+            output_tokens = raw.get("output_tokens", 0)
+        return cls(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_input_tokens=cached,
+            cache_write_tokens=written,
+            latency_ms=timings.get("total", 0.0),
+            first_token_ms=timings.get("first_token"),
+            queue_wait_ms=timings.get("queue_wait", 0.0),
+        )
+
+
 @dataclass
 class LLMResponse:
     """Response from an LLM provider."""
     content: str = ""
     tool_calls: list[LLMToolCall] = field(default_factory=list)
     finish_reason: str = "stop"
-    usage: dict[str, int] = field(default_factory=dict)
+    usage: dict[str, int] = field(default_factory=dict)  # provider's own keys
+    # Milliseconds since the request was sent: "total", "first_token" and
+    # "first_tool_call" (streamed responses only), plus "queue_wait" spent in
+    # the rate limiter before it was sent.
+    timings: dict[str, float] = field(default_factory=dict)
+    model: str = ""  # model that produced the response
 
     @property
     def has_tool_calls(self) -> bool:
         return len(self.tool_calls) > 0
 
+    @property
+    def normalized_usage(self) -> Usage:
+        return Usage.from_response(self)
+
+
+@dataclass
+class StreamEvent:
+    """One event from a streamed LLM response.
+
+    ``text`` events carry a content delta, ``tool_call`` events a complete
+    tool call (emitted as soon as its block finishes), and the final
+    ``done`` event the assembled `LLMResponse`.
+    """
+    type: str  # "text", "tool_call", "done"
+    text: str = ""
+    tool_call: LLMToolCall | None = None
+    response: LLMResponse | None = None
+    elapsed_ms: float = 0.0  # since the request was sent
+
+
+class StreamTimer:
+    """Tracks stream timings for `LLMResponse.timings`."""
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self.timings: dict[str, float] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def event(self, type: str, **kwargs: Any) -> StreamEvent:
+        """Create an event stamped with the elapsed time, recording firsts."""
+        elapsed = self.elapsed_ms()
+        if type in ("text", "tool_call"):
+            self.timings.setdefault("first_token", elapsed)
+        if type == "tool_call":
+            self.timings.setdefault("first_tool_call", elapsed)
+        if type == "done":
+            self.timings["total"] = elapsed
+        return StreamEvent(type=type, elapsed_ms=elapsed, **kwargs)
+
 
 @dataclass
 class Message:
@@ -35,6 +130,113 @@ class Message:
     content: str
     tool_call_id: str | None = None
     tool_calls: list[LLMToolCall] | None = None
+    pinned: bool = False  # never compacted (see llm/compaction.py)
+
+
+@dataclass(slots=True)
+class _ConvertedMessage:
+    message: Message  # held so its id cannot be reused while cached
+    content: str
+    tool_calls: list[LLMToolCall] | None
+    converted: dict[str, Any]
+    tokens: int | None = None  # estimated on first use
+
+
+class MessageConversionCache:
+    """Memoizes the conversion of `Message`s to provider request dicts.
+
+    The router resends the whole history every turn, and the same `Message`
+    objects make up all but the newest part of it. Entries are keyed by
+    message identity and checked against the message's content and tool
+    calls, so only new or replaced messages are converted again. A message
+    whose tool call arguments are changed in place after being sent is not
+    detected; the router and agent loop never do that. Each entry also
+    keeps the message's token estimate, so rate limiting does not
+    re-serialize the history either.
+
+    Converted dicts are shared between requests and must not be modified;
+    callers that need to change one (e.g. to add ``cache_control``) replace
+    it in the request's message list instead.
+
+    Args:
+        convert: Converts one message to its provider dict.
+        max_entries: Least recently used entries beyond this are evicted.
+        estimate: Estimates one message's tokens (default:
+            `compaction.estimate_tokens`).
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[Message], dict[str, Any]],
+        max_entries: int = 4096,
+        estimate: Callable[[Message], int] | None = None,
+    ) -> None:
+        if estimate is None:
+            from .compaction import estimate_tokens as estimate  # compaction imports this module
+        self._convert = convert
+        self._estimate = estimate
+        self._max_entries = max_entries
+        self._entries: OrderedDict[int, _ConvertedMessage] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def convert(self, messages: list[Message]) -> list[dict[str, Any]]:
+        """Return the provider dicts for `messages`, converting only new ones."""
+        converted = []
+        for message in messages:
+            entry = self._cached(message)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                entry = self._store(message, self._convert(message))
+            converted.append(entry.converted)
+        return converted
+
+    def tokens(self, messages: list[Message]) -> int:
+        """Estimated tokens of `messages`, reusing the estimate of cached ones.
+
+        Messages that were never converted are estimated but not cached.
+        """
+        total = 0
+        for message in messages:
+            entry = self._cached(message)
+            if entry is None:
+                total += self._estimate(message)
+                continue
+            if entry.tokens is None:
+                entry.tokens = self._estimate(message)
+            total += entry.tokens
+        return total
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _cached(self, message: Message) -> _ConvertedMessage | None:
+        """Return the entry for `message` if it is still current."""
+        key = id(message)
+        entry = self._entries.get(key)
+        if (
+            entry is None
+            or entry.message is not message
+            or entry.content is not message.content
+            or entry.tool_calls is not message.tool_calls
+        ):
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, message: Message, converted: dict[str, Any]) -> _ConvertedMessage:
+        entry = _ConvertedMessage(message, message.content, message.tool_calls, converted)
+        key = id(message)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return entry
 
 
 class BaseLLMProvider(ABC):
@@ -46,6 +248,11 @@ class BaseLLMProvider(ABC):
         """Provider name identifier."""
         ...
 
+    @property
+    def model(self) -> str:
+        """Model identifier sent with each request."""
+        return ""
+
     @abstractmethod
     async def chat(
         self,
@@ -65,6 +272,31 @@ class BaseLLMProvider(ABC):
         """
         ...
 
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a chat completion as text deltas and complete tool calls.
+
+        The default implementation waits for `chat()` and replays its
+        result; providers override it to stream from the API so callers can
+        start on a tool call while the model is still writing the next.
+
+        Yields:
+            `StreamEvent`s, ending with one ``done`` event.
+        """
+        timer = StreamTimer()
+        response = await self.chat(messages, tools=tools, temperature=temperature)
+        if response.content:
+            yield timer.event("text", text=response.content)
+        for tool_call in response.tool_calls:
+            yield timer.event("tool_call", tool_call=tool_call)
+        done = timer.event("done", response=response)
+        response.timings = {**response.timings, **timer.timings}
+        yield done
+
     @abstractmethod
     def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Convert internal tool definitions to provider-specific format.
@@ -3,26 +3,81 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
 import anthropic
 
-from .base import BaseLLMProvider, LLMResponse, LLMToolCall, Message
+from .base import (
+    BaseLLMProvider,
+    LLMResponse,
+    LLMToolCall,
+    Message,
+    MessageConversionCache,
+    StreamEvent,
+    StreamTimer,
+)
+from .throttle import ClientPool, PooledClient, ToolTokenCache, get_client_pool
 
 logger = logging.getLogger(__name__)
 
+CACHE_CONTROL = {"type": "ephemeral"}
+CACHED_CONVERSATION_TURNS = 2  # the API allows 4 breakpoints; tools and system use 2
+
 
 class ClaudeProvider(BaseLLMProvider):
-    """Anthropic Claude provider using the Anthropic SDK."""
+    """Anthropic Claude provider using the Anthropic SDK.
+
+    With `prompt_caching` on, the tool list, the system prompt and the most
+    recent user turns carry ``cache_control`` breakpoints, so each request
+    re-reads the prefix written by the previous one instead of paying full
+    input cost for it.
+
+    The SDK client and its rate limiter come from `pool` (the process-wide
+    `ClientPool` by default) and are shared by every provider using the
+    same API key. They are looked up on each request, so the client is
+    created in the event loop that uses it.
+    """
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514") -> None:
-        self._client = anthropic.AsyncAnthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-sonnet-4-20250514",
+        prompt_caching: bool = True,
+        pool: ClientPool | None = None,
+    ) -> None:
+        self._pool = pool
+        self._api_key = api_key
         self._model = model
+        self._prompt_caching = prompt_caching
+        self._converted = MessageConversionCache(_to_api_message)
+        self._tool_tokens = ToolTokenCache()
+
+    def _pooled(self) -> PooledClient:
+        """The shared client and limiter for this key in the running loop."""
+        return (self._pool or get_client_pool()).get(
+            "claude",
+            self._api_key,
+            lambda http_options: anthropic.AsyncAnthropic(
+                api_key=self._api_key,
+                http_client=anthropic.DefaultAsyncHttpxClient(**http_options),
+            ),
+        )
+
+    def _estimate_tokens(
+        self, messages: list[Message], tools: list[dict[str, Any]] | None
+    ) -> int:
+        """Rough input token count of a request, reserved before sending it."""
+        return self._converted.tokens(messages) + self._tool_tokens.tokens(tools)
 
     @property
     def name(self) -> str:
         return "claude"
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     async def chat(
         self,
         messages: list[Message],
@@ -30,40 +85,64 @@ class ClaudeProvider(BaseLLMProvider):
         temperature: float = 0.0,
     ) -> LLMResponse:
         """Send a chat request to Claude."""
+        kwargs = self._build_request(messages, tools, temperature)
+        reserved = self._estimate_tokens(messages, tools)
+        pooled = self._pooled()
+        queue_ms = await pooled.limiter.acquire(reserved)
+        sent = time.perf_counter()
+        response = _to_response(await pooled.client.messages.create(**kwargs))
+        pooled.limiter.settle(reserved, _total_tokens(response))
+        response.timings = {
+            "total": (time.perf_counter() - sent) * 1000,
+            "queue_wait": queue_ms,
+        }
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a chat request, yielding each tool call once its block ends."""
+        kwargs = self._build_request(messages, tools, temperature)
+        reserved = self._estimate_tokens(messages, tools)
+        pooled = self._pooled()
+        queue_ms = await pooled.limiter.acquire(reserved)
+        timer = StreamTimer()
+        async with pooled.client.messages.stream(**kwargs) as stream:
+            async for event in stream:
+                if event.type == "text":
+                    yield timer.event("text", text=event.text)
+                elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                    block = event.content_block
+                    yield timer.event(
+                        "tool_call",
+                        tool_call=LLMToolCall(id=block.id, name=block.name, arguments=block.input),
+                    )
+            message = await stream.get_final_message()
+        response = _to_response(message)
+        pooled.limiter.settle(reserved, _total_tokens(response))
+        done = timer.event("done", response=response)
+        response.timings = {**timer.timings, "queue_wait": queue_ms}
+        yield done
+
+    def _build_request(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build ``messages.create`` arguments from the conversation."""
         # Separate system message from conversation
         system_prompt = ""
-        api_messages = []
+        conversation = []
         for msg in messages:
             if msg.role == "system":
                 system_prompt = msg.content
-            elif msg.role == "tool":
-                api_messages.append({
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": msg.tool_call_id,
-                            "content": msg.content,
-                        }
-                    ],
-                })
-            elif msg.role == "assistant" and msg.tool_calls:
-                content: list[dict[str, Any]] = []
-                if msg.content:
-                    content.append({"type": "text", "text": msg.content})
-                for tc in msg.tool_calls:
-                    content.append({
-                        "type": "tool_use",
-                        "id": tc.id,
-                        "name": tc.name,
-                        "input": tc.arguments,
-                    })
-                api_messages.append({"role": "assistant", "content": content})
             else:
-                api_messages.append({
-                    "role": msg.role,
-                    "content": msg.content,
-                })
+                conversation.append(msg)
+        api_messages = self._converted.convert(conversation)
 
         kwargs: dict[str, Any] = {
             "model": self._model,
@@ -75,33 +154,9 @@ class ClaudeProvider(BaseLLMProvider):
             kwargs["system"] = system_prompt
         if tools:
             kwargs["tools"] = tools
-
-        response = await self._client.messages.create(**kwargs)
-
-        # Parse response
-        content_text = ""
-        tool_calls = []
-        for block in response.content:
-            if block.type == "text":
-                content_text += block.text
-            elif block.type == "tool_use":
-                tool_calls.append(
-                    LLMToolCall(
-                        id=block.id,
-                        name=block.name,
-                        arguments=block.input,
-                    )
-                )
-
-        return LLMResponse(
-            content=content_text,
-            tool_calls=tool_calls,
-            finish_reason=response.stop_reason or "stop",
-            usage={
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-            },
-        )
+        if self._prompt_caching:
+            _add_cache_breakpoints(kwargs)
+        return kwargs
 
     def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Convert to Anthropic tool format."""
@@ -114,3 +169,108 @@ class ClaudeProvider(BaseLLMProvider):
             }
             tools.append(tool)
         return tools
+
+
+def _to_api_message(msg: Message) -> dict[str, Any]:
+    """Convert a non-system message to an Anthropic message dict."""
+    if msg.role == "tool":
+        return {
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": msg.tool_call_id,
+                    "content": msg.content,
+                }
+            ],
+        }
+    if msg.role == "assistant" and msg.tool_calls:
+        content: list[dict[str, Any]] = []
+        if msg.content:
+            content.append({"type": "text", "text": msg.content})
+        for tc in msg.tool_calls:
+            content.append({
+                "type": "tool_use",
+                "id": tc.id,
+                "name": tc.name,
+                "input": tc.arguments,
+            })
+        return {"role": "assistant", "content": content}
+    return {
+        "role": msg.role,
+        "content": msg.content,
+    }
+
+
+def _to_response(response: Any) -> LLMResponse:
+    """Convert an Anthropic message into an `LLMResponse`."""
+    content_text = ""
+    tool_calls = []
+    for block in response.content:
+        if block.type == "text":
+            content_text += block.text
+        elif block.type == "tool_use":
+            tool_calls.append(
+                LLMToolCall(
+                    id=block.id,
+                    name=block.name,
+                    arguments=block.input,
+                )
+            )
+
+    return LLMResponse(
+        content=content_text,
+        tool_calls=tool_calls,
+        finish_reason=response.stop_reason or "stop",
+        model=response.model or "",
+        usage={
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "cache_read_input_tokens": response.usage.cache_read_input_tokens or 0,
+            "cache_creation_input_tokens": (
+                response.usage.cache_creation_input_tokens or 0
+            ),
+        },
+    )
+
+
+def _total_tokens(response: LLMResponse) -> int:
+    return response.usage.get("input_tokens", 0) + response.usage.get("output_tokens", 0)
+
+
+def _add_cache_breakpoints(kwargs: dict[str, Any]) -> None:
+    """Mark the tools, system prompt and latest user turns as cacheable.
+
+    The cached prefix is ordered tools, system, messages. The tool and
+    system breakpoints stay put from turn to turn; the conversation
+    breakpoints slide forward with the last `CACHED_CONVERSATION_TURNS`
+    user messages (tool results included), so each request reads what the
+    previous one wrote. Inputs are copied rather than modified because the
+    router reuses its formatted tool list across turns.
+    """
+    tools = kwargs.get("tools")
+    if tools:
+        kwargs["tools"] = [*tools[:-1], {**tools[-1], "cache_control": CACHE_CONTROL}]
+
+    system = kwargs.get("system")
+    if system:
+        kwargs["system"] = [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+
+    messages = kwargs["messages"]
+    marked = 0
+    for i in range(len(messages) - 1, -1, -1):
+        if marked == CACHED_CONVERSATION_TURNS:
+            break
+        message = messages[i]
+        if message["role"] != "user":
+            continue
+        content = message["content"]
+        if isinstance(content, str):
+            if not content:
+                continue
+            content = [{"type": "text", "text": content}]
+        messages[i] = {
+            **message,
+            "content": [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}],
+        }
+        marked += 1
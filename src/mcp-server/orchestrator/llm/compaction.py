@@ -0,0 +1,197 @@
+"""Token-budgeted compaction of conversation history.
+
+Tool results (element info, script output) are sent back to the model in
+full, so long sessions grow without bound. `ConversationCompactor` keeps a
+conversation under a token budget in three increasingly lossy passes over
+the older part of the history:
+
+1. Truncate oversized tool results to a head and tail.
+2. Replace old tool results, oldest first, with a one-line stub.
+3. Drop the oldest whole turns.
+
+The most recent turns and messages marked ``pinned`` are never changed.
+A turn is a user message or one assistant step (a model reply and the tool
+results that follow it), so a long agent run on a single prompt is
+compacted too. Tool messages are stubbed rather than removed so every tool
+call keeps its result, which both providers require, and only whole user
+turns are dropped so the history still starts with a user message.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, replace
+
+from .base import Message
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(message: Message) -> int:
+    """Rough token count of a message (characters / 4 plus overhead)."""
+    chars = len(message.content)
+    for tool_call in message.tool_calls or []:
+        chars += len(tool_call.name) + len(json.dumps(tool_call.arguments, default=str))
+    return MESSAGE_OVERHEAD_TOKENS + chars // CHARS_PER_TOKEN
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    """What one compaction did."""
+
+    tokens_before: int
+    tokens_after: int
+    truncated: int = 0  # tool results cut to head and tail
+    stubbed: int = 0  # tool results replaced with a stub
+    dropped: int = 0  # messages removed with their turn
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class ConversationCompactor:
+    """Keeps conversation history under a token budget.
+
+    Args:
+        budget_tokens: Compaction starts when history exceeds this.
+        target_ratio: Compact down to this fraction of the budget, so the
+            history is not rewritten on every turn (which would also defeat
+            prompt caching).
+        keep_recent_turns: Number of most recent turns (user messages or
+            assistant steps) left intact.
+        max_tool_result_tokens: Older tool results above this are truncated.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = 50_000,
+        target_ratio: float = 0.75,
+        keep_recent_turns: int = 2,
+        max_tool_result_tokens: int = 1_000,
+    ) -> None:
+        self._budget = budget_tokens
+        self._target = int(budget_tokens * target_ratio)
+        self._keep_recent_turns = keep_recent_turns
+        self._max_tool_result_tokens = max_tool_result_tokens
+
+    def compact(self, messages: list[Message]) -> tuple[list[Message], CompactionReport]:
+        """Return a compacted copy of `messages` and a report.
+
+        The input list and its messages are not modified.
+        """
+        sizes = [estimate_tokens(m) for m in messages]
+        before = sum(sizes)
+        if before <= self._budget:
+            return list(messages), CompactionReport(before, before)
+
+        original = messages
+        original_sizes = list(sizes)
+        messages = list(messages)
+        total = before
+        protected_from = self._recent_start(messages)
+        truncated = stubbed = 0
+
+        # 1. Truncate oversized old tool results
+        for i in range(protected_from):
+            message = messages[i]
+            if (
+                message.role == "tool"
+                and not message.pinned
+                and sizes[i] > self._max_tool_result_tokens
+            ):
+                content = _truncate(
+                    message.content, self._max_tool_result_tokens * CHARS_PER_TOKEN
+                )
+                messages[i] = replace(message, content=content)
+                total += estimate_tokens(messages[i]) - sizes[i]
+                sizes[i] = estimate_tokens(messages[i])
+                truncated += 1
+
+        # 2. Stub old tool results, oldest first
+        for i in range(protected_from):
+            if total <= self._target:
+                break
+            message = messages[i]
+            if message.role == "tool" and not message.pinned:
+                stub = _stub(original[i].content, original_sizes[i])
+                messages[i] = replace(message, content=stub)
+                total += estimate_tokens(messages[i]) - sizes[i]
+                sizes[i] = estimate_tokens(messages[i])
+                stubbed += 1
+
+        # 3. Drop the oldest whole user turns that hold no pinned message
+        dropped = 0
+        turns = _turn_starts(messages, protected_from)
+        ends = turns[1:]
+        if protected_from == len(messages) or messages[protected_from].role == "user":
+            ends.append(protected_from)
+        keep = [True] * len(messages)
+        for start, end in zip(turns, ends):
+            if total <= self._target:
+                break
+            if any(m.pinned for m in messages[start:end]):
+                continue
+            for i in range(start, end):
+                keep[i] = False
+                total -= sizes[i]
+                dropped += 1
+        if dropped:
+            messages = [m for m, k in zip(messages, keep) if k]
+
+        report = CompactionReport(before, total, truncated, stubbed, dropped)
+        logger.debug(
+            "Compacted conversation from %d to %d tokens "
+            "(%d truncated, %d stubbed, %d dropped)",
+            before, total, truncated, stubbed, dropped,
+        )
+        return messages, report
+
+    def _recent_start(self, messages: list[Message]) -> int:
+        """Index of the first message in the protected recent turns."""
+        seen = 0
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i].role in ("user", "assistant"):
+                seen += 1
+                if seen == self._keep_recent_turns:
+                    return i
+        return 0
+
+
+def _turn_starts(messages: list[Message], end: int) -> list[int]:
+    """Start indices of turns before `end`; a turn begins at a user message.
+
+    Leading non-user messages (e.g. an orphaned assistant turn) form a turn
+    of their own.
+    """
+    starts = [i for i in range(end) if messages[i].role == "user"]
+    if end and (not starts or starts[0] != 0):
+        starts.insert(0, 0)
+    return starts
+
+
+def _truncate(content: str, max_chars: int) -> str:
+    if len(content) <= max_chars:
+        return content
+    half = max_chars // 2
+    omitted = len(content) - 2 * half
+    return f"{content[:half]}\n[... {omitted} characters omitted ...]\n{content[-half:]}"
+
+
+def _stub(content: str, tokens: int) -> str:
+    """One-line replacement for a tool result, keeping success/error."""
+    status = ""
+    try:
+        result = json.loads(content)
+    except ValueError:
+        result = None
+    if isinstance(result, dict) and "success" in result:
+        status = " success" if result["success"] else " failed"
+        error = result.get("error")
+        if isinstance(error, dict) and error.get("code"):
+            status += f" ({error['code']})"
+    return f"[earlier tool result omitted:{status}, ~{tokens} tokens]"
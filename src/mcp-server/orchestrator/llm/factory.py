@@ -0,0 +1,52 @@
+"""Build the configured LLM provider."""
+
+from __future__ import annotations
+
+import logging
+
+from .base import BaseLLMProvider
+from .hedging import HedgedProvider
+from .replay import wrap_provider
+from .throttle import ClientPool, set_client_pool
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def create_single_provider(name: str, config: Config) -> BaseLLMProvider:
+    """Create one provider by name (``claude``, ``openai`` or ``stand-in``)."""
+    if name == "claude":
+        from .claude_provider import ClaudeProvider
+
+        return ClaudeProvider(api_key=config.anthropic_api_key, model=config.anthropic_model)
+    if name == "openai":
+        from .openai_provider import OpenAIProvider
+
+        return OpenAIProvider(api_key=config.openai_api_key, model=config.openai_model)
+    if name == "stand-in":
+        from .stand_in import StandInProvider
+
+        return StandInProvider()
+    raise ValueError(f"Unknown LLM provider {name!r}")
+
+
+def create_provider(config: Config) -> BaseLLMProvider:
+    """Create the provider described by `config`.
+
+    Installs a process-wide `ClientPool` with the configured connection and
+    rate limits first. With a fallback provider configured, the two are
+    combined in a `HedgedProvider`. The record/replay cache, if enabled,
+    wraps the result.
+    """
+    set_client_pool(ClientPool.from_config(config))
+    provider = create_single_provider(config.llm_provider, config)
+    if config.llm_fallback_provider:
+        provider = HedgedProvider(
+            provider,
+            create_single_provider(config.llm_fallback_provider, config),
+            hedge_after_seconds=config.llm_hedge_after_seconds,
+            failure_threshold=config.llm_failover_threshold,
+            cooldown_seconds=config.llm_failover_cooldown_seconds,
+        )
+    logger.info("LLM provider %s", provider.name)
+    return wrap_provider(provider, config)
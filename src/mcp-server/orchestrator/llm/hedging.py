@@ -0,0 +1,262 @@
+"""Hedged requests and failover across two LLM providers.
+
+`HedgedProvider` sends each request to its primary provider. If no answer
+has arrived after `hedge_after_seconds`, the same request goes to the
+secondary as well. The first successful answer is used and the other
+request is cancelled. A request that fails on one provider is retried on
+the other. After `failure_threshold` consecutive primary errors the
+providers swap roles for `cooldown_seconds`, so sessions stop waiting on a
+provider that is down. The primary is then tried first again.
+
+The composite receives tools in registry format and formats them for each
+provider, since Claude and OpenAI use different tool schemas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator
+
+from .base import BaseLLMProvider, LLMResponse, Message, StreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+class HedgedProvider(BaseLLMProvider):
+    """Composite provider with latency hedging and error failover.
+
+    Hedging trades cost for tail latency: a hedged request may be billed
+    by both providers until one is cancelled.
+
+    Args:
+        primary: Provider tried first.
+        secondary: Hedge and failover target.
+        hedge_after_seconds: Start the secondary if the primary has not
+            answered (or, when streaming, sent its first event) after this
+            long. 0 disables hedging; failover still applies.
+        failure_threshold: Consecutive primary errors that make the
+            secondary go first.
+        cooldown_seconds: How long the secondary goes first.
+    """
+
+    def __init__(
+        self,
+        primary: BaseLLMProvider,
+        secondary: BaseLLMProvider,
+        hedge_after_seconds: float = 10.0,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 60.0,
+    ) -> None:
+        self._primary = primary
+        self._secondary = secondary
+        self._hedge_after = hedge_after_seconds
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown_seconds
+        self._primary_failures = 0
+        self._failed_over_until = 0.0
+        self._formatted: dict[int, tuple[list[dict[str, Any]], dict[str, list[dict[str, Any]]]]] = {}
+        self._counts = {
+            "requests": 0,
+            "hedged": 0,  # secondary started because the primary was slow
+            "retried": 0,  # secondary started because the first provider failed
+            "secondary_wins": 0,
+            "failovers": 0,  # times the secondary was promoted
+        }
+
+    @property
+    def name(self) -> str:
+        return f"{self._primary.name}+{self._secondary.name}"
+
+    @property
+    def model(self) -> str:
+        return self._primary.model
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return hedging counters and failover state."""
+        return {
+            **self._counts,
+            "primary_failures": self._primary_failures,
+            "failed_over": self._failed_over(),
+        }
+
+    def _failed_over(self) -> bool:
+        return time.monotonic() < self._failed_over_until
+
+    def _order(self) -> tuple[BaseLLMProvider, BaseLLMProvider]:
+        if self._failed_over():
+            return self._secondary, self._primary
+        return self._primary, self._secondary
+
+    def _succeeded(self, provider: BaseLLMProvider) -> None:
+        if provider is self._primary:
+            self._primary_failures = 0
+        else:
+            self._counts["secondary_wins"] += 1
+
+    def _failed(self, provider: BaseLLMProvider, error: BaseException) -> None:
+        logger.warning("LLM provider %s failed: %s", provider.name, error)
+        if provider is not self._primary:
+            return
+        self._primary_failures += 1
+        if self._primary_failures >= self._failure_threshold and not self._failed_over():
+            self._failed_over_until = time.monotonic() + self._cooldown
+            self._counts["failovers"] += 1
+            logger.warning(
+                "Failing over from %s to %s for %.0f s after %d errors",
+                self._primary.name, self._secondary.name,
+                self._cooldown, self._primary_failures,
+            )
+
+    def _tools_for(
+        self, provider: BaseLLMProvider, tools: list[dict[str, Any]] | None
+    ) -> list[dict[str, Any]] | None:
+        """Format registry-format tools for `provider`, memoized per list."""
+        if not tools:
+            return None
+        entry = self._formatted.get(id(tools))
+        if entry is None or entry[0] is not tools:
+            # Only the router's current tool list is worth keeping
+            self._formatted.clear()
+            entry = (tools, {})
+            self._formatted[id(tools)] = entry
+        by_provider = entry[1]
+        if provider.name not in by_provider:
+            by_provider[provider.name] = provider.format_tools(tools)
+        return by_provider[provider.name]
+
+    async def chat(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> LLMResponse:
+        self._counts["requests"] += 1
+        first, second = self._order()
+        tasks: dict[asyncio.Task[LLMResponse], BaseLLMProvider] = {}
+
+        def start(provider: BaseLLMProvider) -> None:
+            task = asyncio.create_task(
+                provider.chat(
+                    messages, tools=self._tools_for(provider, tools), temperature=temperature
+                )
+            )
+            tasks[task] = provider
+
+        start(first)
+        started_second = False
+        error: BaseException | None = None
+        try:
+            while tasks:
+                timeout = self._hedge_after if self._hedge_after and not started_second else None
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.debug("Hedging LLM request to %s", second.name)
+                    self._counts["hedged"] += 1
+                    start(second)
+                    started_second = True
+                    continue
+                for task in done:
+                    provider = tasks.pop(task)
+                    if task.exception() is None:
+                        self._succeeded(provider)
+                        return task.result()
+                    error = task.exception()
+                    self._failed(provider, error)
+                if not started_second:
+                    self._counts["retried"] += 1
+                    start(second)
+                    started_second = True
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream from whichever provider sends its first event first.
+
+        Hedging and retries only happen before the first event; once events
+        from a provider have been yielded, an error from it is raised.
+        """
+        self._counts["requests"] += 1
+        first, second = self._order()
+        events: asyncio.Queue[tuple[BaseLLMProvider, str, Any]] = asyncio.Queue()
+        tasks: dict[BaseLLMProvider, asyncio.Task[None]] = {}
+        started: list[BaseLLMProvider] = []
+
+        async def pump(provider: BaseLLMProvider) -> None:
+            try:
+                async for event in provider.stream(
+                    messages, tools=self._tools_for(provider, tools), temperature=temperature
+                ):
+                    await events.put((provider, "event", event))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await events.put((provider, "error", e))
+            else:
+                await events.put((provider, "end", None))
+
+        def start(provider: BaseLLMProvider) -> None:
+            tasks[provider] = asyncio.create_task(pump(provider))
+            started.append(provider)
+
+        start(first)
+        winner: BaseLLMProvider | None = None
+        hedge_at = time.monotonic() + self._hedge_after
+        try:
+            while True:
+                timeout = None
+                if self._hedge_after and second not in started:
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                try:
+                    provider, kind, value = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    logger.debug("Hedging LLM stream to %s", second.name)
+                    self._counts["hedged"] += 1
+                    start(second)
+                    continue
+
+                if winner is not None and provider is not winner:
+                    continue  # left over from the cancelled stream
+                if kind == "error":
+                    self._failed(provider, value)
+                    if winner is not None:
+                        raise value
+                    tasks.pop(provider)
+                    if second not in started:
+                        self._counts["retried"] += 1
+                        start(second)
+                    if not tasks:
+                        raise value
+                    continue
+
+                if winner is None:
+                    winner = provider
+                    for other, task in tasks.items():
+                        if other is not winner:
+                            task.cancel()
+                if kind == "end":
+                    self._succeeded(winner)
+                    return
+                yield value
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Keep registry format; each provider formats its own copy."""
+        return [
+            {"name": d["name"], "description": d["description"], "parameters": d["parameters"]}
+            for d in tool_definitions
+        ]
@@ -0,0 +1,223 @@
+"""Usage ledger: token, latency and tool accounting per session and model.
+
+`LLMRouter` records every model response in its `UsageLedger`, using
+`LLMResponse.normalized_usage` so Claude and OpenAI usage add up in the
+same terms. The agent loop also records each tool call, with the estimated
+tokens its result adds to the conversation. A `UsageBudget` caps what one
+session may spend. Once a session reaches it, the next model call raises
+`BudgetExceededError` and `LLMRouter.run` stops with
+``stop_reason="budget"``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .base import Usage
+
+if TYPE_CHECKING:
+    from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = "default"
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised before a model call when the session's budget is used up."""
+
+
+@dataclass(frozen=True)
+class UsageBudget:
+    """Per-session limits; None means unlimited."""
+
+    max_requests: int | None = None
+    max_total_tokens: int | None = None
+    max_output_tokens: int | None = None
+
+    @classmethod
+    def from_config(cls, config: Config) -> UsageBudget | None:
+        """Return the configured budget, or None if no limit is set."""
+        if not (config.llm_session_max_requests or config.llm_session_max_tokens):
+            return None
+        return cls(
+            max_requests=config.llm_session_max_requests or None,
+            max_total_tokens=config.llm_session_max_tokens or None,
+        )
+
+    def exceeded(self, totals: UsageTotals) -> str | None:
+        """Return which limit `totals` has reached, or None."""
+        if self.max_requests is not None and totals.requests >= self.max_requests:
+            return f"{totals.requests} requests (limit {self.max_requests})"
+        if self.max_total_tokens is not None and totals.total_tokens >= self.max_total_tokens:
+            return f"{totals.total_tokens} tokens (limit {self.max_total_tokens})"
+        if (
+            self.max_output_tokens is not None
+            and totals.output_tokens >= self.max_output_tokens
+        ):
+            return f"{totals.output_tokens} output tokens (limit {self.max_output_tokens})"
+        return None
+
+
+@dataclass
+class UsageTotals:
+    """Summed `Usage` of a set of responses."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    latency_ms: float = 0.0
+    first_token_ms: float = 0.0
+    streamed: int = 0  # responses with a first-token time
+    queue_wait_ms: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, usage: Usage) -> None:
+        self.requests += 1
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.cached_input_tokens += usage.cached_input_tokens
+        self.cache_write_tokens += usage.cache_write_tokens
+        self.latency_ms += usage.latency_ms
+        self.queue_wait_ms += usage.queue_wait_ms
+        if usage.first_token_ms is not None:
+            self.first_token_ms += usage.first_token_ms
+            self.streamed += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        latency = self.latency_ms / 1000
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cache_hit_ratio": (
+                round(self.cached_input_tokens / self.input_tokens, 4)
+                if self.input_tokens else 0.0
+            ),
+            "avg_latency_ms": round(self.latency_ms / self.requests, 2) if self.requests else 0.0,
+            "avg_first_token_ms": (
+                round(self.first_token_ms / self.streamed, 2) if self.streamed else None
+            ),
+            "avg_queue_wait_ms": (
+                round(self.queue_wait_ms / self.requests, 2) if self.requests else 0.0
+            ),
+            "output_tokens_per_second": (
+                round(self.output_tokens / latency, 2) if latency else 0.0
+            ),
+        }
+
+
+@dataclass
+class ToolTotals:
+    """Calls to one tool and what their results cost in context."""
+
+    calls: int = 0
+    errors: int = 0
+    duration_ms: float = 0.0
+    result_tokens: int = 0  # estimated tokens added to the conversation
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "avg_duration_ms": round(self.duration_ms / self.calls, 2) if self.calls else 0.0,
+        }
+
+
+@dataclass
+class SessionUsage:
+    totals: UsageTotals = field(default_factory=UsageTotals)
+    by_model: dict[str, UsageTotals] = field(default_factory=dict)
+    by_tool: dict[str, ToolTotals] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **self.totals.as_dict(),
+            "by_model": {model: t.as_dict() for model, t in self.by_model.items()},
+            "by_tool": {name: t.as_dict() for name, t in self.by_tool.items()},
+        }
+
+
+class UsageLedger:
+    """Aggregates usage per session, per model and per tool.
+
+    Safe to share between sessions; updates take a lock.
+
+    Args:
+        budget: Limits applied to each session; None for no limits.
+    """
+
+    def __init__(self, budget: UsageBudget | None = None) -> None:
+        self._budget = budget
+        self._sessions: dict[str, SessionUsage] = {}
+        self._by_model: dict[str, UsageTotals] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, session_id: str) -> SessionUsage:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = SessionUsage()
+        return session
+
+    def record(self, session_id: str, model: str, usage: Usage) -> None:
+        """Add one model response's usage."""
+        with self._lock:
+            session = self._session(session_id)
+            session.totals.add(usage)
+            session.by_model.setdefault(model, UsageTotals()).add(usage)
+            self._by_model.setdefault(model, UsageTotals()).add(usage)
+
+    def record_tool(
+        self,
+        session_id: str,
+        name: str,
+        duration_ms: float,
+        success: bool,
+        result_tokens: int,
+    ) -> None:
+        """Add one tool call made on the model's behalf."""
+        with self._lock:
+            totals = self._session(session_id).by_tool.setdefault(name, ToolTotals())
+            totals.calls += 1
+            totals.errors += 0 if success else 1
+            totals.duration_ms += duration_ms
+            totals.result_tokens += result_tokens
+
+    def check(self, session_id: str) -> None:
+        """Raise `BudgetExceededError` if the session has reached its budget."""
+        if self._budget is None:
+            return
+        with self._lock:
+            session = self._sessions.get(session_id)
+            reason = self._budget.exceeded(session.totals) if session is not None else None
+        if reason is not None:
+            logger.warning("Session %s exceeded its LLM budget: %s", session_id, reason)
+            raise BudgetExceededError(f"Session {session_id} has used {reason}")
+
+    def session(self, session_id: str) -> dict[str, Any]:
+        """Return a session's totals, with breakdowns by model and tool."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session.as_dict() if session is not None else SessionUsage().as_dict()
+
+    def summary(self) -> dict[str, Any]:
+        """Return totals per model and per session."""
+        with self._lock:
+            return {
+                "by_model": {model: t.as_dict() for model, t in self._by_model.items()},
+                "sessions": {sid: s.totals.as_dict() for sid, s in self._sessions.items()},
+            }
+
+    def reset(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
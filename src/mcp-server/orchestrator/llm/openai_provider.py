@@ -4,26 +4,68 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
 import openai
 
-from .base import BaseLLMProvider, LLMResponse, LLMToolCall, Message
+from .base import (
+    BaseLLMProvider,
+    LLMResponse,
+    LLMToolCall,
+    Message,
+    MessageConversionCache,
+    StreamEvent,
+    StreamTimer,
+)
+from .throttle import ClientPool, PooledClient, ToolTokenCache, get_client_pool
 
 logger = logging.getLogger(__name__)
 
 
 class OpenAIProvider(BaseLLMProvider):
-    """OpenAI provider using the OpenAI SDK."""
+    """OpenAI provider using the OpenAI SDK.
 
-    def __init__(self, api_key: str, model: str = "gpt-4o") -> None:
-        self._client = openai.AsyncOpenAI(api_key=api_key)
+    The SDK client and its rate limiter come from `pool` (the process-wide
+    `ClientPool` by default) and are shared by every provider using the
+    same API key. They are looked up on each request, so the client is
+    created in the event loop that uses it.
+    """
+
+    def __init__(
+        self, api_key: str, model: str = "gpt-4o", pool: ClientPool | None = None
+    ) -> None:
+        self._pool = pool
+        self._api_key = api_key
         self._model = model
+        self._converted = MessageConversionCache(_to_api_message)
+        self._tool_tokens = ToolTokenCache()
+
+    def _pooled(self) -> PooledClient:
+        """The shared client and limiter for this key in the running loop."""
+        return (self._pool or get_client_pool()).get(
+            "openai",
+            self._api_key,
+            lambda http_options: openai.AsyncOpenAI(
+                api_key=self._api_key,
+                http_client=openai.DefaultAsyncHttpxClient(**http_options),
+            ),
+        )
+
+    def _estimate_tokens(
+        self, messages: list[Message], tools: list[dict[str, Any]] | None
+    ) -> int:
+        """Rough input token count of a request, reserved before sending it."""
+        return self._converted.tokens(messages) + self._tool_tokens.tokens(tools)
 
     @property
     def name(self) -> str:
         return "openai"
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     async def chat(
         self,
         messages: list[Message],
@@ -31,46 +73,13 @@ class OpenAIProvider(BaseLLMProvider):
         temperature: float = 0.0,
     ) -> LLMResponse:
         """Send a chat request to OpenAI."""
-        api_messages = []
-        for msg in messages:
-            if msg.role == "tool":
-                api_messages.append({
-                    "role": "tool",
-                    "tool_call_id": msg.tool_call_id,
-                    "content": msg.content,
-                })
-            elif msg.role == "assistant" and msg.tool_calls:
-                api_msg: dict[str, Any] = {
-                    "role": "assistant",
-                    "content": msg.content or None,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
-                            },
-                        }
-                        for tc in msg.tool_calls
-                    ],
-                }
-                api_messages.append(api_msg)
-            else:
-                api_messages.append({
-                    "role": msg.role,
-                    "content": msg.content,
-                })
-
-        kwargs: dict[str, Any] = {
-            "model": self._model,
-            "messages": api_messages,
-            "temperature": temperature,
-        }
-        if tools:
-            kwargs["tools"] = tools
-
-        response = await self._client.chat.completions.create(**kwargs)
+        kwargs = self._build_request(messages, tools, temperature)
+        reserved = self._estimate_tokens(messages, tools)
+        pooled = self._pooled()
+        queue_ms = await pooled.limiter.acquire(reserved)
+        sent = time.perf_counter()
+        response = await pooled.client.chat.completions.create(**kwargs)
+        elapsed_ms = (time.perf_counter() - sent) * 1000
 
         choice = response.choices[0]
         tool_calls = []
@@ -84,16 +93,119 @@ class OpenAIProvider(BaseLLMProvider):
                     )
                 )
 
+        usage = _usage(response.usage)
+        pooled.limiter.settle(reserved, _total_tokens(usage))
         return LLMResponse(
             content=choice.message.content or "",
             tool_calls=tool_calls,
             finish_reason=choice.finish_reason or "stop",
-            usage={
-                "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-                "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-            },
+            usage=usage,
+            timings={"total": elapsed_ms, "queue_wait": queue_ms},
+            model=response.model or "",
         )
 
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a chat request, yielding each tool call once it is complete.
+
+        Tool call arguments arrive as fragments indexed by position; a call
+        is complete when a later call starts or the choice finishes.
+        """
+        kwargs = self._build_request(messages, tools, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        reserved = self._estimate_tokens(messages, tools)
+        pooled = self._pooled()
+        queue_ms = await pooled.limiter.acquire(reserved)
+        timer = StreamTimer()
+
+        content = ""
+        finish_reason = "stop"
+        model = ""
+        usage: Any = None
+        partial: dict[int, dict[str, str]] = {}  # index -> id, name, arguments
+        tool_calls: list[LLMToolCall] = []
+
+        def complete(up_to: int | None = None) -> list[LLMToolCall]:
+            done = []
+            for index in sorted(partial):
+                if up_to is not None and index >= up_to:
+                    break
+                call = partial.pop(index)
+                done.append(
+                    LLMToolCall(
+                        id=call["id"],
+                        name=call["name"],
+                        arguments=json.loads(call["arguments"] or "{}"),
+                    )
+                )
+            return done
+
+        stream = await pooled.client.chat.completions.create(**kwargs)
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            model = chunk.model or model
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                content += delta.content
+                yield timer.event("text", text=delta.content)
+            for tc in delta.tool_calls or []:
+                for call in complete(up_to=tc.index):
+                    tool_calls.append(call)
+                    yield timer.event("tool_call", tool_call=call)
+                call = partial.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    call["name"] += tc.function.name or ""
+                    call["arguments"] += tc.function.arguments or ""
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+                for call in complete():
+                    tool_calls.append(call)
+                    yield timer.event("tool_call", tool_call=call)
+
+        for call in complete():
+            tool_calls.append(call)
+            yield timer.event("tool_call", tool_call=call)
+        response = LLMResponse(
+            content=content,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=_usage(usage),
+            model=model,
+        )
+        pooled.limiter.settle(reserved, _total_tokens(response.usage))
+        done = timer.event("done", response=response)
+        response.timings = {**timer.timings, "queue_wait": queue_ms}
+        yield done
+
+    def _build_request(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build ``chat.completions.create`` arguments from the conversation."""
+        api_messages = self._converted.convert(messages)
+
+        kwargs: dict[str, Any] = {
+            "model": self._model,
+            "messages": api_messages,
+            "temperature": temperature,
+        }
+        if tools:
+            kwargs["tools"] = tools
+        return kwargs
+
     def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Convert to OpenAI function calling format."""
         tools = []
@@ -108,3 +220,46 @@ class OpenAIProvider(BaseLLMProvider):
             }
             tools.append(tool)
         return tools
+
+
+def _to_api_message(msg: Message) -> dict[str, Any]:
+    """Convert a message to an OpenAI chat message dict."""
+    if msg.role == "tool":
+        return {
+            "role": "tool",
+            "tool_call_id": msg.tool_call_id,
+            "content": msg.content,
+        }
+    if msg.role == "assistant" and msg.tool_calls:
+        return {
+            "role": "assistant",
+            "content": msg.content or None,
+            "tool_calls": [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.name,
+                        "arguments": json.dumps(tc.arguments),
+                    },
+                }
+                for tc in msg.tool_calls
+            ],
+        }
+    return {
+        "role": msg.role,
+        "content": msg.content,
+    }
+
+
+def _usage(usage: Any) -> dict[str, int]:
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens if usage else 0,
+        "completion_tokens": usage.completion_tokens if usage else 0,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0,
+    }
+
+
+def _total_tokens(usage: dict[str, int]) -> int:
+    return usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
@@ -0,0 +1,368 @@
+"""Record/replay cache for LLM provider calls.
+
+`CachingProvider` wraps any `BaseLLMProvider` and stores each response in a
+`ResponseStore` on disk, keyed by a hash of everything that determines the
+response: provider, model, messages, tools and temperature. Regression
+runs and demos repeat the same ``temperature=0.0`` requests, so a recorded
+session can be played back without network access or cost.
+
+Modes:
+
+- ``record``: serve stored responses; call the provider on a miss and
+  store the result.
+- ``replay``: serve stored responses only; a miss raises `ReplayMissError`.
+- ``passthrough``: always call the provider and store nothing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from .base import (
+    BaseLLMProvider,
+    LLMResponse,
+    LLMToolCall,
+    Message,
+    StreamEvent,
+    StreamTimer,
+)
+
+if TYPE_CHECKING:
+    from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+MODES = ("record", "replay", "passthrough")
+EVICT_TO = 0.9  # fraction of max_bytes the store is trimmed to
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when no response was recorded for a request."""
+
+
+class ResponseStore:
+    """Content-addressed store of JSON documents with size-based eviction.
+
+    Each document is a file named by its key under a two-character fan-out
+    directory. Reads refresh the file's mtime. When the store grows past
+    `max_bytes`, the least recently used files are removed until it is back
+    under `EVICT_TO` of the limit, so eviction's directory scan does not run
+    on every write.
+
+    Args:
+        directory: Store root; created on first write.
+        max_bytes: Total size that triggers eviction.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._total_bytes: int | None = None  # computed on first write
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable response %s: %s", path, e)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        """Write a document atomically, evicting if the store is over budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, _, size in self._files())
+        try:
+            self._total_bytes -= path.stat().st_size
+        except OSError:
+            pass
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._total_bytes += len(payload)
+        if self._total_bytes > self._max_bytes:
+            self._evict()
+
+    def size_bytes(self) -> int:
+        return sum(size for _, _, size in self._files())
+
+    def clear(self) -> None:
+        for path, _, _ in self._files():
+            self._remove(path)
+        self._total_bytes = 0
+
+    def _files(self) -> list[tuple[Path, float, int]]:
+        """Return (path, mtime, size) for every stored document."""
+        files = []
+        if not self._directory.is_dir():
+            return files
+        for path in self._directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    def _evict(self) -> None:
+        files = sorted(self._files(), key=lambda f: f[1])
+        total = sum(size for _, _, size in files)
+        target = self._max_bytes * EVICT_TO
+        removed = 0
+        for path, _, size in files:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        self._total_bytes = total
+        logger.debug("Evicted %d stored responses (%d bytes remain)", removed, total)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def request_key(
+    provider: str,
+    model: str,
+    messages: list[Message],
+    tools: list[dict[str, Any]] | None,
+    temperature: float,
+) -> str:
+    """Return the content address of a chat request.
+
+    Messages are reduced to the fields sent to the API (``pinned`` is
+    ignored) and everything is serialized with sorted keys, so equal
+    requests hash equally regardless of dict ordering. Tool results are
+    normalized first (see `_normalize_tool_content`), so a replayed agent
+    run whose tools return the same data finds the recorded responses.
+    """
+    handles: dict[str, str] = {}
+    request = {
+        "version": STORE_FORMAT_VERSION,
+        "provider": provider,
+        "model": model,
+        "temperature": temperature,
+        "messages": [
+            {
+                "role": m.role,
+                "content": (
+                    _normalize_tool_content(m.content, handles)
+                    if m.role == "tool"
+                    else m.content
+                ),
+                "tool_call_id": m.tool_call_id,
+                "tool_calls": [
+                    {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+                    for tc in m.tool_calls or []
+                ],
+            }
+            for m in messages
+        ],
+        "tools": tools or [],
+    }
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _normalize_tool_content(content: str, handles: dict[str, str]) -> str:
+    """Drop run-specific fields from a serialized `ToolResult`.
+
+    ``duration_ms`` is removed and each distinct ``result_handle`` is
+    replaced by its order of appearance in the request (`handles` maps them
+    across messages). Content that is not a JSON object is left as is.
+    """
+    try:
+        result = json.loads(content)
+    except ValueError:
+        return content
+    if not isinstance(result, dict):
+        return content
+    result.pop("duration_ms", None)
+
+    def strip(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                k: (
+                    handles.setdefault(v, f"handle-{len(handles) + 1}")
+                    if k == "result_handle" and isinstance(v, str)
+                    else strip(v)
+                )
+                for k, v in value.items()
+            }
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    return json.dumps(strip(result), sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _dump_response(response: LLMResponse) -> dict[str, Any]:
+    return {
+        "content": response.content,
+        "tool_calls": [
+            {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+            for tc in response.tool_calls
+        ],
+        "finish_reason": response.finish_reason,
+        "usage": response.usage,
+        "model": response.model,
+    }
+
+
+def _load_response(data: dict[str, Any]) -> LLMResponse:
+    return LLMResponse(
+        content=data["content"],
+        tool_calls=[LLMToolCall(**tc) for tc in data["tool_calls"]],
+        finish_reason=data["finish_reason"],
+        usage=dict(data["usage"]),
+        model=data.get("model", ""),
+    )
+
+
+class CachingProvider(BaseLLMProvider):
+    """Wraps a provider with a record/replay response cache.
+
+    Reports the wrapped provider's name and tool format, so the router and
+    the request key treat it as that provider.
+
+    Args:
+        provider: The provider that makes real API calls.
+        store: Where responses are recorded.
+        mode: ``record``, ``replay`` or ``passthrough``.
+    """
+
+    def __init__(
+        self, provider: BaseLLMProvider, store: ResponseStore, mode: str = "record"
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode {mode!r}; expected one of {MODES}")
+        self._provider = provider
+        self._store = store
+        self._mode = mode
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return self._provider.name
+
+    @property
+    def model(self) -> str:
+        return self._provider.model
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def _key(
+        self, messages: list[Message], tools: list[dict[str, Any]] | None, temperature: float
+    ) -> str:
+        return request_key(self.name, self.model, messages, tools, temperature)
+
+    def _lookup(self, key: str) -> LLMResponse | None:
+        if self._mode == "passthrough":
+            return None
+        data = self._store.get(key)
+        if data is not None:
+            try:
+                response = _load_response(data)
+            except (KeyError, TypeError) as e:
+                logger.warning("Ignoring malformed recorded response %s: %s", key, e)
+            else:
+                self.hits += 1
+                return response
+        self.misses += 1
+        if self._mode == "replay":
+            raise ReplayMissError(f"No recorded response for request {key}")
+        return None
+
+    def _record(self, key: str, response: LLMResponse) -> None:
+        if self._mode == "record":
+            self._store.put(key, _dump_response(response))
+
+    async def chat(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> LLMResponse:
+        key = self._key(messages, tools, temperature)
+        response = self._lookup(key)
+        if response is not None:
+            return response
+        response = await self._provider.chat(messages, tools=tools, temperature=temperature)
+        self._record(key, response)
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[StreamEvent]:
+        """Replay a stored response, or stream from the provider and store it."""
+        key = self._key(messages, tools, temperature)
+        response = self._lookup(key)
+        if response is not None:
+            # A stored response is replayed as one burst of events
+            timer = StreamTimer()
+            if response.content:
+                yield timer.event("text", text=response.content)
+            for tool_call in response.tool_calls:
+                yield timer.event("tool_call", tool_call=tool_call)
+            done = timer.event("done", response=response)
+            response.timings = timer.timings
+            yield done
+            return
+        async for event in self._provider.stream(messages, tools=tools, temperature=temperature):
+            if event.type == "done" and event.response is not None:
+                self._record(key, event.response)
+            yield event
+
+    def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return self._provider.format_tools(tool_definitions)
+
+
+def wrap_provider(provider: BaseLLMProvider, config: Config) -> BaseLLMProvider:
+    """Apply the configured LLM cache mode (``off`` returns `provider`)."""
+    if config.llm_cache_mode == "off":
+        return provider
+    store = ResponseStore(
+        config.cache_dir / "llm", max_bytes=int(config.llm_cache_max_mb * 1024 * 1024)
+    )
+    logger.info("LLM response cache in %s mode at %s", config.llm_cache_mode, store.directory)
+    return CachingProvider(provider, store, mode=config.llm_cache_mode)
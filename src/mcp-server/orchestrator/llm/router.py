@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable
 
-from .base import BaseLLMProvider, LLMResponse, Message
-from ..registry.registry import ToolRegistry
+from .agent import AgentResult, AgentStep, ToolScheduler
+from .base import BaseLLMProvider, LLMResponse, Message, StreamEvent
+from .compaction import CompactionReport, ConversationCompactor, estimate_tokens
+from .ledger import DEFAULT_SESSION, BudgetExceededError, UsageLedger
+from .tool_index import ToolIndex
+from ..dispatcher.result_store import READ_TOOL
+from ..registry.registry import RegistryChange, ToolRegistry
+
+if TYPE_CHECKING:
+    from ..dispatcher.dispatcher import Dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +31,8 @@ When using tools:
 - Use the most specific tool available for the task.
 """
 
+QUERY_USER_MESSAGES = 3  # recent user messages used as the retrieval query
+
 
 class LLMRouter:
     """Routes user messages through an LLM provider with tool definitions.
@@ -29,6 +41,18 @@ class LLMRouter:
     1. Builds the tool list from the registry
     2. Sends the conversation to the LLM with available tools
     3. Returns the LLM response (which may include tool calls)
+
+    With `top_k` set, only the `top_k` tools ranked most relevant to the
+    recent user messages are sent, plus the `pinned` tools and any tool
+    already called in the conversation (and ``results.read`` once a tool
+    result has been stored server-side). Without it, every tool is sent.
+
+    With a `compactor`, the conversation is compacted to its token budget
+    before each model call; `last_compaction` reports the result.
+
+    With a `ledger`, every response's usage (and, in `run`, every tool call)
+    is recorded under the call's `session_id`, and a session that has used
+    up its budget gets `BudgetExceededError` instead of a model call.
     """
 
     def __init__(
@@ -36,40 +60,297 @@ class LLMRouter:
         provider: BaseLLMProvider,
         registry: ToolRegistry,
         system_prompt: str = SYSTEM_PROMPT,
+        top_k: int | None = None,
+        pinned: Iterable[str] = (),
+        compactor: ConversationCompactor | None = None,
+        ledger: UsageLedger | None = None,
     ) -> None:
         self._provider = provider
         self._registry = registry
         self._system_prompt = system_prompt
-        self._tools_cache: list[dict[str, Any]] | None = None
+        self._top_k = top_k
+        self._pinned = tuple(pinned)
+        self._compactor = compactor
+        self.last_compaction: CompactionReport | None = None
+        self.ledger = ledger
+        # Retrieval index and the registry version it reflects (-1 = stale);
+        # guarded by a lock because it is updated in place
+        self._index = ToolIndex()
+        self._index_version = -1
+        self._index_lock = threading.Lock()
+        # (registry version, formatted tool by name, formatted tool list),
+        # swapped as one object because registry changes arrive on the
+        # watcher thread
+        self._tools_cache: (
+            tuple[int, dict[str, dict[str, Any]], list[dict[str, Any]]] | None
+        ) = None
 
-        # Invalidate cache when registry changes
-        registry.on_change(self._invalidate_tools_cache)
+        # Re-format and re-index only changed tools when the registry changes
+        registry.on_change(self._update_tools_cache)
+        registry.on_change(self._update_index)
 
-    def _invalidate_tools_cache(self) -> None:
-        self._tools_cache = None
+    def _update_tools_cache(self, change: RegistryChange) -> None:
+        cache = self._tools_cache
+        if cache is None:
+            return
+        snapshot = self._registry.snapshot()
+        if snapshot.version != change.version:
+            # Other changes landed in between; rebuild on next use
+            self._tools_cache = None
+            return
+        by_name = dict(cache[1])
+        for name in change.removed:
+            by_name.pop(name, None)
+        for name in change.added | change.modified:
+            definition = snapshot.tools.get(name)
+            if definition is None:
+                by_name.pop(name, None)
+            else:
+                by_name[name] = self._provider.format_tools([definition])[0]
+        self._tools_cache = (snapshot.version, by_name, list(by_name.values()))
+
+    def _formatted_tools(
+        self,
+    ) -> tuple[int, dict[str, dict[str, Any]], list[dict[str, Any]]]:
+        """Return the formatted tool cache for the current registry version.
+
+        The cache is keyed on the registry snapshot version, so changes made
+        without a change notification (e.g. `register()`) are picked up too.
+        """
+        cache = self._tools_cache
+        if cache is None or cache[0] != self._registry.version:
+            snapshot = self._registry.snapshot()
+            definitions = list(snapshot.definitions)
+            formatted = self._provider.format_tools(definitions)
+            by_name = {d["name"]: tool for d, tool in zip(definitions, formatted)}
+            cache = self._tools_cache = (snapshot.version, by_name, formatted)
+        return cache
 
     def _get_formatted_tools(self) -> list[dict[str, Any]]:
         """Get tool definitions formatted for the current provider."""
-        if self._tools_cache is None:
-            definitions = self._registry.list_tools()
-            self._tools_cache = self._provider.format_tools(definitions)
-        return self._tools_cache
+        return self._formatted_tools()[2]
+
+    def _update_index(self, change: RegistryChange) -> None:
+        with self._index_lock:
+            if self._index_version < 0:
+                return  # not built yet, or already stale
+            snapshot = self._registry.snapshot()
+            if snapshot.version != change.version:
+                self._index_version = -1
+                return
+            for name in change.removed:
+                self._index.remove(name)
+            for name in change.added | change.modified:
+                definition = snapshot.tools.get(name)
+                if definition is None:
+                    self._index.remove(name)
+                else:
+                    self._index.add(definition)
+            self._index_version = snapshot.version
+
+    def search_tools(self, query: str, k: int) -> list[tuple[str, float]]:
+        """Rank registered tools against a query with the retrieval index."""
+        with self._index_lock:
+            if self._index_version != self._registry.version:
+                snapshot = self._registry.snapshot()
+                self._index.rebuild(snapshot.definitions)
+                self._index_version = snapshot.version
+            return self._index.search(query, k)
+
+    def select_tools(self, messages: list[Message]) -> list[str]:
+        """Return the names of the tools to send for this conversation.
+
+        Falls back to the whole catalog when retrieval is off, the catalog
+        is already small, or the query matches no tool.
+        """
+        _, by_name, _ = self._formatted_tools()
+        if self._top_k is None or len(by_name) <= self._top_k + len(self._pinned):
+            return list(by_name)
+
+        query = " ".join(
+            m.content for m in [m for m in messages if m.role == "user"][-QUERY_USER_MESSAGES:]
+        )
+        ranked = self.search_tools(query, self._top_k)
+        if not ranked:
+            return list(by_name)
+
+        selected = set(self._pinned)
+        selected.update(name for name, _ in ranked)
+        for message in messages:
+            for tool_call in message.tool_calls or []:
+                selected.add(tool_call.name)
+            if message.role == "tool" and '"result_handle"' in message.content:
+                selected.add(READ_TOOL)  # needed to page through a stored result
+        # Keep catalog order so the tool list is stable across turns
+        return [name for name in by_name if name in selected]
+
+    def _tools_for(self, messages: list[Message]) -> list[dict[str, Any]]:
+        """Formatted tools to send with this conversation."""
+        _, by_name, formatted = self._formatted_tools()
+        if self._top_k is None:
+            return formatted
+        return [by_name[name] for name in self.select_tools(messages) if name in by_name]
+
+    def _prepare(self, messages: list[Message]) -> list[Message]:
+        """Compact the conversation and prepend the system prompt."""
+        if self._compactor is not None:
+            messages, report = self._compactor.compact(messages)
+            self.last_compaction = report
+            if report.tokens_saved:
+                logger.info(
+                    "Compacted conversation by %d tokens (%d -> %d)",
+                    report.tokens_saved, report.tokens_before, report.tokens_after,
+                )
+        return [Message(role="system", content=self._system_prompt), *messages]
+
+    def _record(self, session_id: str, response: LLMResponse) -> None:
+        if self.ledger is not None:
+            self.ledger.record(
+                session_id, response.model or self._provider.model, response.normalized_usage
+            )
 
     async def chat(
         self,
         messages: list[Message],
         temperature: float = 0.0,
+        session_id: str = DEFAULT_SESSION,
     ) -> LLMResponse:
         """Send a conversation to the LLM with available tools.
 
-        Prepends the system prompt and includes all registered tools.
+        Prepends the system prompt and includes the tools chosen by
+        `select_tools`.
         """
-        full_messages = [Message(role="system", content=self._system_prompt)]
-        full_messages.extend(messages)
+        if self.ledger is not None:
+            self.ledger.check(session_id)
+        full_messages = self._prepare(messages)
+        tools = self._tools_for(messages)
+        response = await self._provider.chat(
+            full_messages,
+            tools=tools if tools else None,
+            temperature=temperature,
+        )
+        self._record(session_id, response)
+        return response
+
+    async def stream(
+        self,
+        messages: list[Message],
+        temperature: float = 0.0,
+        session_id: str = DEFAULT_SESSION,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a conversation turn; see `BaseLLMProvider.stream`.
 
-        tools = self._get_formatted_tools()
-        return await self._provider.chat(
+        Tool calls are yielded as soon as the model finishes each one, so a
+        caller can dispatch the first while later ones are still streaming.
+        """
+        if self.ledger is not None:
+            self.ledger.check(session_id)
+        full_messages = self._prepare(messages)
+        tools = self._tools_for(messages)
+        async for event in self._provider.stream(
             full_messages,
             tools=tools if tools else None,
             temperature=temperature,
+        ):
+            if event.type == "done" and event.response is not None:
+                self._record(session_id, event.response)
+            yield event
+
+    async def run(
+        self,
+        messages: list[Message],
+        dispatcher: Dispatcher,
+        max_steps: int = 10,
+        time_budget_seconds: float | None = None,
+        temperature: float = 0.0,
+        session_id: str = DEFAULT_SESSION,
+    ) -> AgentResult:
+        """Run the conversation as an agent loop until the model stops.
+
+        Each step streams one model turn. Tool calls are dispatched as they
+        arrive (see `ToolScheduler` for ordering), their results are added
+        as ``tool`` messages, and the model is called again. The loop ends
+        when a turn makes no tool calls, after `max_steps` turns, when
+        `time_budget_seconds` has run out before a new turn starts, or when
+        the session has used up its ledger budget. A turn that has started
+        always runs its tool calls to completion.
+        """
+        conversation = list(messages)
+        steps: list[AgentStep] = []
+        response: LLMResponse | None = None
+        start = time.perf_counter()
+        stop_reason = "max_steps"
+
+        for index in range(max_steps):
+            if (
+                time_budget_seconds is not None
+                and time.perf_counter() - start >= time_budget_seconds
+            ):
+                stop_reason = "time_budget"
+                break
+            if self.ledger is not None:
+                try:
+                    self.ledger.check(session_id)
+                except BudgetExceededError:
+                    stop_reason = "budget"
+                    break
+
+            step = AgentStep(index=index)
+            step_start = time.perf_counter()
+            scheduler = ToolScheduler(dispatcher, self._registry)
+            try:
+                async for event in self.stream(
+                    conversation, temperature=temperature, session_id=session_id
+                ):
+                    if event.type == "tool_call" and event.tool_call is not None:
+                        if step.first_tool_call_ms is None:
+                            step.first_tool_call_ms = event.elapsed_ms
+                        scheduler.submit(event.tool_call)
+                    elif event.type == "done":
+                        response = event.response
+            except BaseException:
+                await scheduler.cancel()
+                raise
+            step.model_ms = (time.perf_counter() - step_start) * 1000
+            assert response is not None
+            if self.last_compaction is not None:
+                step.tokens_compacted = self.last_compaction.tokens_saved
+
+            conversation.append(
+                Message(
+                    role="assistant",
+                    content=response.content,
+                    tool_calls=response.tool_calls or None,
+                )
+            )
+            step.usage = dict(response.usage)
+            if not response.tool_calls:
+                step.total_ms = step.model_ms
+                steps.append(step)
+                stop_reason = "end_turn"
+                break
+
+            results = await scheduler.results()
+            conversation.extend(results)
+            if self.ledger is not None:
+                for record, result in zip(scheduler.records, results):
+                    self.ledger.record_tool(
+                        session_id, record.name, record.duration_ms,
+                        record.success, estimate_tokens(result),
+                    )
+            step.tools_ms = scheduler.elapsed_ms()
+            step.tool_calls = scheduler.records
+            step.total_ms = (time.perf_counter() - step_start) * 1000
+            steps.append(step)
+            logger.debug(
+                "Agent step %d: model %.0f ms, %d tools in %.0f ms",
+                index, step.model_ms, len(step.tool_calls), step.tools_ms,
+            )
+
+        return AgentResult(
+            messages=conversation,
+            response=response,
+            stop_reason=stop_reason,
+            steps=steps,
+            total_ms=(time.perf_counter() - start) * 1000,
         )
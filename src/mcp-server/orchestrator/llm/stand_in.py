@@ -0,0 +1,94 @@
+"""Offline stand-in for an LLM provider.
+
+`StandInProvider` answers without network access, after a configurable
+delay, and can be told to fail. Use it to exercise the router, the agent
+loop, hedging and failover, or the server under load without API keys.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from typing import Any, Callable
+
+from .base import BaseLLMProvider, LLMResponse, Message
+
+Responder = Callable[[list[Message], list[dict[str, Any]] | None], LLMResponse]
+
+
+class StandInProviderError(RuntimeError):
+    """Failure injected by `StandInProvider`."""
+
+
+def echo(messages: list[Message], tools: list[dict[str, Any]] | None) -> LLMResponse:
+    """Default responder: repeat the last user message."""
+    last = next((m.content for m in reversed(messages) if m.role == "user"), "")
+    return LLMResponse(content=f"echo: {last}", usage={"input_tokens": 0, "output_tokens": 0})
+
+
+class StandInProvider(BaseLLMProvider):
+    """Scripted provider for offline use.
+
+    Args:
+        name: Reported provider name, so several stand-ins can be told apart.
+        responses: Responses returned in order (the last one repeats), or a
+            function of (messages, tools) returning the response. Defaults
+            to `echo`.
+        latency_seconds: Delay before each answer.
+        fail_first: Number of initial calls that raise `StandInProviderError`.
+    """
+
+    def __init__(
+        self,
+        name: str = "stand-in",
+        responses: list[LLMResponse] | Responder | None = None,
+        latency_seconds: float = 0.0,
+        fail_first: int = 0,
+    ) -> None:
+        self._name = name
+        self._responses = responses if responses is not None else echo
+        self.latency_seconds = latency_seconds
+        self.fail_remaining = fail_first
+        self.calls = 0
+        self.cancelled = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def model(self) -> str:
+        return "stand-in"
+
+    async def chat(
+        self,
+        messages: list[Message],
+        tools: list[dict[str, Any]] | None = None,
+        temperature: float = 0.0,
+    ) -> LLMResponse:
+        self.calls += 1
+        call = self.calls
+        try:
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail_remaining > 0:
+            self.fail_remaining -= 1
+            raise StandInProviderError(f"{self._name}: injected failure on call {call}")
+        if callable(self._responses):
+            response = self._responses(messages, tools)
+        else:
+            index = min(call, len(self._responses)) - 1
+            response = copy.deepcopy(self._responses[index])
+        response.model = response.model or self.model
+        response.timings.setdefault("total", self.latency_seconds * 1000)
+        return response
+
+    def format_tools(self, tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Tools are passed through in registry format."""
+        return [
+            {"name": d["name"], "description": d["description"], "parameters": d["parameters"]}
+            for d in tool_definitions
+        ]
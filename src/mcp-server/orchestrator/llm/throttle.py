@@ -0,0 +1,407 @@
+"""Shared LLM API clients and rate-limit-aware request throttling.
+
+Every provider instance used to build its own SDK client, so concurrent
+sessions opened unbounded connections and only learned about rate limits
+from 429 responses. `ClientPool` hands out one SDK client per (provider,
+API key) and event loop, backed by an HTTP connection pool of fixed size.
+Clients are created on first use in each loop, because an httpx client
+cannot be shared between loops. Every (provider, API key) has one
+`RateLimiter`, shared by its clients, that requests wait on before they
+are sent.
+
+The limiter keeps two token buckets: requests per minute and tokens per
+minute. Their capacities come from configuration or are learned from the
+rate-limit headers of each response, and a 429 pauses every queued request
+until its ``retry-after`` has passed. Requests that would exceed a limit
+queue in arrival order instead of failing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+import httpx
+
+from .compaction import CHARS_PER_TOKEN
+
+if TYPE_CHECKING:
+    from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_AFTER_SECONDS = 5.0  # pause after a 429 without retry-after
+
+# (requests limit, requests remaining, tokens limit, tokens remaining)
+_RATE_LIMIT_HEADERS = (
+    (
+        "anthropic-ratelimit-requests-limit",
+        "anthropic-ratelimit-requests-remaining",
+        "anthropic-ratelimit-tokens-limit",
+        "anthropic-ratelimit-tokens-remaining",
+    ),
+    (
+        "x-ratelimit-limit-requests",
+        "x-ratelimit-remaining-requests",
+        "x-ratelimit-limit-tokens",
+        "x-ratelimit-remaining-tokens",
+    ),
+)
+
+
+class ToolTokenCache:
+    """Rough token counts of formatted tool lists, reserved with each request.
+
+    The router sends the same formatted list every turn, or with tool
+    retrieval a new list of the same tool dicts, so counts are kept per
+    list and per tool by identity and each tool is serialized once. Entries
+    hold the objects they count, so an id cannot be reused while cached.
+    Formatted tools must not be modified after they are first sent.
+
+    Args:
+        max_tools: Least recently used tool counts beyond this are evicted.
+    """
+
+    _MAX_LISTS = 8
+
+    def __init__(self, max_tools: int = 4096) -> None:
+        self._max_tools = max_tools
+        self._lists: OrderedDict[int, tuple[list[dict[str, Any]], int]] = OrderedDict()
+        self._tools: OrderedDict[int, tuple[dict[str, Any], int]] = OrderedDict()
+
+    def tokens(self, tools: list[dict[str, Any]] | None) -> int:
+        if not tools:
+            return 0
+        cached = self._lists.get(id(tools))
+        if cached is not None and cached[0] is tools:
+            self._lists.move_to_end(id(tools))
+            return cached[1]
+        total = sum(self._tool_tokens(tool) for tool in tools)
+        self._lists[id(tools)] = (tools, total)
+        self._lists.move_to_end(id(tools))
+        if len(self._lists) > self._MAX_LISTS:
+            self._lists.popitem(last=False)
+        return total
+
+    def _tool_tokens(self, tool: dict[str, Any]) -> int:
+        key = id(tool)
+        cached = self._tools.get(key)
+        if cached is not None and cached[0] is tool:
+            self._tools.move_to_end(key)
+            return cached[1]
+        tokens = len(json.dumps(tool, default=str)) // CHARS_PER_TOKEN
+        self._tools[key] = (tool, tokens)
+        self._tools.move_to_end(key)
+        if len(self._tools) > self._max_tools:
+            self._tools.popitem(last=False)
+        return tokens
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `per_minute` units.
+
+    A `per_minute` of 0 means the limit is unknown and the bucket never
+    delays. The level may go negative when a request uses more than was
+    reserved for it; later requests then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: int = 0) -> None:
+        self.per_minute = per_minute
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self.per_minute:
+            elapsed = now - self._updated
+            self.level = min(float(self.per_minute), self.level + elapsed * self.per_minute / 60)
+        self._updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        # A request larger than the whole bucket waits for a full bucket
+        needed = min(amount, self.per_minute) - self.level
+        return max(0.0, needed * 60 / self.per_minute)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def set_limit(self, per_minute: int, now: float) -> None:
+        """Adopt a limit reported by the API."""
+        self._refill(now)
+        if not self.per_minute:
+            self.level = float(per_minute)
+        self.per_minute = per_minute
+        self.level = min(self.level, float(per_minute))
+
+    def set_remaining(self, remaining: int, now: float) -> None:
+        """Lower the level to what the API says is left (never raise it)."""
+        self._refill(now)
+        self.level = min(self.level, float(remaining))
+
+
+@dataclass
+class LimiterStats:
+    """Counters for one `RateLimiter`."""
+
+    requests: int = 0
+    queued: int = 0  # requests that had to wait
+    waiting: int = 0  # requests waiting right now
+    throttled: int = 0  # 429 responses
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+
+
+class RateLimiter:
+    """Queues requests so they stay within request and token rate limits.
+
+    Args:
+        requests_per_minute: Starting request limit; 0 until learned.
+        tokens_per_minute: Starting token limit; 0 until learned.
+        learn_from_headers: Adopt limits and remaining counts from responses.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        learn_from_headers: bool = True,
+    ) -> None:
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._learn = learn_from_headers
+        self._paused_until = 0.0
+        # FIFO: requests are released in arrival order. One lock per event
+        # loop, since an asyncio.Lock cannot be awaited from another loop.
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+        self._stats = LimiterStats()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return queueing counters and the current limits."""
+        s = self._stats
+        return {
+            "requests": s.requests,
+            "queued": s.queued,
+            "waiting": s.waiting,
+            "throttled": s.throttled,
+            "wait_ms_total": round(s.wait_ms_total, 2),
+            "wait_ms_max": round(s.wait_ms_max, 2),
+            "wait_ms_avg": round(s.wait_ms_total / s.requests, 2) if s.requests else 0.0,
+            "requests_per_minute": self._requests.per_minute,
+            "tokens_per_minute": self._tokens.per_minute,
+        }
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until a request of about `tokens` tokens may be sent.
+
+        Returns:
+            Milliseconds spent queued.
+        """
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        self._stats.waiting += 1
+        try:
+            async with lock:
+                while True:
+                    now = time.monotonic()
+                    wait = max(
+                        self._paused_until - now,
+                        self._requests.delay(1, now),
+                        self._tokens.delay(tokens, now),
+                    )
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                self._requests.take(1, now)
+                self._tokens.take(tokens, now)
+        finally:
+            self._stats.waiting -= 1
+
+        waited_ms = (time.monotonic() - start) * 1000
+        self._stats.requests += 1
+        self._stats.wait_ms_total += waited_ms
+        self._stats.wait_ms_max = max(self._stats.wait_ms_max, waited_ms)
+        if waited_ms >= 1:
+            self._stats.queued += 1
+            logger.debug("LLM request queued for %.0f ms by rate limiter", waited_ms)
+        return waited_ms
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Correct the token bucket once a request's actual usage is known."""
+        if used:
+            self._tokens.take(used - reserved, time.monotonic())
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update limits from a response's rate-limit headers."""
+        now = time.monotonic()
+        if self._learn:
+            for requests_limit, requests_left, tokens_limit, tokens_left in _RATE_LIMIT_HEADERS:
+                _apply(self._requests, headers, requests_limit, requests_left, now)
+                _apply(self._tokens, headers, tokens_limit, tokens_left, now)
+        if status_code == 429:
+            self._stats.throttled += 1
+            retry_after = _number(headers.get("retry-after"))
+            pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+            self._paused_until = max(self._paused_until, now + pause)
+            logger.warning("LLM API rate limited; pausing requests for %.1f s", pause)
+
+    async def on_response(self, response: httpx.Response) -> None:
+        """httpx response hook feeding `observe`."""
+        self.observe(response.status_code, response.headers)
+
+
+def _apply(
+    bucket: TokenBucket,
+    headers: Mapping[str, str],
+    limit_header: str,
+    remaining_header: str,
+    now: float,
+) -> None:
+    limit = _number(headers.get(limit_header))
+    if limit:
+        bucket.set_limit(int(limit), now)
+    remaining = _number(headers.get(remaining_header))
+    if remaining is not None:
+        bucket.set_remaining(int(remaining), now)
+
+
+def _number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class PooledClient:
+    client: Any  # AsyncAnthropic or AsyncOpenAI
+    limiter: RateLimiter
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Short, non-reversible identifier of an API key for logs and stats."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+class ClientPool:
+    """Process-wide SDK clients, one per (provider, API key) and event loop.
+
+    Args:
+        max_connections: HTTP connections per client.
+        max_keepalive_connections: Idle connections kept open per client.
+        requests_per_minute: Initial request limit for new limiters.
+        tokens_per_minute: Initial token limit for new limiters.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._limiters: dict[tuple[str, str], RateLimiter] = {}
+        # Clients of a loop are dropped with it
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[str, str], PooledClient]
+        ] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_config(cls, config: Config) -> ClientPool:
+        return cls(
+            max_connections=config.llm_max_connections,
+            max_keepalive_connections=min(10, config.llm_max_connections),
+            requests_per_minute=config.llm_requests_per_minute,
+            tokens_per_minute=config.llm_tokens_per_minute,
+        )
+
+    def get(
+        self,
+        provider: str,
+        api_key: str,
+        factory: Callable[[dict[str, Any]], Any],
+    ) -> PooledClient:
+        """Return the client for a provider and key in the running loop.
+
+        The client is created on the first call in each event loop.
+        `factory` receives keyword arguments for the SDK's default httpx
+        client (connection limits and the limiter's response hook) and
+        returns the SDK client.
+
+        Raises:
+            RuntimeError: If no event loop is running.
+        """
+        loop = asyncio.get_running_loop()
+        key = (provider, key_fingerprint(api_key))
+        clients = self._clients.get(loop)
+        if clients is None:
+            clients = self._clients[loop] = {}
+        pooled = clients.get(key)
+        if pooled is None:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(self._requests_per_minute, self._tokens_per_minute)
+                self._limiters[key] = limiter
+            client = factory({
+                "limits": self._limits,
+                "event_hooks": {"response": [limiter.on_response]},
+            })
+            pooled = PooledClient(client, limiter)
+            clients[key] = pooled
+        return pooled
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return limiter counters keyed by ``provider:key fingerprint``."""
+        return {
+            f"{provider}:{fingerprint}": limiter.stats
+            for (provider, fingerprint), limiter in self._limiters.items()
+        }
+
+    async def close(self) -> None:
+        """Close the running loop's clients and forget those of other loops."""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        self._clients.clear()
+        for pooled in clients.values():
+            await pooled.client.close()
+
+
+_pool: ClientPool | None = None
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide pool, creating one with defaults if needed."""
+    global _pool
+    if _pool is None:
+        _pool = ClientPool()
+    return _pool
+
+
+def set_client_pool(pool: ClientPool) -> None:
+    """Replace the process-wide pool (e.g. with `ClientPool.from_config`)."""
+    global _pool
+    _pool = pool
@@ -0,0 +1,145 @@
+"""In-process BM25 index over tool definitions.
+
+Used by `LLMRouter` to send only the tools relevant to the current turn
+instead of the whole catalog. Each tool is indexed as a bag of terms drawn
+from its name, description, parameter names and descriptions, and example
+descriptions. The index is updated per tool, so a registry change costs
+time proportional to the tools it touched.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Any, Iterable
+
+_WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or that the "
+    "this to with all any can do does i me my please should some we what "
+    "which will you your".split()
+)
+
+NAME_WEIGHT = 3  # name terms count this many times
+PARAMETER_NAME_WEIGHT = 2
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms.
+
+    Splits on punctuation, underscores and camelCase, drops stop words and
+    strips a plural ``s`` so "walls" matches "wall".
+    """
+    terms = []
+    for word in _WORD_RE.findall(text):
+        word = word.lower()
+        if word in _STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def tool_terms(definition: dict[str, Any]) -> Counter[str]:
+    """Return weighted term counts for one tool definition."""
+    terms: Counter[str] = Counter()
+    for term in tokenize(definition.get("name", "")):
+        terms[term] += NAME_WEIGHT
+    terms.update(tokenize(definition.get("description", "")))
+    properties = (definition.get("parameters") or {}).get("properties") or {}
+    for param_name, param in properties.items():
+        for term in tokenize(param_name):
+            terms[term] += PARAMETER_NAME_WEIGHT
+        if isinstance(param, dict):
+            terms.update(tokenize(str(param.get("description", ""))))
+    for example in definition.get("examples") or []:
+        terms.update(tokenize(str(example.get("description", ""))))
+    return terms
+
+
+class ToolIndex:
+    """BM25 ranking of tools against a free-text query.
+
+    Args:
+        k1: Term frequency saturation.
+        b: Document length normalization.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._clear()
+
+    def _clear(self) -> None:
+        self._docs: dict[str, Counter[str]] = {}
+        self._lengths: dict[str, int] = {}
+        self._doc_freq: Counter[str] = Counter()
+        self._postings: dict[str, set[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._docs
+
+    def add(self, definition: dict[str, Any]) -> None:
+        """Index a tool, replacing any previous entry with the same name."""
+        name = definition["name"]
+        self.remove(name)
+        terms = tool_terms(definition)
+        self._docs[name] = terms
+        length = sum(terms.values())
+        self._lengths[name] = length
+        self._total_length += length
+        for term in terms:
+            self._doc_freq[term] += 1
+            self._postings.setdefault(term, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        terms = self._docs.pop(name, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(name)
+        for term in terms:
+            self._doc_freq[term] -= 1
+            if self._doc_freq[term] <= 0:
+                del self._doc_freq[term]
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(name)
+                if not postings:
+                    del self._postings[term]
+
+    def rebuild(self, definitions: Iterable[dict[str, Any]]) -> None:
+        """Replace the whole index."""
+        self._clear()
+        for definition in definitions:
+            self.add(definition)
+
+    def search(self, query: str, k: int) -> list[tuple[str, float]]:
+        """Return up to `k` (tool name, score) pairs, best first.
+
+        Tools sharing no term with the query are not returned.
+        """
+        query_terms = set(tokenize(query))
+        if not query_terms or not self._docs or k <= 0:
+            return []
+        count = len(self._docs)
+        avg_length = self._total_length / count
+        scores: dict[str, float] = {}
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = self._doc_freq[term]
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for name in postings:
+                tf = self._docs[name][term]
+                norm = self._k1 * (1 - self._b + self._b * self._lengths[name] / avg_length)
+                scores[name] = scores.get(name, 0.0) + idf * tf * (self._k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import uuid
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .protocol import (
     HEADER_SIZE,
@@ -15,6 +15,9 @@ from .protocol import (
     make_pong,
 )
 
+if TYPE_CHECKING:
+    from ..traffic import TrafficRecorder
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +25,7 @@ class PipeConnection:
     """Manages a single named pipe connection.
 
     Handles reading/writing framed messages and tracking pending requests.
+    With a `TrafficRecorder`, every message sent and received is recorded.
     """
 
     def __init__(
@@ -29,10 +33,12 @@ class PipeConnection:
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
         timeout: float = 30.0,
+        recorder: TrafficRecorder | None = None,
     ) -> None:
         self._reader = reader
         self._writer = writer
         self._timeout = timeout
+        self._recorder = recorder
         self._pending: dict[str, asyncio.Future[dict[str, Any]]] = {}
         self._connected = True
         self._read_task: asyncio.Task[None] | None = None
@@ -62,6 +68,8 @@ class PipeConnection:
         if not self._connected:
             raise ConnectionError("Pipe is not connected")
         data = encode_message(message)
+        if self._recorder is not None:
+            self._recorder.record_pipe("out", message, len(data))
         self._writer.write(data)
         await self._writer.drain()
 
@@ -93,6 +101,8 @@ class PipeConnection:
                 # Read payload
                 payload_bytes = await self._reader.readexactly(length)
                 message = decode_payload(payload_bytes)
+                if self._recorder is not None:
+                    self._recorder.record_pipe("in", message, HEADER_SIZE + length)
 
                 await self._handle_message(message)
         except asyncio.IncompleteReadError:
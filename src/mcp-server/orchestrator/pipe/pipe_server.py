@@ -5,10 +5,13 @@ from __future__ import annotations
 import asyncio
 import ctypes
 import logging
-from typing import Any, Callable, Awaitable
+from typing import TYPE_CHECKING, Any, Callable, Awaitable
 
 from .connection import PipeConnection
 
+if TYPE_CHECKING:
+    from ..traffic import TrafficRecorder
+
 logger = logging.getLogger(__name__)
 
 # Windows named pipe constants
@@ -33,9 +36,11 @@ class PipeServer:
         timeout: float = 30.0,
         on_connect: Callable[[PipeConnection], Awaitable[None]] | None = None,
         on_disconnect: Callable[[PipeConnection], Awaitable[None]] | None = None,
+        recorder: TrafficRecorder | None = None,
     ) -> None:
         self._pipe_name = pipe_name
         self._timeout = timeout
+        self._recorder = recorder
         self._on_connect = on_connect
         self._on_disconnect = on_disconnect
         self._connections: list[PipeConnection] = []
@@ -88,7 +93,9 @@ class PipeServer:
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
         """Handle a new pipe client connection."""
-        connection = PipeConnection(reader, writer, timeout=self._timeout)
+        connection = PipeConnection(
+            reader, writer, timeout=self._timeout, recorder=self._recorder
+        )
         self._connections.append(connection)
         logger.info("New pipe client connected")
 
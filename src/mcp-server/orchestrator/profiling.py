@@ -0,0 +1,139 @@
+"""Startup profiling for the MCP server.
+
+`StartupProfiler` records how long each server startup phase takes; the
+server keeps one as ``server.startup_profile``. Running this module starts
+a fresh interpreter that imports the server under ``python -X importtime``
+and reports both the slowest imports and the startup phases:
+
+    python -m orchestrator.profiling [--fast-start] [--top 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Records wall-clock durations of named startup phases."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._phases: list[tuple[str, float, float]] = []  # (name, start_ms, duration_ms)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._phases.append(
+                (name, (start - self._origin) * 1000, (end - start) * 1000)
+            )
+            logger.debug("Startup phase %s took %.1f ms", name, (end - start) * 1000)
+
+    def as_dict(self) -> list[dict[str, float | str]]:
+        return [
+            {"phase": name, "start_ms": round(start, 2), "duration_ms": round(duration, 2)}
+            for name, start, duration in self._phases
+        ]
+
+    def report(self) -> str:
+        return format_phases(self.as_dict())
+
+
+def format_phases(phases: list[dict[str, float | str]]) -> str:
+    """Render `StartupProfiler.as_dict()` output as a table."""
+    lines = [f"{'phase':<32} {'start':>9} {'duration':>10}"]
+    for p in phases:
+        lines.append(f"{p['phase']:<32} {p['start_ms']:>7.1f}ms {p['duration_ms']:>8.1f}ms")
+    return "\n".join(lines)
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|")
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+_PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from orchestrator import server
+imported = time.perf_counter()
+asyncio.run(server.wait_for_catalog())
+ready = time.perf_counter()
+server.registry.stop_watching()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "catalog_ready_ms": (ready - start) * 1000,
+    "tools": len(server.registry.list_tool_names()),
+    "phases": server.startup_profile.as_dict(),
+}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile MCP server startup")
+    parser.add_argument("--fast-start", action="store_true", help="Profile fast-start mode")
+    parser.add_argument("--top", type=int, default=20, help="Number of imports to show")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["ORCHESTRATOR_FAST_START"] = "true" if args.fast_start else "false"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        sys.exit(proc.returncode)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(proc.stderr)
+
+    by_package: dict[str, int] = defaultdict(int)
+    for module, self_us, _ in imports:
+        by_package[module.split(".")[0]] += self_us
+
+    print(f"Server module imported in {result['import_ms']:.1f} ms "
+          f"({'fast start' if args.fast_start else 'eager'})")
+    print(f"Catalog ready after {result['catalog_ready_ms']:.1f} ms "
+          f"({result['tools']} tools)\n")
+
+    print(f"{'package':<32} {'self':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda i: -i[1])[: args.top]:
+        print(f"{package:<32} {self_us / 1000:>8.1f}ms")
+
+    print(f"\n{'module':<48} {'self':>10} {'cumulative':>12}")
+    for module, self_us, cumulative_us in sorted(imports, key=lambda r: -r[1])[: args.top]:
+        print(f"{module:<48} {self_us / 1000:>8.1f}ms {cumulative_us / 1000:>10.1f}ms")
+
+    print()
+    print(format_phases(result["phases"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Persistent cache of parsed and validated tool definitions.
+
+Startup cost grows with catalog size because every tool file is read,
+parsed and schema-validated. The catalog cache remembers each valid
+definition together with its file's mtime, size and content hash, so
+unchanged files skip parsing and validation on the next start. Files that
+miss the cache are loaded one after another: parsing and validation are
+pure Python and hold the GIL, so a thread pool only adds overhead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .schema_validator import get_tool_definition_schema, validate_tool_definition
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class CatalogLoad:
+    """Result of loading a tools directory."""
+
+    definitions: dict[Path, dict[str, Any]] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    invalid: int = 0
+
+
+class CatalogCache:
+    """On-disk map of tool file path to (mtime, size, hash, definition).
+
+    The whole cache is discarded if the tool definition schema changes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._fingerprint = _schema_fingerprint()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_directory(cls, tools_dir: Path, cache_dir: Path) -> CatalogCache:
+        """Return the cache for a tools directory, stored under `cache_dir`."""
+        key = hashlib.sha256(str(tools_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+        return cls(cache_dir / f"catalog-{key}.json")
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def lookup(self, path: Path, stat: os.stat_result) -> dict[str, Any] | None:
+        """Return the cached definition if the file's mtime and size match."""
+        entry = self._entries.get(str(path))
+        if entry is None:
+            return None
+        if (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return entry["definition"]
+
+    def content_hash(self, path: Path) -> str | None:
+        entry = self._entries.get(str(path))
+        return entry["sha256"] if entry is not None else None
+
+    def get(self, path: Path) -> dict[str, Any] | None:
+        entry = self._entries.get(str(path))
+        return entry["definition"] if entry is not None else None
+
+    def put(
+        self,
+        path: Path,
+        mtime_ns: int,
+        size: int,
+        sha256: str,
+        definition: dict[str, Any],
+    ) -> None:
+        self._entries[str(path)] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "sha256": sha256,
+            "definition": definition,
+        }
+        self._dirty = True
+
+    def retain(self, paths: set[Path]) -> None:
+        """Drop entries for files that no longer exist."""
+        keep = {str(p) for p in paths}
+        stale = [key for key in self._entries if key not in keep]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if it changed."""
+        if not self._dirty:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        data = {
+            "version": CACHE_FORMAT_VERSION,
+            "schema": self._fingerprint,
+            "entries": self._entries,
+        }
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self._path)
+        self._dirty = False
+        logger.debug("Saved catalog cache with %d entries", len(self._entries))
+
+    def _load(self) -> None:
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable catalog cache %s: %s", self._path, e)
+            return
+        if (
+            data.get("version") != CACHE_FORMAT_VERSION
+            or data.get("schema") != self._fingerprint
+        ):
+            logger.info("Catalog cache is out of date; rebuilding")
+            return
+        self._entries = data.get("entries", {})
+
+
+def load_catalog(tools_dir: Path, cache: CatalogCache | None = None) -> CatalogLoad:
+    """Load and validate all tool files in a directory, using the cache.
+
+    Files whose mtime and size match the cache are taken from it as-is.
+    Other files are read and hashed; if the content hash still matches the
+    cached one the definition is reused, otherwise it is parsed and
+    validated. Invalid files are logged and left out.
+    """
+    result = CatalogLoad()
+    if not tools_dir.exists():
+        logger.warning("Tools directory does not exist: %s", tools_dir)
+        return result
+
+    paths = sorted(tools_dir.glob("*.json"))
+    misses: list[tuple[str, str | None]] = []
+    for path in paths:
+        definition = cache.lookup(path, path.stat()) if cache is not None else None
+        if definition is not None:
+            result.definitions[path] = definition
+            result.hits += 1
+        else:
+            known_hash = cache.content_hash(path) if cache is not None else None
+            misses.append((str(path), known_hash))
+
+    for path_str, mtime_ns, size, sha256, definition, errors in map(_load_tool, misses):
+        path = Path(path_str)
+        if errors:
+            logger.error("Failed to load tool from %s: %s", path.name, errors)
+            result.invalid += 1
+            continue
+        if definition is None and cache is not None:
+            # Touched but unchanged: reuse the validated definition
+            definition = cache.get(path)
+            result.hits += 1
+        else:
+            result.misses += 1
+        assert definition is not None
+        result.definitions[path] = definition
+        if cache is not None:
+            cache.put(path, mtime_ns, size, sha256, definition)
+
+    if cache is not None:
+        cache.retain(set(paths))
+        try:
+            cache.save()
+        except OSError as e:
+            logger.warning("Could not write catalog cache %s: %s", cache.path, e)
+    return result
+
+
+def _load_tool(
+    miss: tuple[str, str | None],
+) -> tuple[str, int, int, str, dict[str, Any] | None, list[str]]:
+    """Read, hash, parse and validate one tool file.
+
+    Returns a None definition with no errors if the content hash matches
+    `known_hash`, meaning the cached definition can be reused.
+    """
+    path_str, known_hash = miss
+    try:
+        with open(path_str, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+    except OSError as e:
+        return path_str, 0, 0, "", None, [str(e)]
+    sha256 = hashlib.sha256(data).hexdigest()
+    if sha256 == known_hash:
+        return path_str, stat.st_mtime_ns, stat.st_size, sha256, None, []
+    try:
+        definition = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return path_str, stat.st_mtime_ns, stat.st_size, sha256, None, [str(e)]
+    errors = validate_tool_definition(definition)
+    if errors:
+        return path_str, stat.st_mtime_ns, stat.st_size, sha256, None, errors
+    return path_str, stat.st_mtime_ns, stat.st_size, sha256, definition, []
+
+
+def _schema_fingerprint() -> str:
+    schema = json.dumps(get_tool_definition_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()
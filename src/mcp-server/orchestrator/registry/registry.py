@@ -2,58 +2,123 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Mapping
 
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
-from watchdog.observers import Observer
-
-from .loader import load_all_tools, load_tool_file
+from .catalog_cache import CatalogCache, load_catalog
+from .loader import load_tool_file
 from .schema_validator import validate_tool_definition
 
+if TYPE_CHECKING:
+    from watchdog.observers import Observer
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class RegistryChange:
+    """Tool names added, removed or modified by one registry update."""
+
+    added: frozenset[str] = field(default_factory=frozenset)
+    removed: frozenset[str] = field(default_factory=frozenset)
+    modified: frozenset[str] = field(default_factory=frozenset)
+    version: int = 0  # snapshot version the change produced
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Immutable view of the registry at one version.
+
+    Definitions are shared with the registry and must not be mutated.
+    """
+
+    version: int
+    tools: Mapping[str, dict[str, Any]]
+    definitions: tuple[dict[str, Any], ...]
+    names: tuple[str, ...]
+
+    @classmethod
+    def build(cls, version: int, tools: dict[str, dict[str, Any]]) -> RegistrySnapshot:
+        # `tools` is owned by the snapshot from here on
+        return cls(
+            version=version,
+            tools=MappingProxyType(tools),
+            definitions=tuple(tools.values()),
+            names=tuple(tools.keys()),
+        )
+
+
 class ToolRegistry:
-    """Thread-safe in-memory registry of tool definitions."""
+    """Thread-safe in-memory registry of tool definitions.
+
+    The catalog is published as an immutable `RegistrySnapshot` that is
+    replaced wholesale on every change. Readers just load the current
+    snapshot and never take a lock; writers are serialized by `_write_lock`
+    and build a new snapshot from a copy.
+    """
 
     def __init__(self) -> None:
-        self._tools: dict[str, dict[str, Any]] = {}
-        self._lock = threading.Lock()
+        self._snapshot = RegistrySnapshot.build(0, {})
+        self._paths: dict[Path, str] = {}
+        self._write_lock = threading.Lock()
         self._observer: Observer | None = None
-        self._on_change_callbacks: list[Callable[[], None]] = []
+        self._on_change_callbacks: list[Callable[[RegistryChange], None]] = []
 
-    def load_from_directory(self, tools_dir: Path) -> None:
-        """Load all tool definitions from a directory."""
-        tools = load_all_tools(tools_dir)
-        valid_tools: dict[str, dict[str, Any]] = {}
-        for name, definition in tools.items():
-            errors = validate_tool_definition(definition)
-            if errors:
-                logger.error("Tool '%s' has schema errors: %s", name, errors)
-            else:
-                valid_tools[name] = definition
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot; increases on every change."""
+        return self._snapshot.version
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Return the current catalog snapshot."""
+        return self._snapshot
+
+    def _publish(self, tools: dict[str, dict[str, Any]]) -> int:
+        """Swap in a new snapshot. Caller must hold `_write_lock`."""
+        version = self._snapshot.version + 1
+        self._snapshot = RegistrySnapshot.build(version, tools)
+        return version
 
-        with self._lock:
-            self._tools = valid_tools
-        logger.info("Registry loaded %d tools", len(valid_tools))
+    def load_from_directory(self, tools_dir: Path, cache: CatalogCache | None = None) -> None:
+        """Load all tool definitions from a directory.
+
+        With a `cache`, unchanged files skip parsing and validation.
+        """
+        loaded = load_catalog(tools_dir, cache=cache)
+        valid_tools: dict[str, dict[str, Any]] = {}
+        paths: dict[Path, str] = {}
+        for path, definition in loaded.definitions.items():
+            name = definition["name"]
+            valid_tools[name] = definition
+            paths[path] = name
+
+        with self._write_lock:
+            self._publish(valid_tools)
+            self._paths = paths
+        logger.info(
+            "Registry loaded %d tools (%d from cache, %d parsed, %d invalid)",
+            len(valid_tools), loaded.hits, loaded.misses, loaded.invalid,
+        )
 
     def get(self, name: str) -> dict[str, Any] | None:
         """Get a tool definition by name."""
-        with self._lock:
-            return self._tools.get(name)
+        return self._snapshot.tools.get(name)
 
-    def list_tools(self) -> list[dict[str, Any]]:
+    def list_tools(self) -> tuple[dict[str, Any], ...]:
         """Return all registered tool definitions."""
-        with self._lock:
-            return list(self._tools.values())
+        return self._snapshot.definitions
 
-    def list_tool_names(self) -> list[str]:
+    def list_tool_names(self) -> tuple[str, ...]:
         """Return all registered tool names."""
-        with self._lock:
-            return list(self._tools.keys())
+        return self._snapshot.names
 
     def register(self, definition: dict[str, Any]) -> None:
         """Register or update a single tool definition."""
@@ -61,32 +126,116 @@ class ToolRegistry:
         if errors:
             raise ValueError(f"Invalid tool definition: {errors}")
         name = definition["name"]
-        with self._lock:
-            self._tools[name] = definition
+        with self._write_lock:
+            self._publish({**self._snapshot.tools, name: definition})
         logger.info("Registered tool: %s", name)
 
     def unregister(self, name: str) -> bool:
         """Remove a tool from the registry. Returns True if it existed."""
-        with self._lock:
-            return self._tools.pop(name, None) is not None
-
-    def on_change(self, callback: Callable[[], None]) -> None:
-        """Register a callback to be invoked when the registry changes."""
+        with self._write_lock:
+            tools = dict(self._snapshot.tools)
+            if tools.pop(name, None) is None:
+                return False
+            self._publish(tools)
+            return True
+
+    def on_change(self, callback: Callable[[RegistryChange], None]) -> None:
+        """Register a callback to be invoked when the registry changes.
+
+        The callback receives a `RegistryChange` listing the affected tools.
+        """
         self._on_change_callbacks.append(callback)
 
-    def _notify_change(self) -> None:
+    def _notify_change(self, change: RegistryChange) -> None:
         for cb in self._on_change_callbacks:
             try:
-                cb()
+                cb(change)
             except Exception:
                 logger.exception("Error in registry change callback")
 
-    def start_watching(self, tools_dir: Path) -> None:
-        """Start watching the tools directory for changes."""
+    def reload_files(self, paths: set[Path]) -> RegistryChange:
+        """Re-read a batch of changed tool files and notify subscribers once.
+
+        Files that no longer exist remove their tool, and a file whose
+        ``name`` changed removes the tool it defined before. Files that fail
+        to parse or validate (e.g. half-written by an editor) keep the
+        previous definition. Definitions that are unchanged are not reported.
+        """
+        # Read and validate outside the lock; None marks a deleted file
+        updates: dict[Path, dict[str, Any] | None] = {}
+        for path in sorted(paths):
+            if not path.exists():
+                updates[path] = None
+                continue
+            try:
+                definition = load_tool_file(path)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error("Failed to reload tool from %s: %s", path.name, e)
+                continue
+            errors = validate_tool_definition(definition)
+            if errors:
+                logger.error("Tool file %s has schema errors: %s", path.name, errors)
+                continue
+            updates[path] = definition
+
+        with self._write_lock:
+            version = self._snapshot.version
+            before = self._snapshot.tools
+            tools = dict(before)
+            file_names = dict(self._paths)
+            stale: set[str] = set()
+            touched: set[str] = set()
+            for path, definition in updates.items():
+                old_name = file_names.pop(path, None)
+                if definition is None:
+                    stale.add(old_name or path.stem)
+                    continue
+                name = definition["name"]
+                file_names[path] = name
+                tools[name] = definition
+                touched.add(name)
+                if old_name is not None and old_name != name:
+                    stale.add(old_name)
+            # A name is only dropped if no other file still defines it
+            for name in stale - set(file_names.values()):
+                tools.pop(name, None)
+            touched |= stale
+
+            added = {n for n in touched if n in tools and n not in before}
+            removed = {n for n in touched if n in before and n not in tools}
+            modified = {
+                n for n in touched if n in tools and n in before and tools[n] != before[n]
+            }
+            if added or removed or modified:
+                version = self._publish(tools)
+            self._paths = file_names
+
+        change = RegistryChange(
+            frozenset(added), frozenset(removed), frozenset(modified), version
+        )
+        if change:
+            logger.info(
+                "Registry updated: %d added, %d removed, %d modified",
+                len(added), len(removed), len(modified),
+            )
+            self._notify_change(change)
+        return change
+
+    def start_watching(self, tools_dir: Path, debounce: float = 0.25) -> None:
+        """Start watching the tools directory for changes.
+
+        File events are coalesced: changes are applied once no further event
+        has arrived for `debounce` seconds.
+        """
         if self._observer is not None:
             return
 
-        handler = _ToolFileHandler(self, tools_dir)
+        # Imported here so servers that never watch do not pay for watchdog
+        from watchdog.observers import Observer
+
+        from .watcher import ToolFileHandler
+
+        handler = ToolFileHandler(self, debounce)
         self._observer = Observer()
         self._observer.schedule(handler, str(tools_dir), recursive=False)
         self._observer.daemon = True
@@ -99,40 +248,3 @@ class ToolRegistry:
             self._observer.stop()
             self._observer.join(timeout=5)
             self._observer = None
-
-
-class _ToolFileHandler(FileSystemEventHandler):
-    """Watchdog handler that reloads tool definitions on file changes."""
-
-    def __init__(self, registry: ToolRegistry, tools_dir: Path) -> None:
-        self._registry = registry
-        self._tools_dir = tools_dir
-
-    def on_created(self, event: FileSystemEvent) -> None:
-        self._handle(event)
-
-    def on_modified(self, event: FileSystemEvent) -> None:
-        self._handle(event)
-
-    def on_deleted(self, event: FileSystemEvent) -> None:
-        if event.is_directory:
-            return
-        path = Path(str(event.src_path))
-        if path.suffix == ".json":
-            name = path.stem.replace(".", ".")
-            if self._registry.unregister(name):
-                logger.info("Removed tool (file deleted): %s", name)
-                self._registry._notify_change()
-
-    def _handle(self, event: FileSystemEvent) -> None:
-        if event.is_directory:
-            return
-        path = Path(str(event.src_path))
-        if path.suffix != ".json":
-            return
-        try:
-            definition = load_tool_file(path)
-            self._registry.register(definition)
-            self._registry._notify_change()
-        except Exception:
-            logger.exception("Failed to reload tool from %s", path.name)
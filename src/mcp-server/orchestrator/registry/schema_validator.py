@@ -11,7 +11,7 @@ import jsonschema
 
 logger = logging.getLogger(__name__)
 
-_CONTRACTS_DIR = Path(__file__).parent.parent.parent.parent / "contracts"
+_CONTRACTS_DIR = Path(__file__).parent.parent.parent.parent.parent / "contracts"
 
 
 def _load_schema(name: str) -> dict[str, Any]:
@@ -21,6 +21,7 @@ def _load_schema(name: str) -> dict[str, Any]:
 
 
 _tool_definition_schema: dict[str, Any] | None = None
+_tool_definition_validator: jsonschema.Draft202012Validator | None = None
 
 
 def get_tool_definition_schema() -> dict[str, Any]:
@@ -36,9 +37,12 @@ def validate_tool_definition(definition: dict[str, Any]) -> list[str]:
 
     Returns a list of validation error messages (empty if valid).
     """
-    schema = get_tool_definition_schema()
-    validator = jsonschema.Draft202012Validator(schema)
-    return [e.message for e in validator.iter_errors(definition)]
+    global _tool_definition_validator
+    if _tool_definition_validator is None:
+        _tool_definition_validator = jsonschema.Draft202012Validator(
+            get_tool_definition_schema()
+        )
+    return [e.message for e in _tool_definition_validator.iter_errors(definition)]
 
 
 def validate_tool_args(
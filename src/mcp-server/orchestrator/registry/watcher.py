@@ -0,0 +1,67 @@
+"""Watchdog event handler that feeds tool file changes to the registry."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+
+if TYPE_CHECKING:
+    from .registry import ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class ToolFileHandler(FileSystemEventHandler):
+    """Watchdog handler that batches tool file events into one reload."""
+
+    def __init__(self, registry: ToolRegistry, debounce: float) -> None:
+        self._registry = registry
+        self._debounce = debounce
+        self._pending: set[Path] = set()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        self._handle(event)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        self._handle(event)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        self._handle(event)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        self._handle(event)
+        if not event.is_directory:
+            self._add(Path(str(event.dest_path)))
+
+    def _handle(self, event: FileSystemEvent) -> None:
+        if event.is_directory:
+            return
+        self._add(Path(str(event.src_path)))
+
+    def _add(self, path: Path) -> None:
+        if path.suffix != ".json":
+            return
+        with self._lock:
+            self._pending.add(path)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._debounce, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self) -> None:
+        with self._lock:
+            paths, self._pending = self._pending, set()
+            self._timer = None
+        if not paths:
+            return
+        try:
+            self._registry.reload_files(paths)
+        except Exception:
+            logger.exception("Failed to reload %d tool files", len(paths))
@@ -1,33 +1,115 @@
-"""FastMCP entry point with dynamic tool registration."""
+"""FastMCP entry point with dynamic tool registration.
+
+Serves one client over stdio by default. With ``ORCHESTRATOR_TRANSPORT``
+set to ``streamable-http`` or ``sse``, one process serves many concurrent
+MCP sessions that share the registry, caches and Revit connection.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from .config import Config
-from .registry.registry import ToolRegistry
+from .profiling import StartupProfiler
+from .sessions import (
+    FairScheduler,
+    SessionBusyError,
+    SessionTracker,
+    current_session,
+)
+from .registry.catalog_cache import CatalogCache
+from .registry.registry import RegistryChange, ToolRegistry
 from .dispatcher.dispatcher import Dispatcher
 from .dispatcher.result import ToolResult
+from .dispatcher.result_store import ResultStore
+from .adapters.health import AdapterHealthMonitor
+from .adapters.output_capture import CaptureLimits
 from .adapters.revit_addin import RevitAddinAdapter
 from .adapters.pyrevit import PyRevitAdapter
+from .adapters.pyrevit_pool import PyRevitWorkerPool
 from .adapters.dynamo import DynamoAdapter
+from .adapters.dynamo_graphs import GraphIndex
 from .adapters.workflow import WorkflowAdapter
+from .spatial_index import ModelSpatialIndex, set_model_index
+from .traffic import TrafficRecorder
 
 logger = logging.getLogger(__name__)
 
+startup_profile = StartupProfiler()
+
+# Holders of the background services (sessions, plus the HTTP server itself)
+_service_users = 0
+
+
+@asynccontextmanager
+async def _services() -> AsyncIterator[None]:
+    """Start background services for the first user and stop them after the last."""
+    global _service_users
+    _service_users += 1
+    if _service_users == 1:
+        _start_catalog_load()
+        await health_monitor.start()
+    try:
+        yield
+    finally:
+        _service_users -= 1
+        if _service_users == 0:
+            await health_monitor.stop()
+            if pyrevit_pool is not None:
+                await pyrevit_pool.close()
+            if traffic is not None:
+                traffic.close()
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Run background services while an MCP session is open.
+
+    FastMCP enters the lifespan once per session, so over HTTP the services
+    are shared and only stop when the server does (see `_serve_http`).
+    """
+    async with _services():
+        yield
+
+
+class _OrchestratorMCP(FastMCP):
+    """FastMCP that holds tool requests until the catalog has loaded.
+
+    In fast-start mode the handshake is answered while the catalog is still
+    loading in the background; listing or calling tools waits for it.
+    """
+
+    async def list_tools(self) -> list[Any]:
+        await wait_for_catalog()
+        return await super().list_tools()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[Any] | dict[str, Any]:
+        await wait_for_catalog()
+        return await super().call_tool(name, arguments)
+
+
 # Global instances
 config = Config.defaults()
 registry = ToolRegistry()
-mcp = FastMCP("Revit Orchestrator")
+mcp = _OrchestratorMCP("Revit Orchestrator", lifespan=_lifespan)
 
 # Adapters
 revit_adapter = RevitAddinAdapter()
 pyrevit_adapter = PyRevitAdapter()
 dynamo_adapter = DynamoAdapter()
 workflow_adapter = WorkflowAdapter()
+pyrevit_pool: PyRevitWorkerPool | None = None
+graph_index = GraphIndex()
 
 adapters: dict[str, Any] = {
     "revit": revit_adapter,
@@ -36,64 +118,338 @@ adapters: dict[str, Any] = {
     "workflow": workflow_adapter,
 }
 
-dispatcher = Dispatcher(registry, adapters, config.handlers_dir)
+health_monitor = AdapterHealthMonitor(
+    adapters,
+    interval=config.health_probe_interval_seconds,
+    ttl=config.health_ttl_seconds,
+)
+
+dispatcher = Dispatcher(registry, adapters, config.handlers_dir, health=health_monitor)
 
 # Wire up cross-references
 dynamo_adapter.set_revit_adapter(revit_adapter)
+# Dynamo availability follows the Revit connection; drop both cached states
+revit_adapter.on_connection_change(
+    lambda connected: health_monitor.invalidate("revit", "dynamo")
+)
 workflow_adapter.set_dispatcher(dispatcher)
 
+# MCP sessions and, over HTTP, fair scheduling of their tool calls
+sessions = SessionTracker()
+scheduler: FairScheduler | None = None
+
+# Capture log of MCP tool calls. Nothing here opens the pipe yet; whatever
+# creates a PipeServer must pass recorder=traffic to capture pipe messages.
+traffic: TrafficRecorder | None = None
+
+# MCP context of the tool call being handled, for streaming output and progress
+_call_context: ContextVar[Context | None] = ContextVar("_call_context", default=None)
+_pending_notifications: set[asyncio.Task[None]] = set()
+
+
+def _notify_client(send: Callable[[Context], Awaitable[None]]) -> None:
+    """Send a notification to the client of the current tool call, if any."""
+    ctx = _call_context.get()
+    if ctx is None:
+        return
+    task = asyncio.get_running_loop().create_task(send(ctx))
+    _pending_notifications.add(task)
+    task.add_done_callback(_pending_notifications.discard)
+
+
+def _forward_script_output(tool_name: str, stream: str, line: str) -> None:
+    """Send a line of script output to the calling client as a log message."""
+    logger.debug("%s %s: %s", tool_name, stream, line)
+    level = "info" if stream == "stdout" else "warning"
+    _notify_client(lambda ctx: ctx.log(level, line, logger_name=tool_name))
+
+
+def _forward_workflow_progress(
+    tool_name: str, progress: float, total: float | None, message: str
+) -> None:
+    """Report workflow progress to the calling client."""
+    logger.debug("%s progress %s/%s: %s", tool_name, progress, total, message)
+    _notify_client(lambda ctx: ctx.report_progress(progress, total, message))
+
+
+pyrevit_adapter.set_output_listener(_forward_script_output)
+workflow_adapter.set_progress_listener(_forward_workflow_progress)
+
+
+# Names currently registered with FastMCP
+_mcp_tool_names: set[str] = set()
+
+# Background catalog load in fast-start mode
+_catalog_task: asyncio.Task[None] | None = None
+_catalog_loaded = False
+_watching = False
+
 
 def _register_mcp_tools() -> None:
     """Register all tools from the registry as MCP tools."""
     for definition in registry.list_tools():
-        _register_single_tool(definition)
+        if definition["name"] not in _mcp_tool_names:  # a retried load
+            _register_single_tool(definition)
+
+
+def _apply_registry_change(change: RegistryChange) -> None:
+    """Update only the MCP tools touched by a registry change."""
+    for name in change.removed | change.modified:
+        if name in _mcp_tool_names:
+            mcp.remove_tool(name)
+            _mcp_tool_names.discard(name)
+    for name in change.added | change.modified:
+        definition = registry.get(name)
+        if definition is not None:
+            _register_single_tool(definition)
 
 
 def _register_single_tool(definition: dict[str, Any]) -> None:
     """Register a single tool definition as an MCP tool."""
     tool_name = definition["name"]
     description = definition["description"]
-    parameters = definition["parameters"]
 
     # Create the tool function dynamically
-    async def tool_handler(
-        arguments: dict[str, Any],
-        _name: str = tool_name,
-    ) -> dict[str, Any]:
-        result = await dispatcher.dispatch(_name, arguments)
-        return result.to_dict()
+    async def tool_handler(arguments: dict[str, Any], ctx: Context) -> dict[str, Any]:
+        session_id = sessions.session_id(ctx.session)
+        token = current_session.set(session_id)
+        ctx_token = _call_context.set(ctx)
+        if traffic is not None:
+            call_id = traffic.next_call_id()
+            traffic.record("mcp", "call", id=call_id, s=session_id, tool=tool_name, args=arguments)
+            started = time.perf_counter()
+        try:
+            if scheduler is None:
+                result = await dispatcher.dispatch(tool_name, arguments, offload=True)
+            else:
+                async with scheduler.slot(session_id):
+                    result = await dispatcher.dispatch(tool_name, arguments, offload=True)
+        except SessionBusyError as e:
+            result = ToolResult.fail("SESSION_BUSY", str(e))
+        finally:
+            current_session.reset(token)
+            _call_context.reset(ctx_token)
+        response = result.to_dict()
+        if traffic is not None:
+            traffic.record(
+                "mcp", "result",
+                id=call_id,
+                ok=result.success,
+                code=result.error_code,
+                ms=round((time.perf_counter() - started) * 1000, 3),
+                bytes=len(json.dumps(response, default=str)),
+            )
+        return response
 
     # Register with FastMCP
     mcp.tool(
         name=tool_name,
         description=description,
     )(tool_handler)
+    _mcp_tool_names.add(tool_name)
 
     logger.info("Registered MCP tool: %s", tool_name)
 
 
 def init() -> None:
-    """Initialize the server: load tools, start watchers."""
-    global config
-    config = Config.from_env()
+    """Initialize the server: wire adapters, then load tools and start watchers.
 
-    # Load tool definitions
-    registry.load_from_directory(config.tools_dir)
-    _register_mcp_tools()
+    In fast-start mode the catalog is loaded in the background once the
+    server is running instead (see `_start_catalog_load`).
+    """
+    global config, pyrevit_pool, scheduler, traffic
+    with startup_profile.phase("config"):
+        config = Config.from_env()
+    mcp.settings.host = config.http_host
+    mcp.settings.port = config.http_port
+    if config.transport != "stdio":
+        scheduler = FairScheduler(
+            max_concurrent=config.max_concurrent_calls,
+            per_session=config.session_max_concurrent_calls,
+            max_queued_per_session=config.session_max_queued_calls,
+        )
+    if config.capture_path is not None:
+        traffic = TrafficRecorder(config.capture_path)
+    health_monitor.set_schedule(
+        config.health_probe_interval_seconds, config.health_ttl_seconds
+    )
+
+    workflow_adapter.set_state_dir(config.cache_dir / "workflows")
+    pyrevit_adapter.set_capture_limits(
+        CaptureLimits(
+            memory_bytes=config.script_output_memory_kb * 1024,
+            preview_bytes=config.script_output_preview_bytes,
+            spill_dir=config.cache_dir / "script-output",
+            log_ttl_seconds=config.script_output_log_ttl_seconds,
+            log_max_bytes=config.script_output_log_max_mb * 1024 * 1024,
+        )
+    )
+
+    # Large results are kept server-side and paged through results.read
+    dispatcher.set_result_store(
+        ResultStore(
+            inline_bytes=config.result_inline_kb * 1024,
+            memory_bytes=config.result_store_memory_mb * 1024 * 1024,
+            disk_bytes=config.result_store_disk_mb * 1024 * 1024,
+            ttl_seconds=config.result_ttl_seconds,
+            spill_dir=config.cache_dir / "results",
+        )
+        if config.result_inline_kb > 0
+        else None
+    )
+
+    # Dynamo graph metadata for input checks
+    dynamo_adapter.set_graph_index(graph_index)
+
+    # Spatial index for the spatial.* tools, refreshed after model changes
+    model_index = ModelSpatialIndex(dispatcher, cell_size=config.spatial_cell_size_ft)
+    set_model_index(model_index)
+    dispatcher.on_mutation(model_index.on_model_changed)
+
+    # Warm pyRevit workers (started lazily on first script run)
+    if config.pyrevit_pool_size > 0:
+        pyrevit_pool = PyRevitWorkerPool(
+            size=config.pyrevit_pool_size,
+            max_runs=config.pyrevit_worker_max_runs,
+            max_memory_mb=config.pyrevit_worker_max_memory_mb,
+        )
+        pyrevit_adapter.set_worker_pool(pyrevit_pool)
+
+    if config.fast_start:
+        logger.info("Fast start: tool catalog will load in the background")
+        return
+    _load_catalog()
+
+
+def _load_catalog() -> None:
+    """Load tool definitions, register them with MCP and start watching.
+
+    Safe to call again after a failure: tools already registered with MCP
+    are skipped and the watcher is only started once.
+    """
+    global _catalog_loaded, _watching
+    if config.dynamo_graphs_dir is not None:
+        with startup_profile.phase("dynamo graph index"):
+            graph_index.scan(config.dynamo_graphs_dir)
+
+    # Load tool definitions (unchanged files come from the catalog cache)
+    with startup_profile.phase("load catalog"):
+        catalog_cache = (
+            CatalogCache.for_directory(config.tools_dir, config.cache_dir)
+            if config.catalog_cache
+            else None
+        )
+        registry.load_from_directory(config.tools_dir, cache=catalog_cache)
+    with startup_profile.phase("register MCP tools"):
+        _register_mcp_tools()
 
     # Set up hot-reload
-    if config.watch_tools_dir:
-        registry.on_change(_register_mcp_tools)
-        registry.start_watching(config.tools_dir)
+    if config.watch_tools_dir and not _watching:
+        with startup_profile.phase("start watcher"):
+            registry.on_change(_apply_registry_change)
+            _watching = True  # a retried load must not subscribe twice
+            registry.start_watching(config.tools_dir)
 
+    _catalog_loaded = True
     logger.info(
         "Revit Orchestrator MCP server initialized with %d tools",
         len(registry.list_tool_names()),
     )
 
 
+def _start_catalog_load() -> None:
+    """Start loading the catalog on a worker thread if it is still pending."""
+    global _catalog_task
+    if _catalog_loaded or _catalog_task is not None:
+        return
+    _catalog_task = asyncio.create_task(asyncio.to_thread(_load_catalog))
+    _catalog_task.add_done_callback(_catalog_load_done)
+
+
+def _catalog_load_done(task: asyncio.Task[None]) -> None:
+    """Log a failed background load and forget it, so the next request retries."""
+    global _catalog_task
+    if not task.cancelled() and task.exception() is None:
+        return
+    if not task.cancelled():
+        logger.error(
+            "Loading the tool catalog failed; retrying on the next request",
+            exc_info=task.exception(),
+        )
+    if _catalog_task is task:
+        _catalog_task = None
+
+
+async def wait_for_catalog() -> None:
+    """Wait until the tool catalog is loaded, starting the load if needed.
+
+    Raises:
+        Exception: The load failed. The next call starts it again.
+    """
+    _start_catalog_load()
+    if _catalog_task is not None:
+        await asyncio.shield(_catalog_task)
+
+
+def _session_closed(session_id: str) -> None:
+    """Release what an ended MCP session still holds."""
+    if dispatcher.result_store is not None:
+        dispatcher.result_store.discard_session(session_id)
+    if scheduler is not None:
+        scheduler.forget(session_id)
+
+
+sessions.on_close(_session_closed)
+
+
+@mcp.custom_route("/status", methods=["GET"])
+async def status(request: Request) -> JSONResponse:
+    """Report sessions, scheduling and result store state (HTTP transports)."""
+    store = dispatcher.result_store
+    return JSONResponse({
+        "transport": config.transport,
+        "catalog_loaded": _catalog_loaded,
+        "tools": len(registry.list_tool_names()),
+        "sessions": {
+            "active": sessions.active,
+            "opened": sessions.opened,
+            "closed": sessions.closed,
+        },
+        "scheduler": scheduler.stats if scheduler is not None else None,
+        "result_store": store.stats if store is not None else None,
+        "capture": traffic.stats if traffic is not None else None,
+    })
+
+
+async def _serve_http() -> None:
+    """Serve MCP over HTTP, keeping services up between sessions."""
+    logger.info(
+        "Serving MCP over %s at http://%s:%d",
+        config.transport, config.http_host, config.http_port,
+    )
+    async with _services():
+        if config.transport == "sse":
+            await mcp.run_sse_async()
+        else:
+            await mcp.run_streamable_http_async()
+
+
+def main() -> None:
+    """Run the server on the configured transport."""
+    if config.transport == "stdio":
+        mcp.run()
+    elif config.transport in ("streamable-http", "sse"):
+        asyncio.run(_serve_http())
+    else:
+        raise ValueError(
+            f"Unknown ORCHESTRATOR_TRANSPORT {config.transport!r} "
+            "(expected stdio, streamable-http or sse)"
+        )
+
+
 # Initialize on import
-init()
+with startup_profile.phase("init"):
+    init()
 
 if __name__ == "__main__":
-    mcp.run()
+    main()
@@ -0,0 +1,216 @@
+"""MCP session identity and fair scheduling of tool calls across sessions.
+
+Over stdio each MCP client has its own server process. Over HTTP one
+process serves many sessions, and they share the registry, the
+dispatcher's caches and the Revit connection. `SessionTracker` gives each
+MCP session a stable id and runs cleanup callbacks once the session is
+gone. The id of the session a tool call belongs to is kept in the
+`current_session` context variable, so handlers and the result store can
+keep per-session state apart without it being passed through every call.
+
+`FairScheduler` bounds how many tool calls run at once, overall and per
+session. Waiting calls are started round-robin across sessions, so one
+client sending hundreds of calls cannot starve the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = "default"
+
+# Session of the tool call being handled; DEFAULT_SESSION outside MCP calls
+current_session: ContextVar[str] = ContextVar("current_session", default=DEFAULT_SESSION)
+
+
+class SessionBusyError(RuntimeError):
+    """Raised when a session already has too many tool calls queued."""
+
+
+class SessionTracker:
+    """Assigns ids to live MCP sessions and notices when they end.
+
+    Sessions are tracked by their `ServerSession` object. Once it has been
+    garbage collected, the callbacks registered with `on_close` run with
+    the session's id.
+    """
+
+    def __init__(self) -> None:
+        self._ids: weakref.WeakKeyDictionary[Any, str] = weakref.WeakKeyDictionary()
+        self._on_close: list[Callable[[str], None]] = []
+        self.opened = 0
+        self.closed = 0
+
+    @property
+    def active(self) -> int:
+        return len(self._ids)
+
+    def on_close(self, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked with the id of each session that ends."""
+        self._on_close.append(callback)
+
+    def session_id(self, session: Any) -> str:
+        """Return the id of `session`, assigning one on first sight."""
+        session_id = self._ids.get(session)
+        if session_id is None:
+            session_id = f"s-{secrets.token_hex(6)}"
+            self._ids[session] = session_id
+            weakref.finalize(session, self._closed, session_id)
+            self.opened += 1
+            logger.info("MCP session %s opened (%d active)", session_id, len(self._ids))
+        return session_id
+
+    def _closed(self, session_id: str) -> None:
+        self.closed += 1
+        logger.info("MCP session %s closed", session_id)
+        for callback in self._on_close:
+            try:
+                callback(session_id)
+            except Exception:
+                logger.exception("Error in session close callback")
+
+
+@dataclass
+class _SessionState:
+    running: int = 0
+    waiting: deque[asyncio.Future[None]] = field(default_factory=deque)
+    calls: int = 0
+    wait_ms_total: float = 0.0
+
+
+class FairScheduler:
+    """Admits tool calls under global and per-session concurrency limits.
+
+    Args:
+        max_concurrent: Tool calls running at once across all sessions.
+        per_session: Tool calls running at once for one session.
+        max_queued_per_session: Calls a session may have waiting before
+            further calls are rejected with `SessionBusyError`.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        per_session: int = 4,
+        max_queued_per_session: int = 64,
+    ) -> None:
+        self._max_concurrent = max(1, max_concurrent)
+        self._per_session = max(1, per_session)
+        self._max_queued = max_queued_per_session
+        self._running = 0
+        self._sessions: OrderedDict[str, _SessionState] = OrderedDict()  # next in turn first
+        self.rejected = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return running and waiting calls, overall and per session."""
+        return {
+            "running": self._running,
+            "waiting": sum(len(s.waiting) for s in self._sessions.values()),
+            "rejected": self.rejected,
+            "max_concurrent": self._max_concurrent,
+            "per_session": self._per_session,
+            "sessions": {
+                session_id: {
+                    "running": state.running,
+                    "waiting": len(state.waiting),
+                    "calls": state.calls,
+                    "avg_wait_ms": (
+                        round(state.wait_ms_total / state.calls, 2) if state.calls else 0.0
+                    ),
+                }
+                for session_id, state in self._sessions.items()
+            },
+        }
+
+    @asynccontextmanager
+    async def slot(self, session_id: str) -> AsyncIterator[float]:
+        """Hold a slot for one tool call; yields the milliseconds spent waiting."""
+        waited_ms = await self.acquire(session_id)
+        try:
+            yield waited_ms
+        finally:
+            self.release(session_id)
+
+    async def acquire(self, session_id: str) -> float:
+        """Wait for a slot for `session_id`.
+
+        Returns:
+            Milliseconds spent waiting.
+
+        Raises:
+            SessionBusyError: The session's queue is full.
+        """
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionState()
+        start = time.monotonic()
+        if not state.waiting and self._can_run(state):
+            self._start(state)
+        else:
+            if len(state.waiting) >= self._max_queued:
+                self.rejected += 1
+                raise SessionBusyError(
+                    f"Session {session_id} has {len(state.waiting)} tool calls queued"
+                )
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            state.waiting.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release(session_id)  # granted just before the cancel
+                elif future in state.waiting:
+                    state.waiting.remove(future)
+                raise
+        waited_ms = (time.monotonic() - start) * 1000
+        state.calls += 1
+        state.wait_ms_total += waited_ms
+        return waited_ms
+
+    def release(self, session_id: str) -> None:
+        """Free a slot taken by `acquire` and start the next waiting call."""
+        state = self._sessions.get(session_id)
+        if state is not None:
+            state.running -= 1
+        self._running -= 1
+        self._grant()
+
+    def forget(self, session_id: str) -> None:
+        """Drop counters for a session that has ended with nothing in flight."""
+        state = self._sessions.get(session_id)
+        if state is not None and not state.running and not state.waiting:
+            del self._sessions[session_id]
+
+    def _can_run(self, state: _SessionState) -> bool:
+        return self._running < self._max_concurrent and state.running < self._per_session
+
+    def _start(self, state: _SessionState) -> None:
+        state.running += 1
+        self._running += 1
+
+    def _grant(self) -> None:
+        """Start waiting calls, taking sessions in turn."""
+        granted = True
+        while granted and self._running < self._max_concurrent:
+            granted = False
+            for session_id, state in list(self._sessions.items()):
+                while state.waiting and state.waiting[0].done():
+                    state.waiting.popleft()  # cancelled while waiting
+                if state.waiting and state.running < self._per_session:
+                    self._start(state)
+                    state.waiting.popleft().set_result(None)
+                    self._sessions.move_to_end(session_id)  # go to the back of the line
+                    granted = True
+                    break
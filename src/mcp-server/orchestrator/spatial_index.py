@@ -0,0 +1,441 @@
+"""Python-side spatial index of element geometry.
+
+Proximity questions ("which walls are within 2 ft of this point", "what
+intersects this box") used to take a Revit round trip, or many
+``revit.get_element_info`` calls. `SpatialIndex` keeps element bounding
+boxes, and location lines such as wall centerlines, in a uniform grid over
+plan (X, Y). Range, nearest-neighbour and box queries then only look at
+the grid cells around the query.
+
+`ModelSpatialIndex` keeps the index in step with the model. It is filled
+in bulk through ``revit.query_elements``. After a mutating tool succeeds,
+the element ids in its arguments and result are re-read before the next
+query. A change whose elements are unknown, such as a pyRevit script,
+marks the index stale until it is rebuilt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .dispatcher.result import ToolResult
+from .handlers.revit_query_elements import decode_column
+
+if TYPE_CHECKING:
+    from .dispatcher.dispatcher import Dispatcher
+
+logger = logging.getLogger(__name__)
+
+QUERY_TOOL = "revit.query_elements"
+QUERY_FIELDS = ["category", "bounding_box", "location"]
+DEFAULT_CATEGORIES = [
+    "Walls",
+    "Doors",
+    "Windows",
+    "Floors",
+    "Columns",
+    "Structural Columns",
+    "Structural Framing",
+    "Furniture",
+]
+NOT_BUILT_MESSAGE = "The spatial index has not been built; call spatial.build_index first"
+MAX_CELLS_PER_ENTRY = 256  # larger entries are checked by every query instead
+
+# Result keys that name the elements a mutating tool touched
+_ID_KEYS = ("element_id", "element_ids", "created_ids", "modified_ids", "deleted_ids")
+
+Box = tuple[float, float, float, float, float, float]  # min x, y, z, max x, y, z
+Point = tuple[float, float, float]
+
+
+@dataclass(slots=True)
+class SpatialEntry:
+    """One indexed element."""
+
+    element_id: int
+    category: str | None
+    box: Box
+    segment: Box | None = None  # location line: start x, y, z, end x, y, z
+
+    def distance(self, point: Point) -> float:
+        """Distance from `point` to the element.
+
+        Elements with a location line are treated as a vertical band along
+        the line in plan, spanning the box's height. Others use the box.
+        """
+        x, y, z = point
+        x0, y0, z0, x1, y1, z1 = self.box
+        dz = max(z0 - z, 0.0, z - z1)
+        if self.segment is None:
+            dx = max(x0 - x, 0.0, x - x1)
+            dy = max(y0 - y, 0.0, y - y1)
+            return math.sqrt(dx * dx + dy * dy + dz * dz)
+        sx, sy, _, ex, ey, _ = self.segment
+        vx, vy = ex - sx, ey - sy
+        length2 = vx * vx + vy * vy
+        t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((x - sx) * vx + (y - sy) * vy) / length2))
+        dx = x - (sx + t * vx)
+        dy = y - (sy + t * vy)
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def intersects(self, box: Box) -> bool:
+        a = self.box
+        return (
+            a[0] <= box[3] and box[0] <= a[3]
+            and a[1] <= box[4] and box[1] <= a[4]
+            and a[2] <= box[5] and box[2] <= a[5]
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "element_id": self.element_id,
+            "category": self.category,
+            "bounding_box": list(self.box),
+        }
+        if self.segment is not None:
+            data["location_line"] = list(self.segment)
+        return data
+
+
+class SpatialIndex:
+    """Uniform plan grid of element boxes.
+
+    Args:
+        cell_size: Grid cell edge in feet. Queries look at every cell their
+            search box overlaps, so it should be near the typical query
+            radius and element size.
+    """
+
+    def __init__(self, cell_size: float = 10.0) -> None:
+        self._cell = cell_size
+        self._entries: dict[int, SpatialEntry] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._large: set[int] = set()
+        self._bounds: Box | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "elements": len(self._entries),
+            "cells": len(self._cells),
+            "large_elements": len(self._large),
+            "cell_size": self._cell,
+            "bounds": list(self._bounds) if self._bounds is not None else None,
+        }
+
+    def get(self, element_id: int) -> SpatialEntry | None:
+        return self._entries.get(element_id)
+
+    def insert(self, entry: SpatialEntry) -> None:
+        """Add an element, replacing any previous entry for its id."""
+        self.remove(entry.element_id)
+        self._entries[entry.element_id] = entry
+        cells = self._cell_range(entry.box)
+        if len(cells[0]) * len(cells[1]) > MAX_CELLS_PER_ENTRY:
+            self._large.add(entry.element_id)
+        else:
+            for key in _keys(cells):
+                self._cells.setdefault(key, set()).add(entry.element_id)
+        b = self._bounds
+        e = entry.box
+        self._bounds = e if b is None else (
+            min(b[0], e[0]), min(b[1], e[1]), min(b[2], e[2]),
+            max(b[3], e[3]), max(b[4], e[4]), max(b[5], e[5]),
+        )
+
+    def remove(self, element_id: int) -> bool:
+        entry = self._entries.pop(element_id, None)
+        if entry is None:
+            return False
+        if element_id in self._large:
+            self._large.discard(element_id)
+            return True
+        for key in _keys(self._cell_range(entry.box)):
+            ids = self._cells.get(key)
+            if ids is not None:
+                ids.discard(element_id)
+                if not ids:
+                    del self._cells[key]
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._cells.clear()
+        self._large.clear()
+        self._bounds = None
+
+    def nearby(
+        self, point: Point, radius: float, categories: set[str] | None = None
+    ) -> list[tuple[float, SpatialEntry]]:
+        """Elements within `radius` of `point`, nearest first."""
+        x, y, z = point
+        search = (x - radius, y - radius, z - radius, x + radius, y + radius, z + radius)
+        found = []
+        for entry in self._candidates(search, categories):
+            distance = entry.distance(point)
+            if distance <= radius:
+                found.append((distance, entry))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(
+        self,
+        point: Point,
+        k: int = 1,
+        categories: set[str] | None = None,
+        max_distance: float | None = None,
+    ) -> list[tuple[float, SpatialEntry]]:
+        """The `k` elements nearest to `point`, nearest first.
+
+        Searches a growing radius, so only cells near the point are visited
+        unless matching elements are sparse.
+        """
+        if self._bounds is None:
+            return []
+        # No element is farther than the far corner of the indexed bounds
+        x, y, z = point
+        b = self._bounds
+        farthest = math.sqrt(
+            max(abs(x - b[0]), abs(x - b[3])) ** 2
+            + max(abs(y - b[1]), abs(y - b[4])) ** 2
+            + max(abs(z - b[2]), abs(z - b[5])) ** 2
+        )
+        limit = farthest if max_distance is None else min(max_distance, farthest)
+        radius = min(self._cell, limit)
+        while True:
+            found = self.nearby(point, radius, categories)
+            if len(found) >= k or radius >= limit:
+                return found[:k]
+            radius = min(radius * 2, limit)
+
+    def intersecting(
+        self, box: Box, categories: set[str] | None = None
+    ) -> list[SpatialEntry]:
+        """Elements whose bounding box overlaps `box`, by element id."""
+        found = [e for e in self._candidates(box, categories) if e.intersects(box)]
+        found.sort(key=lambda e: e.element_id)
+        return found
+
+    def _cell_range(self, box: Box) -> tuple[range, range]:
+        c = self._cell
+        return (
+            range(math.floor(box[0] / c), math.floor(box[3] / c) + 1),
+            range(math.floor(box[1] / c), math.floor(box[4] / c) + 1),
+        )
+
+    def _candidates(
+        self, box: Box, categories: set[str] | None
+    ) -> Iterable[SpatialEntry]:
+        xs, ys = self._cell_range(box)
+        ids: set[int] = set(self._large)
+        if len(xs) * len(ys) > len(self._cells):
+            # A search wider than the occupied grid: walk the occupied cells
+            for (ix, iy), cell in self._cells.items():
+                if ix in xs and iy in ys:
+                    ids.update(cell)
+        else:
+            for key in _keys((xs, ys)):
+                cell = self._cells.get(key)
+                if cell is not None:
+                    ids.update(cell)
+        entries = (self._entries[i] for i in ids)
+        if categories is None:
+            return entries
+        return (e for e in entries if e.category is not None and e.category.lower() in categories)
+
+
+def _keys(cells: tuple[range, range]) -> Iterable[tuple[int, int]]:
+    xs, ys = cells
+    return ((ix, iy) for ix in xs for iy in ys)
+
+
+def category_filter(categories: list[str] | None) -> set[str] | None:
+    """Normalize a tool's category argument for the query methods."""
+    return {c.lower() for c in categories} if categories else None
+
+
+class ModelSpatialIndex:
+    """A `SpatialIndex` of the model, kept current through the dispatcher.
+
+    Register `on_model_changed` with `Dispatcher.on_mutation`. Call `sync`
+    before answering a query so pending changes are applied.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, cell_size: float = 10.0) -> None:
+        self.index = SpatialIndex(cell_size)
+        self._dispatcher = dispatcher
+        self._categories: set[str] = set()
+        self._any_category = False  # built with built-in (OST_) category names
+        self._pending: set[int] = set()
+        self._stale: str | None = None
+        self._lock = asyncio.Lock()
+        self.built_at: float | None = None
+        self.refreshed = 0
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    @property
+    def stale(self) -> str | None:
+        """Why the index may be out of date, or None."""
+        return self._stale
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.index.stats,
+            "categories": sorted(self._categories),
+            "built_seconds_ago": (
+                round(time.time() - self.built_at, 1) if self.built_at is not None else None
+            ),
+            "pending": len(self._pending),
+            "refreshed": self.refreshed,
+            "stale": self._stale,
+        }
+
+    async def build(self, categories: list[str]) -> ToolResult:
+        """Replace the index with every element in `categories`."""
+        async with self._lock:
+            result = await self._dispatcher.dispatch(
+                QUERY_TOOL, {"categories": categories, "fields": QUERY_FIELDS}
+            )
+            if not result.success:
+                return result
+            self.index.clear()
+            self._pending.clear()
+            self._stale = None
+            self._categories = {c.lower() for c in categories}
+            self._any_category = any(c.startswith("OST_") for c in categories)
+            loaded = self._load(result.data)
+            self.built_at = time.time()
+        logger.info("Spatial index built: %d elements in %s", loaded, ", ".join(categories))
+        return ToolResult.ok({"indexed": loaded, "without_geometry": result.data["count"] - loaded})
+
+    async def sync(self) -> None:
+        """Re-read elements changed since the last query."""
+        if not self._pending:
+            return
+        async with self._lock:
+            ids, self._pending = sorted(self._pending), set()
+            if not ids:
+                return
+            result = await self._dispatcher.dispatch(
+                QUERY_TOOL, {"element_ids": ids, "fields": QUERY_FIELDS}
+            )
+            if not result.success:
+                self._stale = f"could not re-read changed elements: {result.error_message}"
+                return
+            for element_id in result.data.get("missing_ids", []):
+                self.index.remove(element_id)
+            self._load(result.data, only_indexed_categories=True)
+            self.refreshed += len(ids)
+
+    def on_model_changed(
+        self, tool_name: str, args: dict[str, Any], result: ToolResult
+    ) -> None:
+        """Dispatcher mutation callback: queue touched elements for refresh."""
+        if not self.built:
+            return
+        definition = self._dispatcher.registry.get(tool_name)
+        if definition is not None and definition["adapter"] == "workflow":
+            return  # its sub-calls report their own changes
+        ids = _touched_ids(args) | _touched_ids(result.data)
+        if ids:
+            self._pending |= ids
+        elif self._stale is None:
+            self._stale = f"{tool_name} changed the model; rebuild with spatial.build_index"
+
+    def _load(self, data: dict[str, Any], only_indexed_categories: bool = False) -> int:
+        columns = data["columns"]
+        ids = decode_column(columns["element_id"])
+        categories = decode_column(columns.get("category", [None] * len(ids)))
+        boxes = decode_column(columns.get("bounding_box", [None] * len(ids)))
+        locations = decode_column(columns.get("location", [None] * len(ids)))
+        loaded = 0
+        for element_id, category, box, location in zip(ids, categories, boxes, locations):
+            if only_indexed_categories and not self._indexes(category):
+                continue
+            if box is None:
+                self.index.remove(element_id)  # no geometry to index
+                continue
+            segment = tuple(location) if location is not None and len(location) == 6 else None
+            self.index.insert(SpatialEntry(element_id, category, tuple(box), segment))
+            loaded += 1
+        return loaded
+
+    def _indexes(self, category: str | None) -> bool:
+        return self._any_category or (
+            category is not None and category.lower() in self._categories
+        )
+
+
+def _touched_ids(data: dict[str, Any] | None) -> set[int]:
+    ids: set[int] = set()
+    for key in _ID_KEYS:
+        value = (data or {}).get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            ids.add(value)
+        elif isinstance(value, list):
+            ids.update(v for v in value if isinstance(v, int) and not isinstance(v, bool))
+    return ids
+
+
+_model_index: ModelSpatialIndex | None = None
+
+
+def get_model_index() -> ModelSpatialIndex | None:
+    """Return the server's model index, if one has been set up."""
+    return _model_index
+
+
+def set_model_index(index: ModelSpatialIndex | None) -> None:
+    global _model_index
+    _model_index = index
+
+
+async def synced_model_index() -> ModelSpatialIndex | None:
+    """Return the model index with pending changes applied, or None if unbuilt."""
+    index = _model_index
+    if index is None or not index.built:
+        return None
+    await index.sync()
+    return index
+
+
+def query_response(
+    index: ModelSpatialIndex,
+    found: list[tuple[float | None, SpatialEntry]],
+    limit: int,
+    started: float,
+) -> dict[str, Any]:
+    """Format query matches for a spatial.find_* tool result."""
+    elements = []
+    for distance, entry in found[:limit]:
+        element = entry.as_dict()
+        if distance is not None:
+            element["distance"] = round(distance, 4)
+        elements.append(element)
+    data: dict[str, Any] = {
+        "elements": elements,
+        "count": len(elements),
+        "query_us": round((time.perf_counter() - started) * 1_000_000, 1),
+    }
+    if len(found) > limit:
+        data["truncated"] = True
+        data["total"] = len(found)
+    if index.stale is not None:
+        data["stale"] = index.stale
+    return data
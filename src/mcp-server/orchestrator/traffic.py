@@ -0,0 +1,212 @@
+"""Traffic capture for load replay.
+
+With ``ORCHESTRATOR_CAPTURE`` set, the server records every MCP tool call
+to a capture log. Named pipe messages are recorded by a `PipeServer` (or
+`PipeConnection`) created with ``recorder=``; the server does not open the
+pipe itself yet, so its captures hold MCP calls only. `benchmarks/replay.py` reads
+the log and plays the calls back against the dispatcher or a pipe endpoint
+at the original pace, faster, or as fast as possible.
+
+The log is JSON lines, gzip-compressed when the path ends in ``.gz``. Each
+server start appends a header line, then one short record per message:
+
+    {"capture": 1, "started": "2026-10-19T08:00:00+00:00", "pid": 4242}
+    {"t": 0.0132, "src": "mcp", "ev": "call", "id": 1, "s": "s-1a2b", "tool": "revit.get_element_info", "args": {...}}
+    {"t": 0.0811, "src": "mcp", "ev": "result", "id": 1, "ok": true, "ms": 67.9, "bytes": 412}
+    {"t": 0.0140, "src": "pipe", "ev": "out", "type": "tool_call", "id": "…", "tool": "...", "args": {...}, "bytes": 160}
+    {"t": 0.0805, "src": "pipe", "ev": "in", "type": "tool_result", "call": "…", "ok": true, "ms": 65, "bytes": 388}
+
+``t`` is seconds since the header. Result data is not kept, only its size
+and error code, so logs stay small and do not hold model content beyond
+the call arguments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import itertools
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+FLUSH_INTERVAL_SECONDS = 1.0
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficRecorder:
+    """Appends timestamped message records to a capture log.
+
+    Recording is synchronous and buffered: each record is one short JSON
+    line. Buffered records are flushed within a second, so a server that is
+    killed rather than shut down loses at most the last second of traffic.
+
+    Args:
+        path: Log file; appended to if it exists. A ``.gz`` suffix
+            compresses it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = _open(path, "a")
+        self._origin = time.perf_counter()
+        self._flush_scheduled = False
+        self._ids = itertools.count(1)
+        self._records = 0
+        self._write({
+            "capture": FORMAT_VERSION,
+            "started": datetime.now(timezone.utc).isoformat(),
+            "pid": os.getpid(),
+        })
+        logger.info("Capturing traffic to %s", path)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {"path": str(self.path), "records": self._records}
+
+    def next_call_id(self) -> int:
+        """Return an id that pairs an MCP call record with its result."""
+        return next(self._ids)
+
+    def record(self, src: str, event: str, **fields: Any) -> None:
+        """Append one record stamped with the time since the capture started."""
+        if self._file is None:
+            return
+        now = time.perf_counter()
+        entry = {"t": round(now - self._origin, 6), "src": src, "ev": event}
+        entry.update((k, v) for k, v in fields.items() if v is not None)
+        self._write(entry)
+        self._records += 1
+        if not self._flush_scheduled:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            loop.call_later(FLUSH_INTERVAL_SECONDS, self.flush)
+            self._flush_scheduled = True
+
+    def flush(self) -> None:
+        self._flush_scheduled = False
+        if self._file is not None:
+            self._file.flush()
+
+    def record_pipe(self, direction: str, message: dict[str, Any], size: int) -> None:
+        """Record a framed pipe message sent ("out") or received ("in")."""
+        payload = message.get("payload") or {}
+        msg_type = message.get("type")
+        fields: dict[str, Any] = {"type": msg_type, "bytes": size}
+        if msg_type == "tool_call":
+            fields.update(id=message.get("id"), tool=payload.get("tool_name"), args=payload.get("args"))
+        elif msg_type in ("tool_result", "error"):
+            fields["call"] = payload.get("call_id")
+            if msg_type == "tool_result":
+                fields.update(ok=payload.get("success"), ms=payload.get("duration_ms"))
+                error = payload.get("error") or {}
+                fields["code"] = error.get("code")
+            else:
+                fields.update(ok=False, code=payload.get("code"))
+        self.record("pipe", direction, **fields)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        assert self._file is not None
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str))
+        self._file.write("\n")
+
+
+@dataclass
+class CapturedCall:
+    """One call read back from a capture log."""
+
+    at: float  # seconds since the start of the capture
+    tool: str
+    args: dict[str, Any]
+    session: str | None = None
+    ok: bool | None = None  # outcome and latency when the call was captured
+    ms: float | None = None
+    code: str | None = None
+
+
+def read_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield a capture log's records with ``t`` made continuous.
+
+    Captures appended by later server starts are placed one after another,
+    so their timestamps keep increasing across the whole file.
+    """
+    base = 0.0
+    last = 0.0
+    with _open(path, "r") as f:
+        line_no = 0
+        try:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A capture cut off mid-write ends with a partial line
+                    logger.warning("Skipping unreadable line %d of %s", line_no, path)
+                    continue
+                if "capture" in entry:
+                    base = last
+                    continue
+                entry["t"] = base + entry["t"]
+                last = entry["t"]
+                yield entry
+        except EOFError:
+            # gzip stream of a server that was killed before closing the log
+            logger.warning("%s ends after line %d without closing", path, line_no)
+
+
+def load_calls(path: Path, source: str = "mcp") -> list[CapturedCall]:
+    """Read the calls made through `source` ("mcp" or "pipe"), in time order."""
+    calls: list[CapturedCall] = []
+    pending: dict[Any, CapturedCall] = {}
+    request_event, result_event, result_key = (
+        ("call", "result", "id") if source == "mcp" else ("out", "in", "call")
+    )
+    for entry in read_records(path):
+        if entry.get("src") != source:
+            continue
+        event = entry.get("ev")
+        if event == request_event and "tool" in entry:
+            call = CapturedCall(
+                at=entry["t"],
+                tool=entry["tool"],
+                args=entry.get("args") or {},
+                session=entry.get("s"),
+            )
+            calls.append(call)
+            pending[entry.get("id")] = call
+        elif event == result_event:
+            call = pending.pop(entry.get(result_key), None)
+            if call is not None:
+                call.ok = entry.get("ok")
+                call.code = entry.get("code")
+                # Pipe results carry the add-in's own time; use the round trip
+                call.ms = (
+                    entry.get("ms") if source == "mcp"
+                    else round((entry["t"] - call.at) * 1000, 3)
+                )
+    calls.sort(key=lambda c: c.at)
+    return calls
@@ -0,0 +1,166 @@
+"""Tests for tool call ordering and stop conditions of the agent loop."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from orchestrator.dispatcher.result import ToolResult
+from orchestrator.llm.agent import ToolScheduler
+from orchestrator.llm.base import LLMResponse, LLMToolCall, Message
+from orchestrator.llm.ledger import UsageBudget, UsageLedger
+from orchestrator.llm.router import LLMRouter
+from orchestrator.llm.stand_in import StandInProvider, StandInProviderError
+from orchestrator.registry.registry import ToolRegistry
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "orchestrator" / "tools"
+READ = "revit.get_element_info"  # read_only: true
+WRITE = "revit.create_wall"
+
+REGISTRY = ToolRegistry()
+REGISTRY.load_from_directory(TOOLS_DIR)
+
+
+class RecordingDispatcher:
+    """Stands in for `Dispatcher`, logging when each call starts and ends.
+
+    A call sleeps for its ``delay`` argument, and raises if ``fail`` is set.
+    """
+
+    def __init__(self) -> None:
+        self.log: list[tuple[str, str]] = []
+
+    async def dispatch(self, tool_name, args, offload=False):
+        tag = args["tag"]
+        self.log.append(("start", tag))
+        try:
+            await asyncio.sleep(args.get("delay", 0))
+        except asyncio.CancelledError:
+            self.log.append(("cancelled", tag))
+            raise
+        self.log.append(("end", tag))
+        if args.get("fail"):
+            raise RuntimeError(f"{tag} blew up")
+        return ToolResult.ok({"tag": tag})
+
+
+def call(name: str, tag: str, **args) -> LLMToolCall:
+    return LLMToolCall(id=f"id-{tag}", name=name, arguments={"tag": tag, **args})
+
+
+def tool_calls_turn(*calls: LLMToolCall) -> LLMResponse:
+    return LLMResponse(content="", tool_calls=list(calls), usage={"input_tokens": 10})
+
+
+async def test_reads_overlap_and_writes_are_barriers():
+    dispatcher = RecordingDispatcher()
+    scheduler = ToolScheduler(dispatcher, REGISTRY)
+    calls = [
+        call(READ, "r1", delay=0.05),
+        call(READ, "r2"),
+        call(WRITE, "w", delay=0.01),
+        call(READ, "r3"),
+        call(READ, "r4", fail=True),
+    ]
+    for tool_call in calls:
+        scheduler.submit(tool_call)
+    results = await scheduler.results()
+
+    assert dispatcher.log == [
+        ("start", "r1"), ("start", "r2"), ("end", "r2"), ("end", "r1"),
+        ("start", "w"), ("end", "w"),
+        ("start", "r3"), ("start", "r4"), ("end", "r3"), ("end", "r4"),
+    ]
+    # Results come back in call order, whatever order the calls finished in
+    assert [m.tool_call_id for m in results] == [c.id for c in calls]
+    assert json.loads(results[0].content)["data"] == {"tag": "r1"}
+    assert [r.read_only for r in scheduler.records] == [True, True, False, True, True]
+    assert scheduler.records[4].error_code == "HANDLER_ERROR"
+
+
+async def test_write_waits_for_every_earlier_call():
+    dispatcher = RecordingDispatcher()
+    scheduler = ToolScheduler(dispatcher, REGISTRY)
+    calls = [call(WRITE, "w1", delay=0.02), call(READ, "r", delay=0.02), call(WRITE, "w2")]
+    for tool_call in calls:
+        scheduler.submit(tool_call)
+    await scheduler.results()
+
+    assert [tag for event, tag in dispatcher.log if event == "start"] == ["w1", "r", "w2"]
+    assert dispatcher.log.index(("start", "w2")) > dispatcher.log.index(("end", "r"))
+
+
+async def test_run_feeds_results_back_until_end_turn():
+    provider = StandInProvider(responses=[
+        tool_calls_turn(call(READ, "r1", delay=0.01), call(READ, "r2")),
+        LLMResponse(content="Both walls found"),
+    ])
+    router = LLMRouter(provider, REGISTRY)
+    result = await router.run(
+        [Message(role="user", content="Find the walls")], RecordingDispatcher()
+    )
+
+    assert result.stop_reason == "end_turn"
+    assert result.response.content == "Both walls found"
+    assert [m.role for m in result.messages] == ["user", "assistant", "tool", "tool", "assistant"]
+    assert [m.tool_call_id for m in result.messages[2:4]] == ["id-r1", "id-r2"]
+    assert [len(step.tool_calls) for step in result.steps] == [2, 0]
+
+
+async def test_run_stops_at_max_steps():
+    provider = StandInProvider(responses=[tool_calls_turn(call(READ, "r"))])
+    router = LLMRouter(provider, REGISTRY)
+    result = await router.run(
+        [Message(role="user", content="Loop")], RecordingDispatcher(), max_steps=3
+    )
+    assert result.stop_reason == "max_steps"
+    assert len(result.steps) == 3 and provider.calls == 3
+
+
+async def test_run_stops_when_time_budget_is_spent():
+    provider = StandInProvider(responses=[tool_calls_turn(call(READ, "r"))], latency_seconds=0.03)
+    router = LLMRouter(provider, REGISTRY)
+    result = await router.run(
+        [Message(role="user", content="Loop")], RecordingDispatcher(), time_budget_seconds=0.02
+    )
+    # The turn that started still completes its tool calls
+    assert result.stop_reason == "time_budget"
+    assert len(result.steps) == 1 and result.messages[-1].role == "tool"
+
+
+async def test_run_stops_when_session_budget_is_used():
+    provider = StandInProvider(responses=[tool_calls_turn(call(READ, "r"))])
+    router = LLMRouter(provider, REGISTRY, ledger=UsageLedger(UsageBudget(max_requests=2)))
+    result = await router.run(
+        [Message(role="user", content="Loop")], RecordingDispatcher(), session_id="s1"
+    )
+    assert result.stop_reason == "budget"
+    assert len(result.steps) == 2
+    assert router.ledger.session("s1")["by_tool"][READ]["calls"] == 2
+
+
+class DroppedStream(StandInProvider):
+    """Loses the connection right after streaming the first tool call."""
+
+    async def stream(self, messages, tools=None, temperature=0.0):
+        async for event in super().stream(messages, tools=tools, temperature=temperature):
+            yield event
+            if event.type == "tool_call":
+                await asyncio.sleep(0.01)  # the call has started by now
+                raise StandInProviderError("connection dropped")
+
+
+async def test_stream_error_cancels_dispatched_calls():
+    provider = DroppedStream(
+        responses=[tool_calls_turn(call(READ, "slow", delay=5), call(READ, "next"))]
+    )
+    router = LLMRouter(provider, REGISTRY)
+    dispatcher = RecordingDispatcher()
+
+    with pytest.raises(StandInProviderError):
+        await router.run([Message(role="user", content="Go")], dispatcher)
+
+    assert dispatcher.log == [("start", "slow"), ("cancelled", "slow")]
@@ -0,0 +1,31 @@
+"""Tests for the catalog cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from orchestrator.registry.catalog_cache import CatalogCache, load_catalog
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "orchestrator" / "tools"
+
+
+def test_cold_load_then_cache_hits(tmp_path):
+    template = json.loads((TOOLS_DIR / "revit.get_element_info.json").read_text(encoding="utf-8"))
+    tools_dir = tmp_path / "tools"
+    tools_dir.mkdir()
+    count = 70
+    for i in range(count):
+        (tools_dir / f"t{i}.json").write_text(
+            json.dumps({**template, "name": f"revit.t{i}"}), encoding="utf-8"
+        )
+    (tools_dir / "broken.json").write_text("{", encoding="utf-8")
+    cache_path = tmp_path / "catalog.json"
+
+    first = load_catalog(tools_dir, cache=CatalogCache(cache_path))
+    assert (first.misses, first.hits, first.invalid) == (count, 0, 1)
+    assert {d["name"] for d in first.definitions.values()} == {f"revit.t{i}" for i in range(count)}
+
+    second = load_catalog(tools_dir, cache=CatalogCache(cache_path))
+    assert (second.misses, second.hits) == (0, count)
+    assert second.definitions == first.definitions
@@ -0,0 +1,53 @@
+"""Tests for token-budgeted conversation compaction."""
+
+from __future__ import annotations
+
+import json
+
+from orchestrator.llm.base import LLMToolCall, Message
+from orchestrator.llm.compaction import ConversationCompactor, estimate_tokens
+
+
+def _agent_run(steps: int, result_bytes: int) -> list[Message]:
+    """One user prompt followed by `steps` tool calls, each with a large result."""
+    messages = [Message(role="user", content="Tag every door on level 1")]
+    for i in range(steps):
+        call = LLMToolCall(id=f"call-{i}", name="revit.get_element_info", arguments={"element_id": i})
+        messages.append(Message(role="assistant", content="", tool_calls=[call]))
+        body = json.dumps({"success": True, "data": {"blob": "x" * result_bytes}})
+        messages.append(Message(role="tool", content=body, tool_call_id=call.id))
+    return messages
+
+
+def test_single_prompt_agent_run_is_compacted():
+    messages = _agent_run(30, 20_000)
+    compacted, report = ConversationCompactor(budget_tokens=20_000).compact(messages)
+
+    assert report.tokens_before > 150_000
+    assert report.tokens_after <= 20_000
+    assert report.tokens_after == sum(estimate_tokens(m) for m in compacted)
+    assert report.dropped == 0
+    # The prompt, every tool call and the latest results survive as sent
+    assert compacted[0] == messages[0]
+    assert [m.tool_call_id for m in compacted if m.role == "tool"] == [f"call-{i}" for i in range(30)]
+    assert compacted[-4:] == messages[-4:]
+    assert "success" in compacted[2].content
+
+
+def test_chat_drops_oldest_user_turns_and_keeps_pinned():
+    messages = []
+    for i in range(10):
+        messages.append(Message(role="user", content=f"question {i} " + "q" * 4000, pinned=i == 1))
+        messages.append(Message(role="assistant", content=f"answer {i} " + "a" * 4000))
+    compacted, report = ConversationCompactor(budget_tokens=10_000).compact(messages)
+
+    assert report.tokens_after <= 10_000 and report.dropped > 0
+    assert compacted[0].role == "user"
+    assert messages[2] in compacted  # pinned turn kept
+    assert compacted[-2:] == messages[-2:]
+
+
+def test_under_budget_is_unchanged():
+    messages = _agent_run(2, 100)
+    compacted, report = ConversationCompactor(budget_tokens=10_000).compact(messages)
+    assert compacted == messages and report.tokens_saved == 0
@@ -0,0 +1,48 @@
+"""Tests for Dynamo graph indexing and input checks."""
+
+from __future__ import annotations
+
+import json
+import os
+
+from orchestrator.adapters.dynamo_graphs import GraphIndex
+from orchestrator.handlers import dynamo_run_graph
+
+
+def _write_graph(path, inputs):
+    graph = {"Inputs": [{"Id": str(i), "Name": name} for i, name in enumerate(inputs)], "Outputs": []}
+    path.write_text(json.dumps(graph), encoding="utf-8")
+    return str(path)
+
+
+async def test_unreadable_graph_is_passed_on(tmp_path):
+    missing = str(tmp_path / "on-revit-machine.dyn")
+    result = await dynamo_run_graph.execute(
+        {"graph_path": missing, "inputs": {"Level": 1}},
+        index=GraphIndex(),
+    )
+    assert result.success
+    assert result.data["graph_path"] == missing
+
+
+async def test_unknown_input_is_rejected(tmp_path):
+    graph = _write_graph(tmp_path / "g.dyn", ["Level"])
+    result = await dynamo_run_graph.execute(
+        {"graph_path": graph, "inputs": {"Levle": 1}}, index=GraphIndex()
+    )
+    assert not result.success
+    assert result.error_code == "SCHEMA_VALIDATION_FAILED"
+    assert "did you mean 'Level'" in result.error_message
+
+
+def test_index_reparses_only_changed_contents(tmp_path):
+    graph = _write_graph(tmp_path / "g.dyn", ["Level"])
+    index = GraphIndex()
+    first = index.get(graph)
+
+    stat = os.stat(graph)
+    os.utime(graph, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert index.get(graph) is first  # touched, same contents
+
+    _write_graph(tmp_path / "g.dyn", ["Level", "Offset"])
+    assert sorted(index.get(graph).inputs) == ["Level", "Offset"]
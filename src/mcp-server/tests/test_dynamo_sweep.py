@@ -0,0 +1,48 @@
+"""Tests for Dynamo parameter sweeps run through the workflow adapter."""
+
+from __future__ import annotations
+
+from orchestrator.adapters.workflow import WorkflowAdapter
+from orchestrator.dispatcher.result import ToolResult
+from orchestrator.handlers import flow_sweep_dynamo_graph
+
+
+class _Dispatcher:
+    def __init__(self, fail_widths=()):
+        self.calls = []
+        self.fail_widths = set(fail_widths)
+
+    async def dispatch(self, tool_name, args, **kwargs):
+        self.calls.append(args["inputs"])
+        if args["inputs"]["Width"] in self.fail_widths:
+            return ToolResult.fail("DYNAMO_EXECUTION_ERROR", "boom")
+        return ToolResult.ok({"area": args["inputs"]["Width"] * 2})
+
+
+async def test_sweep_streams_progress_and_resumes(tmp_path):
+    dispatcher = _Dispatcher(fail_widths={3})
+    adapter = WorkflowAdapter()
+    adapter.set_dispatcher(dispatcher)
+    adapter.set_state_dir(tmp_path)
+    progress = []
+    adapter.set_progress_listener(lambda tool, done, total, msg: progress.append((tool, done, total)))
+    args = {"graph_path": "g.dyn", "grid": {"Width": [1, 2, 3]}, "max_in_flight": 2}
+
+    result = await adapter.execute("flow.sweep_dynamo_graph", args, flow_sweep_dynamo_graph)
+
+    assert result.success
+    assert (result.data["succeeded"], result.data["failed"]) == (2, 1)
+    assert sorted(done for _, done, _ in progress) == [1, 2, 3]
+    assert all(tool == "flow.sweep_dynamo_graph" and total == 3 for tool, _, total in progress)
+    state_path = tmp_path / "sweeps" / f"{result.data['sweep_id']}.jsonl"
+    assert result.data["state_path"] == str(state_path) and state_path.exists()
+
+    dispatcher.fail_widths.clear()
+    dispatcher.calls.clear()
+    resumed = await adapter.execute(
+        "flow.sweep_dynamo_graph",
+        {**args, "sweep_id": result.data["sweep_id"]},
+        flow_sweep_dynamo_graph,
+    )
+    assert dispatcher.calls == [{"Width": 3}]
+    assert (resumed.data["succeeded"], resumed.data["resumed"]) == (3, 2)
@@ -0,0 +1,33 @@
+"""Tests for loading the tool catalog in the background (fast start)."""
+
+from __future__ import annotations
+
+import importlib
+
+import pytest
+
+
+async def test_failed_background_load_is_retried(monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_FAST_START", "true")
+    server = importlib.import_module("orchestrator.server")
+    monkeypatch.setattr(server, "_catalog_loaded", False)
+    monkeypatch.setattr(server, "_catalog_task", None)
+
+    attempts = []
+
+    def load() -> None:
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise OSError("tools directory is not mounted yet")
+        server._catalog_loaded = True
+
+    monkeypatch.setattr(server, "_load_catalog", load)
+
+    with pytest.raises(OSError):
+        await server.wait_for_catalog()
+    assert server._catalog_task is None
+
+    await server.wait_for_catalog()
+    assert attempts == [0, 1] and server._catalog_loaded
+    await server.wait_for_catalog()
+    assert len(attempts) == 2
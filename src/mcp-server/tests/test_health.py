@@ -0,0 +1,21 @@
+"""Tests for adapter health caching."""
+
+from __future__ import annotations
+
+from orchestrator.adapters.health import AdapterHealthMonitor
+from orchestrator.adapters.revit_addin import RevitAddinAdapter
+
+
+async def test_connecting_addin_clears_cached_unavailable_state():
+    revit = RevitAddinAdapter()
+    monitor = AdapterHealthMonitor({"revit": revit}, ttl=60.0)
+    revit.on_connection_change(lambda connected: monitor.invalidate("revit"))
+
+    await monitor.probe("revit")
+    assert monitor.is_available("revit") is False
+
+    revit.set_connection(object())
+    assert monitor.is_available("revit") is None  # let through until re-probed
+
+    await monitor.probe("revit")
+    assert monitor.is_available("revit") is True
@@ -0,0 +1,27 @@
+"""Tests for building the configured LLM provider."""
+
+from __future__ import annotations
+
+import dataclasses
+
+from orchestrator.config import Config
+from orchestrator.llm import throttle
+from orchestrator.llm.factory import create_provider
+
+
+async def test_create_provider_installs_configured_pool(monkeypatch):
+    monkeypatch.setattr(throttle, "_pool", None)
+    config = dataclasses.replace(
+        Config.defaults(),
+        llm_provider="stand-in",
+        llm_fallback_provider=None,
+        llm_cache_mode="off",
+        llm_requests_per_minute=120,
+        llm_tokens_per_minute=40_000,
+    )
+
+    create_provider(config)
+
+    pooled = throttle.get_client_pool().get("claude", "key", lambda options: object())
+    assert pooled.limiter.stats["requests_per_minute"] == 120
+    assert pooled.limiter.stats["tokens_per_minute"] == 40_000
@@ -0,0 +1,96 @@
+"""Tests for recording and replaying LLM responses."""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from orchestrator.dispatcher.result import ToolResult
+from orchestrator.llm.base import BaseLLMProvider, LLMResponse, LLMToolCall, Message
+from orchestrator.llm.replay import CachingProvider, ReplayMissError, ResponseStore
+from orchestrator.llm.router import LLMRouter
+from orchestrator.registry.registry import ToolRegistry
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "orchestrator" / "tools"
+
+
+class _ScriptedProvider(BaseLLMProvider):
+    """Asks for one element lookup, then answers."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "scripted"
+
+    async def chat(self, messages, tools=None, temperature=0.0):
+        self.calls += 1
+        if not any(m.role == "tool" for m in messages):
+            call = LLMToolCall(id="call-1", name="revit.get_element_info", arguments={"element_id": 7})
+            return LLMResponse(content="", tool_calls=[call], finish_reason="tool_use")
+        return LLMResponse(content="It is a wall.", tool_calls=[], finish_reason="end_turn")
+
+    def format_tools(self, tool_definitions):
+        return [{"name": t["name"]} for t in tool_definitions]
+
+
+class _Dispatcher:
+    """Returns the same data with a fresh handle and timing on every call."""
+
+    async def dispatch(self, tool_name, args, offload=False):
+        handle = f"r-{random.getrandbits(64):016x}"
+        return ToolResult.ok(
+            {"result_handle": handle, "summary": {"category": "Walls"}},
+            duration_ms=random.randint(1, 500),
+        )
+
+
+def _registry() -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.load_from_directory(TOOLS_DIR)
+    return registry
+
+
+async def _run(provider: BaseLLMProvider):
+    router = LLMRouter(provider, _registry())
+    return await router.run([Message(role="user", content="What is element 7?")], _Dispatcher())
+
+
+async def test_two_turn_agent_run_replays(tmp_path):
+    store = ResponseStore(tmp_path / "llm")
+    live = _ScriptedProvider()
+    recorded = await _run(CachingProvider(live, store, mode="record"))
+    assert live.calls == 2 and recorded.stop_reason == "end_turn"
+
+    offline = _ScriptedProvider()
+    replaying = CachingProvider(offline, store, mode="replay")
+    replayed = await _run(replaying)
+
+    assert offline.calls == 0
+    assert replaying.hits == 2
+    assert replayed.response.content == "It is a wall."
+    # The replayed run's tool result really differs from the recorded one
+    tool_contents = [
+        json.loads(m.content)["data"]["result_handle"]
+        for result in (recorded, replayed)
+        for m in result.messages
+        if m.role == "tool"
+    ]
+    assert tool_contents[0] != tool_contents[1]
+
+
+async def test_changed_tool_data_misses_in_replay(tmp_path):
+    store = ResponseStore(tmp_path / "llm")
+    await _run(CachingProvider(_ScriptedProvider(), store, mode="record"))
+
+    class _OtherData(_Dispatcher):
+        async def dispatch(self, tool_name, args, offload=False):
+            return ToolResult.ok({"summary": {"category": "Doors"}})
+
+    router = LLMRouter(CachingProvider(_ScriptedProvider(), store, mode="replay"), _registry())
+    with pytest.raises(ReplayMissError):
+        await router.run([Message(role="user", content="What is element 7?")], _OtherData())
@@ -0,0 +1,71 @@
+"""Tests for reusing converted messages across requests."""
+
+from __future__ import annotations
+
+from orchestrator.llm.base import LLMToolCall, Message, MessageConversionCache
+
+
+def _convert(message: Message) -> dict:
+    calls = [c.name for c in message.tool_calls or []]
+    return {"role": message.role, "content": message.content, "calls": calls}
+
+
+def test_unchanged_messages_are_converted_once():
+    cache = MessageConversionCache(_convert)
+    history = [Message(role="user", content="List the levels")]
+    first = cache.convert(history)
+
+    history.append(Message(role="assistant", content="Three levels"))
+    second = cache.convert(history)
+
+    assert second[0] is first[0]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_replaced_content_or_tool_calls_are_converted_again():
+    cache = MessageConversionCache(_convert)
+    message = Message(role="assistant", content="Checking")
+    before = cache.convert([message])[0]
+
+    message.content = "Checking the walls"
+    after_content = cache.convert([message])[0]
+    assert after_content is not before and after_content["content"] == "Checking the walls"
+
+    message.tool_calls = [LLMToolCall(id="c1", name="revit.get_element_info", arguments={})]
+    after_calls = cache.convert([message])[0]
+    assert after_calls is not after_content and after_calls["calls"] == ["revit.get_element_info"]
+
+    assert cache.convert([message])[0] is after_calls
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = MessageConversionCache(_convert, max_entries=2)
+    a, b, c = (Message(role="user", content=text) for text in "abc")
+    cache.convert([a, b])
+    cache.convert([a])  # b is now the least recently used
+    cache.convert([c])
+
+    assert len(cache) == 2
+    misses = cache.misses
+    cache.convert([a, c])
+    assert cache.misses == misses
+    cache.convert([b])
+    assert cache.misses == misses + 1
+
+
+def test_token_estimates_follow_the_cached_message():
+    counted = []
+
+    def estimate(message: Message) -> int:
+        counted.append(message)
+        return len(message.content)
+
+    cache = MessageConversionCache(_convert, estimate=estimate)
+    message = Message(role="tool", content="x" * 40, tool_call_id="c1")
+    cache.convert([message])
+
+    assert cache.tokens([message]) == cache.tokens([message]) == 40
+    message.content = "short"
+    assert cache.tokens([message]) == 5  # stale entry is not used
+    assert len(counted) == 2
@@ -0,0 +1,62 @@
+"""Tests for script output capture, log retention and the script subprocess."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from orchestrator.adapters.output_capture import CaptureLimits, OutputCapture, prune_logs
+from orchestrator.handlers import pyrevit_run_script
+
+
+def test_spills_to_spill_dir_and_reports_lines(tmp_path):
+    lines = []
+    limits = CaptureLimits(memory_bytes=64, preview_bytes=16, spill_dir=tmp_path)
+    capture = OutputCapture("stdout", limits, on_line=lambda stream, line: lines.append(line))
+    for i in range(20):
+        capture.write(f"line {i}\n")
+    capture.close()
+
+    assert capture.log_path is not None and capture.log_path.parent == tmp_path
+    assert capture.log_path.read_text(encoding="utf-8").count("\n") == 20
+    assert lines == [f"line {i}" for i in range(20)]
+    assert "bytes truncated" in capture.preview()
+
+
+def test_prune_logs_by_age_then_size(tmp_path):
+    now = time.time()
+    for name, age in [("old", 7200), ("mid", 60), ("new", 0)]:
+        path = tmp_path / f"orchestrator-{name}.stdout.log"
+        path.write_text("x" * 100, encoding="utf-8")
+        os.utime(path, (now - age, now - age))
+    (tmp_path / "unrelated.txt").write_text("keep", encoding="utf-8")
+
+    assert prune_logs(tmp_path, ttl_seconds=3600, max_bytes=150) == 2
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert remaining == ["orchestrator-new.stdout.log", "unrelated.txt"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as the pyrevit CLI")
+async def test_cancelled_script_process_is_killed(tmp_path, monkeypatch):
+    pid_file = tmp_path / "pid"
+    cli = tmp_path / "pyrevit"
+    cli.write_text(f"#!/bin/sh\necho $$ > {pid_file}\nexec sleep 60\n", encoding="utf-8")
+    cli.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    task = asyncio.create_task(pyrevit_run_script.execute({"script_path": "script.py"}))
+    for _ in range(100):
+        if pid_file.exists() and pid_file.read_text().strip():
+            break
+        await asyncio.sleep(0.05)
+    pid = int(pid_file.read_text())
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
@@ -0,0 +1,44 @@
+"""Tests for the pyRevit worker pool, with the worker run on this Python."""
+
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from orchestrator.adapters.pyrevit_pool import WORKER_SCRIPT, PyRevitWorkerPool
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "hello.py"
+    path.write_text("import os\nprint('hello ' + os.environ['WHO'])\n", encoding="utf-8")
+    return str(path)
+
+
+async def test_runs_script_and_streams_output(script):
+    pool = PyRevitWorkerPool(size=1, command=[sys.executable, str(WORKER_SCRIPT)])
+    output = []
+    try:
+        result = await pool.run(script, {"WHO": "revit"}, on_output=lambda s, d: output.append(d))
+    finally:
+        await pool.close()
+    assert result["exit_code"] == 0
+    assert "hello revit" in "".join(output)
+    assert result["rss_mb"] > 0
+
+
+async def test_dead_idle_worker_is_closed_and_replaced(script):
+    pool = PyRevitWorkerPool(size=1, command=[sys.executable, str(WORKER_SCRIPT)])
+    try:
+        await pool.run(script, {"WHO": "a"})
+        (dead,) = pool._idle
+        dead._proc.kill()
+        await dead._proc.wait()
+
+        result = await pool.run(script, {"WHO": "b"})
+        assert result["exit_code"] == 0
+        assert dead._proc.stdin.is_closing()
+        assert pool._idle and pool._idle[0] is not dead
+    finally:
+        await pool.close()
@@ -0,0 +1,105 @@
+"""Tests for paged bulk element reads and merging their columnar pages."""
+
+from __future__ import annotations
+
+from orchestrator.adapters.revit_addin import RevitAddinAdapter
+from orchestrator.handlers import revit_query_elements
+from orchestrator.handlers.revit_query_elements import decode_column, merge_pages
+
+
+def _page(ids, levels, total, missing=None):
+    strings = list(dict.fromkeys(level for level in levels if level is not None))
+    page = {
+        "total": total,
+        "count": len(ids),
+        "columns": {
+            "element_id": ids,
+            "level": {
+                "dict": strings,
+                "codes": [None if v is None else strings.index(v) for v in levels],
+            },
+        },
+    }
+    if missing:
+        page["missing_ids"] = missing
+    return page
+
+
+def test_merge_pages_shares_one_dictionary():
+    pages = [
+        _page([1, 2], ["L1", "L2"], 5, missing=[99]),
+        _page([3, 4], ["L2", "L3"], 5),
+        {"total": 5, "count": 1, "columns": {"element_id": [5], "level": [None]}},
+    ]
+    merged = merge_pages(pages)
+
+    assert merged["total"] == 5 and merged["count"] == 5
+    assert merged["missing_ids"] == [99]
+    assert merged["columns"]["element_id"] == [1, 2, 3, 4, 5]
+    level = merged["columns"]["level"]
+    assert level["dict"] == ["L1", "L2", "L3"]
+    assert decode_column(level) == ["L1", "L2", "L2", "L3", None]
+
+
+def test_merge_pages_fills_columns_a_page_lacks():
+    pages = [
+        {"total": 3, "count": 2, "columns": {"element_id": [1, 2], "Mark": ["A", 7]}},
+        {"total": 3, "count": 1, "columns": {"element_id": [3]}},
+    ]
+    merged = merge_pages(pages)
+    assert merged["columns"]["Mark"] == ["A", 7, None]
+
+
+class _Connection:
+    """Fake add-in that caps pages at `cap` elements and hands out a query token."""
+
+    def __init__(self, total: int, cap: int) -> None:
+        self.total = total
+        self.cap = cap
+        self.calls = []
+
+    async def send_and_wait(self, message):
+        args = message["payload"]["args"]
+        self.calls.append(args)
+        offset, limit = args["offset"], min(args["limit"], self.cap)
+        ids = list(range(offset, min(offset + limit, self.total)))
+        end = offset + len(ids)
+        data = {
+            "total": self.total,
+            "offset": offset,
+            "count": len(ids),
+            "columns": {"element_id": ids},
+            "next_offset": end if end < self.total else None,
+        }
+        if end < self.total:
+            data["query_token"] = "tok"
+        return {"payload": {"success": True, "data": data}}
+
+
+async def test_pages_follow_the_returned_stride_and_token():
+    connection = _Connection(total=2500, cap=700)
+    adapter = RevitAddinAdapter()
+    adapter.set_connection(connection)
+
+    result = await adapter.execute(
+        "revit.query_elements", {"categories": ["Walls"]}, revit_query_elements
+    )
+
+    assert result.success
+    assert result.data["columns"]["element_id"] == list(range(2500))
+    assert [c["offset"] for c in connection.calls] == [0, 700, 1400, 2100]
+    assert "query_token" not in connection.calls[0]
+    assert all(c["query_token"] == "tok" for c in connection.calls[1:])
+
+
+async def test_max_elements_limits_the_last_page():
+    connection = _Connection(total=5000, cap=5000)
+    adapter = RevitAddinAdapter()
+    adapter.set_connection(connection)
+
+    result = await adapter.execute(
+        "revit.query_elements", {"categories": ["Walls"], "max_elements": 1500}, revit_query_elements
+    )
+
+    assert result.data["count"] == 1500 and result.data["truncated"]
+    assert [(c["offset"], c["limit"]) for c in connection.calls] == [(0, 1000), (1000, 500)]
@@ -0,0 +1,65 @@
+"""Tests for registry hot-reload of changed tool files."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from orchestrator.registry.registry import ToolRegistry
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "orchestrator" / "tools"
+
+
+def _write_tool(path: Path, name: str, description: str = "Looks up an element") -> None:
+    definition = json.loads((TOOLS_DIR / "revit.get_element_info.json").read_text(encoding="utf-8"))
+    definition.update(name=name, description=description)
+    path.write_text(json.dumps(definition), encoding="utf-8")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    _write_tool(tmp_path / "a.json", "revit.a")
+    _write_tool(tmp_path / "b.json", "revit.b")
+    registry = ToolRegistry()
+    registry.load_from_directory(tmp_path)
+    return registry
+
+
+def test_renamed_tool_replaces_old_name(tmp_path, registry):
+    changes = []
+    registry.on_change(changes.append)
+    _write_tool(tmp_path / "a.json", "revit.a2")
+
+    change = registry.reload_files({tmp_path / "a.json"})
+
+    assert change.added == {"revit.a2"} and change.removed == {"revit.a"}
+    assert not change.modified
+    assert registry.get("revit.a") is None
+    assert sorted(registry.list_tool_names()) == ["revit.a2", "revit.b"]
+    assert changes == [change]
+
+    # Deleting the renamed file removes the new name, not the old one
+    (tmp_path / "a.json").unlink()
+    change = registry.reload_files({tmp_path / "a.json"})
+    assert change.removed == {"revit.a2"}
+    assert registry.list_tool_names() == ("revit.b",)
+
+
+def test_swapped_names_are_modifications(tmp_path, registry):
+    _write_tool(tmp_path / "a.json", "revit.b", "Now from a")
+    _write_tool(tmp_path / "b.json", "revit.a", "Now from b")
+
+    change = registry.reload_files({tmp_path / "a.json", tmp_path / "b.json"})
+
+    assert change.modified == {"revit.a", "revit.b"}
+    assert not change.added and not change.removed
+    assert registry.get("revit.b")["description"] == "Now from a"
+
+
+def test_unchanged_and_invalid_files_are_not_reported(tmp_path, registry):
+    (tmp_path / "b.json").write_text("{ half written", encoding="utf-8")
+    change = registry.reload_files({tmp_path / "a.json", tmp_path / "b.json"})
+    assert not change
+    assert sorted(registry.list_tool_names()) == ["revit.a", "revit.b"]
@@ -0,0 +1,90 @@
+"""Tests for large-result handles: paging, spilling and eviction."""
+
+from __future__ import annotations
+
+import pytest
+
+from orchestrator.dispatcher.result import ToolResult
+from orchestrator.dispatcher.result_store import ResultNotFoundError, ResultStore
+from orchestrator.sessions import current_session
+
+
+def _rows(count: int, pad: int = 0) -> list[dict]:
+    return [{"id": i, "name": f"Wall {i}", "pad": "x" * pad} for i in range(count)]
+
+
+def _offload(store: ResultStore, data) -> str:
+    result = store.offload("revit.query_elements", ToolResult.ok(data))
+    assert result.data["stored"]
+    return result.data["result_handle"]
+
+
+def test_small_results_are_returned_unchanged():
+    store = ResultStore(inline_bytes=1024)
+    result = ToolResult.ok({"count": 1})
+    assert store.offload("revit.get_element_info", result) is result
+    assert store.stats["entries"] == 0
+
+
+def test_pages_cover_every_item_once():
+    store = ResultStore(inline_bytes=100)
+    handle = _offload(store, {"elements": _rows(23)})
+
+    items, offset = [], 0
+    while offset is not None:
+        page = store.read(handle, path="elements", offset=offset, limit=10, fields=["id"])
+        assert page["total"] == 23
+        items.extend(page["items"])
+        offset = page["next_offset"]
+
+    assert items == [{"id": i} for i in range(23)]
+    assert store.read(handle, path="elements.5.name")["value"] == "Wall 5"
+    with pytest.raises(KeyError):
+        store.read(handle, path="walls")
+
+
+def test_least_recently_used_spill_then_evict(tmp_path):
+    # Each result is 3400 bytes: two fit in memory and one on disk
+    store = ResultStore(inline_bytes=100, memory_bytes=8_500, disk_bytes=5_100, spill_dir=tmp_path)
+    first = _offload(store, _rows(10, pad=300))
+    second = _offload(store, _rows(10, pad=300))
+    store.get(first)  # now the most recently used
+    third = _offload(store, _rows(10, pad=300))
+
+    # The second result spilled to disk but still reads back whole
+    assert store.spilled == 1 and store.evicted == 0
+    assert list(tmp_path.iterdir()) == [tmp_path / f"{second}.json"]
+    assert store.read(second, offset=9, limit=5)["items"][0]["id"] == 9
+
+    # The next spill goes past disk_bytes and drops the least recently used
+    fourth = _offload(store, _rows(10, pad=300))
+    assert store.spilled == 2 and store.evicted == 1
+    with pytest.raises(ResultNotFoundError):
+        store.get(first)
+    for handle in (second, third, fourth):
+        assert len(store.get(handle)) == 10
+    assert store.stats == {
+        "entries": 3,
+        "memory_bytes": 6_800,
+        "disk_bytes": 3_400,
+        "offloaded": 4,
+        "spilled": 2,
+        "evicted": 1,
+    }
+
+
+def test_expired_and_foreign_handles_are_not_found():
+    store = ResultStore(inline_bytes=100, ttl_seconds=0)
+    handle = _offload(store, _rows(10))
+    with pytest.raises(ResultNotFoundError):
+        store.get(handle)
+
+    store = ResultStore(inline_bytes=100)
+    handle = _offload(store, _rows(10))
+    token = current_session.set("other-session")
+    try:
+        with pytest.raises(ResultNotFoundError):
+            store.get(handle)
+    finally:
+        current_session.reset(token)
+    assert store.get(handle)[0]["id"] == 0
@@ -0,0 +1,67 @@
+"""Tests for fair admission of tool calls across MCP sessions."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from orchestrator.sessions import FairScheduler, SessionBusyError
+
+
+async def _run_calls(scheduler: FairScheduler, calls: list[str]) -> list[str]:
+    """Start `calls` in order; return the order in which they got a slot."""
+    order: list[str] = []
+    gate = asyncio.Event()
+
+    async def call(session_id: str) -> None:
+        async with scheduler.slot(session_id):
+            order.append(session_id)
+            await gate.wait()
+
+    tasks = [asyncio.create_task(call(s)) for s in calls]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_sessions_take_turns():
+    scheduler = FairScheduler(max_concurrent=1, per_session=1)
+    order = await _run_calls(scheduler, ["a"] * 4 + ["b", "c"])
+
+    # A burst from one session does not hold back the others
+    assert order == ["a", "a", "b", "c", "a", "a"]
+    assert scheduler.stats["running"] == 0 and scheduler.stats["waiting"] == 0
+
+
+async def test_per_session_limit_leaves_room_for_others():
+    scheduler = FairScheduler(max_concurrent=4, per_session=2)
+    async with scheduler.slot("a"), scheduler.slot("a"):
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        async with scheduler.slot("b"):
+            assert scheduler.stats["sessions"]["b"]["running"] == 1
+    await waiting
+    scheduler.release("a")
+    assert scheduler.stats["running"] == 0
+
+
+async def test_full_queue_is_rejected_and_cancelled_waiters_leave():
+    scheduler = FairScheduler(max_concurrent=1, per_session=1, max_queued_per_session=1)
+    await scheduler.acquire("a")
+    waiting = asyncio.create_task(scheduler.acquire("a"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SessionBusyError):
+        await scheduler.acquire("a")
+    assert scheduler.rejected == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    scheduler.release("a")
+    assert scheduler.stats["running"] == 0 and scheduler.stats["waiting"] == 0
+    scheduler.forget("a")
+    assert scheduler.stats["sessions"] == {}
@@ -0,0 +1,69 @@
+"""Tests for spatial index queries, checked against a linear scan."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from benchmarks.spatial_index import PLATE_FT, STOREY_FT, make_entries
+from orchestrator.spatial_index import SpatialEntry, SpatialIndex
+
+SLAB = SpatialEntry(-1, "Floors", (0.0, 0.0, -1.0, PLATE_FT, PLATE_FT, 0.0))
+
+
+@pytest.fixture(scope="module")
+def model():
+    rng = random.Random(7)
+    entries = make_entries(3000, rng) + [SLAB]  # the slab spans too many cells to grid
+    index = SpatialIndex(cell_size=10.0)
+    for entry in entries:
+        index.insert(entry)
+    points = [
+        (rng.uniform(0, PLATE_FT), rng.uniform(0, PLATE_FT), STOREY_FT * rng.randrange(5) + 4)
+        for _ in range(40)
+    ]
+    return index, entries, points
+
+
+def test_nearby_matches_linear_scan(model):
+    index, entries, points = model
+    assert index.stats["large_elements"] == 1
+    for point in points:
+        found = index.nearby(point, 25.0)
+        expected = sorted(e.element_id for e in entries if e.distance(point) <= 25.0)
+        assert sorted(e.element_id for _, e in found) == expected
+        assert [d for d, _ in found] == sorted(d for d, _ in found)
+
+        walls = index.nearby(point, 25.0, categories={"walls"})
+        assert {e.category for _, e in walls} <= {"Walls"}
+
+
+def test_nearest_matches_linear_scan(model):
+    index, entries, points = model
+    for point in points:
+        found = index.nearest(point, k=5)
+        expected = sorted(e.distance(point) for e in entries)[:5]
+        assert [d for d, _ in found] == pytest.approx(expected)
+
+        far = index.nearest(point, k=3, categories={"floors"})
+        assert [e.element_id for _, e in far] == [SLAB.element_id]
+
+
+def test_intersecting_matches_linear_scan(model):
+    index, entries, points = model
+    for x, y, z in points:
+        box = (x, y, z, x + 20, y + 20, z + 1)
+        expected = sorted(e.element_id for e in entries if e.intersects(box))
+        assert [e.element_id for e in index.intersecting(box)] == expected
+
+
+def test_reinserted_and_removed_entries_move():
+    index = SpatialIndex(cell_size=10.0)
+    index.insert(SpatialEntry(1, "Furniture", (0, 0, 0, 1, 1, 1)))
+    index.insert(SpatialEntry(1, "Furniture", (100, 100, 0, 101, 101, 1)))
+
+    assert index.nearby((0, 0, 0), 5.0) == []
+    assert [e.element_id for _, e in index.nearby((100, 100, 0), 5.0)] == [1]
+    assert index.remove(1) and not index.remove(1)
+    assert len(index) == 0 and index.stats["cells"] == 0
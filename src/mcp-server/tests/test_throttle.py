@@ -0,0 +1,74 @@
+"""Tests for the shared LLM client pool and its rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from orchestrator.llm.throttle import ClientPool, RateLimiter, ToolTokenCache, key_fingerprint
+
+
+class _Client:
+    def __init__(self, http_options):
+        self.http_options = http_options
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_clients_per_loop_share_one_limiter_per_key():
+    pool = ClientPool(requests_per_minute=600)
+
+    async def get(key):
+        return pool.get("claude", key, _Client)
+
+    async def same_loop():
+        first, again, other_key = await get("key-a"), await get("key-a"), await get("key-b")
+        assert first is again and first.limiter is not other_key.limiter
+        return first
+
+    first = asyncio.run(same_loop())
+    second = asyncio.run(get("key-a"))
+
+    assert second.client is not first.client
+    assert second.limiter is first.limiter
+    assert set(pool.stats) == {f"claude:{key_fingerprint('key-a')}", f"claude:{key_fingerprint('key-b')}"}
+    assert "key-a" not in "".join(pool.stats)
+
+
+def test_limiter_is_usable_from_successive_loops():
+    limiter = RateLimiter(requests_per_minute=6000)
+
+    async def burst():
+        await asyncio.gather(*(limiter.acquire(10) for _ in range(3)))
+
+    asyncio.run(burst())
+    asyncio.run(burst())
+    assert limiter.stats["requests"] == 6
+
+
+async def test_close_closes_this_loops_clients():
+    pool = ClientPool()
+    pooled = pool.get("openai", "key", _Client)
+    await pool.close()
+    assert pooled.client.closed
+    assert pool.get("openai", "key", _Client).client is not pooled.client
+
+
+def test_tool_tokens_are_counted_once_per_tool(monkeypatch):
+    tools = [{"name": f"revit.t{i}", "description": "x" * 400} for i in range(3)]
+    cache = ToolTokenCache()
+    serialized = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(
+        "orchestrator.llm.throttle.json.dumps",
+        lambda value, **kw: serialized.append(value) or real_dumps(value, **kw),
+    )
+
+    total = cache.tokens(tools)
+    assert total == sum(len(real_dumps(t)) // 4 for t in tools)
+    assert cache.tokens(tools) == total  # same list
+    assert cache.tokens(tools[:2]) < total  # new list of the same tools
+    assert cache.tokens(None) == 0
+    assert len(serialized) == 3
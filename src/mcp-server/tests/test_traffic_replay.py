@@ -0,0 +1,53 @@
+"""Tests for traffic capture and replaying a capture as load."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.replay import read_only_calls, replay
+from orchestrator.registry.registry import ToolRegistry
+from orchestrator.traffic import TrafficRecorder, load_calls
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "orchestrator" / "tools"
+
+
+def _capture(path: Path) -> None:
+    recorder = TrafficRecorder(path)
+    for i, tool in enumerate(["revit.get_element_info", "revit.create_wall", "custom.unknown"]):
+        recorder.record("mcp", "call", id=i, s="s-1", tool=tool, args={"n": i})
+        recorder.record("mcp", "result", id=i, ok=True, ms=5.0, bytes=10)
+    recorder.close()
+
+
+def test_capture_round_trip_and_read_only_filter(tmp_path):
+    path = tmp_path / "capture.jsonl.gz"
+    _capture(path)
+    calls = load_calls(path)
+    assert [(c.tool, c.args, c.session, c.ok) for c in calls] == [
+        ("revit.get_element_info", {"n": 0}, "s-1", True),
+        ("revit.create_wall", {"n": 1}, "s-1", True),
+        ("custom.unknown", {"n": 2}, "s-1", True),
+    ]
+
+    registry = ToolRegistry()
+    registry.load_from_directory(TOOLS_DIR)
+    kept, skipped = read_only_calls(calls, registry)
+
+    assert [c.tool for c in kept] == ["revit.get_element_info"]
+    assert skipped == {"revit.create_wall": 1, "custom.unknown": 1}
+
+
+async def test_replay_reports_errors_per_code(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    _capture(path)
+    sent = []
+
+    async def send(call):
+        sent.append(call.tool)
+        return (call.tool != "custom.unknown", None if call.tool != "custom.unknown" else "TOOL_NOT_FOUND")
+
+    report = await replay(load_calls(path), send, speed=0, concurrency=2)
+
+    assert sorted(sent) == sorted(["revit.get_element_info", "revit.create_wall", "custom.unknown"])
+    assert report["calls"] == 3
+    assert report["errors"] == {"TOOL_NOT_FOUND": 1}
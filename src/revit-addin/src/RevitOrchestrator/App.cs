@@ -75,5 +75,6 @@ public sealed class App : IExternalApplication
     {
         CommandDispatcher.Register(new GetElementInfoCommand());
         CommandDispatcher.Register(new CreateWallCommand());
+        CommandDispatcher.Register(new QueryElementsCommand());
     }
 }
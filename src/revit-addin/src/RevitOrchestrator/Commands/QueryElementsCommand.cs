@@ -0,0 +1,283 @@
+using System.Text.Json;
+using Autodesk.Revit.DB;
+using RevitOrchestrator.Execution;
+using RevitOrchestrator.Models;
+
+namespace RevitOrchestrator.Commands;
+
+/// <summary>
+/// Returns one page of a bulk element query as columns.
+/// </summary>
+/// <remarks>
+/// Elements are selected by id or by category and ordered by id. The first
+/// page runs the query once and, if more pages follow, returns a
+/// "query_token"; later pages that pass it are cut from the same cached id
+/// list, so paging does not re-run the collector and pages stay consistent
+/// if the model changes in between. Elements deleted since the first page
+/// are skipped. Each requested field becomes one array with a value per
+/// element. Columns whose values are all strings are dictionary encoded:
+/// distinct strings are listed once in "dict" and "codes" holds an index
+/// (or null) per element.
+/// </remarks>
+public sealed class QueryElementsCommand : IRevitCommand
+{
+    private const int MaxPageSize = 5000;
+    private const int MaxCachedQueries = 8;
+    private static readonly TimeSpan CachedQueryLifetime = TimeSpan.FromMinutes(5);
+
+    private sealed record CachedQuery(Document Document, List<ElementId> Ids, List<long> Missing)
+    {
+        public DateTime LastUsed { get; set; } = DateTime.UtcNow;
+    }
+
+    private static readonly Dictionary<string, CachedQuery> CachedQueries = new();
+
+    private static readonly string[] DefaultFields = { "category", "name", "level" };
+
+    public string ToolName => "revit.query_elements";
+    public bool RequiresTransaction => false;
+
+    public ToolResult Execute(Document doc, JsonElement args)
+    {
+        var offset = args.TryGetProperty("offset", out var o) ? o.GetInt32() : 0;
+        var limit = args.TryGetProperty("limit", out var l) ? Math.Min(l.GetInt32(), MaxPageSize) : 1000;
+        var fields = ReadStrings(args, "fields") ?? DefaultFields.ToList();
+        var parameters = ReadStrings(args, "parameters") ?? new List<string>();
+
+        var token = args.TryGetProperty("query_token", out var t) ? t.GetString() : null;
+        var query = token is null ? null : LookupQuery(token, doc);
+        var fresh = query is null;
+        if (fresh)
+        {
+            var error = RunQuery(doc, args, out query);
+            if (error is not null)
+                return error;
+        }
+        var ids = query!.Ids;
+
+        var slice = ids.Skip(offset).Take(limit).ToList();
+        var page = slice.Select(doc.GetElement).OfType<Element>().ToList();
+        var columns = new Dictionary<string, object?>
+        {
+            ["element_id"] = page.Select(e => (object?)e.Id.Value).ToList(),
+        };
+        foreach (var field in fields)
+            columns[field] = Encode(page.Select(e => FieldValue(doc, e, field)).ToList());
+        foreach (var name in parameters)
+            columns[name] = Encode(page.Select(e => ParameterValue(e.LookupParameter(name))).ToList());
+
+        var end = offset + slice.Count;
+        var data = new Dictionary<string, object?>
+        {
+            ["total"] = ids.Count,
+            ["offset"] = offset,
+            ["count"] = page.Count,
+            ["columns"] = columns,
+            ["next_offset"] = end < ids.Count ? end : null,
+        };
+        if (offset == 0 && query.Missing.Count > 0)
+            data["missing_ids"] = query.Missing;
+        if (end < ids.Count)
+            data["query_token"] = fresh ? StoreQuery(query, token) : token;
+        return ToolResult.Ok("", data);
+    }
+
+    /// <summary>
+    /// Select and order the element ids of a query.
+    /// </summary>
+    /// <returns>A failed result if the arguments are invalid, otherwise null.</returns>
+    private static ToolResult? RunQuery(Document doc, JsonElement args, out CachedQuery? query)
+    {
+        query = null;
+        List<ElementId> ids;
+        var missing = new List<long>();
+        var requestedIds = ReadIds(args);
+        if (requestedIds is not null)
+        {
+            ids = new List<ElementId>();
+            foreach (var id in requestedIds.Distinct().OrderBy(i => i))
+            {
+#if REVIT2025 || REVIT2026
+                var elementId = new ElementId(id);
+#else
+                var elementId = new ElementId((int)id);
+#endif
+                if (doc.GetElement(elementId) is null)
+                    missing.Add(id);
+                else
+                    ids.Add(elementId);
+            }
+        }
+        else if (ReadStrings(args, "categories") is { } categoryNames)
+        {
+            var categoryIds = new List<ElementId>();
+            foreach (var name in categoryNames)
+            {
+                var category = FindCategory(doc, name);
+                if (category is null)
+                {
+                    return ToolResult.Fail("", "REVIT_API_ERROR",
+                        $"Unknown category '{name}'");
+                }
+                categoryIds.Add(category.Id);
+            }
+            ids = new FilteredElementCollector(doc)
+                .WhereElementIsNotElementType()
+                .WherePasses(new ElementMulticategoryFilter(categoryIds))
+                .ToElementIds()
+                .OrderBy(id => id.Value)
+                .ToList();
+        }
+        else
+        {
+            return ToolResult.Fail("", "SCHEMA_VALIDATION_FAILED",
+                "Either element_ids or categories is required");
+        }
+
+        query = new CachedQuery(doc, ids, missing);
+        return null;
+    }
+
+    private static CachedQuery? LookupQuery(string token, Document doc)
+    {
+        lock (CachedQueries)
+        {
+            if (!CachedQueries.TryGetValue(token, out var query))
+                return null;
+            if (!query.Document.Equals(doc) || DateTime.UtcNow - query.LastUsed > CachedQueryLifetime)
+            {
+                CachedQueries.Remove(token);
+                return null;
+            }
+            query.LastUsed = DateTime.UtcNow;
+            return query;
+        }
+    }
+
+    /// <summary>
+    /// Cache a query's ids under <paramref name="token"/> (an expired token
+    /// is reused) or a new token, evicting expired and least recently used
+    /// queries.
+    /// </summary>
+    private static string StoreQuery(CachedQuery query, string? token)
+    {
+        token ??= Guid.NewGuid().ToString("N");
+        lock (CachedQueries)
+        {
+            var now = DateTime.UtcNow;
+            foreach (var stale in CachedQueries.Where(q => now - q.Value.LastUsed > CachedQueryLifetime)
+                         .Select(q => q.Key).ToList())
+                CachedQueries.Remove(stale);
+            while (CachedQueries.Count >= MaxCachedQueries)
+                CachedQueries.Remove(CachedQueries.MinBy(q => q.Value.LastUsed).Key);
+            CachedQueries[token] = query;
+        }
+        return token;
+    }
+
+    private static object? FieldValue(Document doc, Element element, string field)
+    {
+        switch (field)
+        {
+            case "category":
+                return element.Category?.Name;
+            case "type_name":
+                return element.GetType().Name;
+            case "family_type":
+                var typeId = element.GetTypeId();
+                return typeId == ElementId.InvalidElementId ? null : doc.GetElement(typeId)?.Name;
+            case "name":
+                return element.Name;
+            case "level":
+                return element.LevelId == ElementId.InvalidElementId
+                    ? null
+                    : doc.GetElement(element.LevelId)?.Name;
+            case "bounding_box":
+                var bb = element.get_BoundingBox(null);
+                return bb is null
+                    ? null
+                    : new[] { bb.Min.X, bb.Min.Y, bb.Min.Z, bb.Max.X, bb.Max.Y, bb.Max.Z };
+            case "location":
+                return element.Location switch
+                {
+                    LocationPoint point => new[] { point.Point.X, point.Point.Y, point.Point.Z },
+                    LocationCurve curve => new[]
+                    {
+                        curve.Curve.GetEndPoint(0).X, curve.Curve.GetEndPoint(0).Y, curve.Curve.GetEndPoint(0).Z,
+                        curve.Curve.GetEndPoint(1).X, curve.Curve.GetEndPoint(1).Y, curve.Curve.GetEndPoint(1).Z,
+                    },
+                    _ => null,
+                };
+            default:
+                return null;
+        }
+    }
+
+    private static object? ParameterValue(Parameter? param)
+    {
+        if (param is null || !param.HasValue) return null;
+        return param.StorageType switch
+        {
+            StorageType.String => param.AsString(),
+            StorageType.Integer => param.AsInteger(),
+            StorageType.Double => param.AsDouble(),
+            StorageType.ElementId => param.AsElementId().Value,
+            _ => null,
+        };
+    }
+
+    /// <summary>
+    /// Dictionary-encode a column whose values are all strings (or null).
+    /// </summary>
+    private static object Encode(List<object?> values)
+    {
+        if (!values.All(v => v is null || v is string) || values.All(v => v is null))
+            return values;
+
+        var index = new Dictionary<string, int>();
+        var dict = new List<string>();
+        var codes = new List<int?>(values.Count);
+        foreach (var value in values)
+        {
+            if (value is not string s)
+            {
+                codes.Add(null);
+                continue;
+            }
+            if (!index.TryGetValue(s, out var code))
+            {
+                code = dict.Count;
+                index[s] = code;
+                dict.Add(s);
+            }
+            codes.Add(code);
+        }
+        return new Dictionary<string, object?> { ["dict"] = dict, ["codes"] = codes };
+    }
+
+    private static Category? FindCategory(Document doc, string name)
+    {
+        if (name.StartsWith("OST_") && Enum.TryParse<BuiltInCategory>(name, out var builtIn))
+            return Category.GetCategory(doc, builtIn);
+        foreach (Category category in doc.Settings.Categories)
+        {
+            if (string.Equals(category.Name, name, StringComparison.OrdinalIgnoreCase))
+                return category;
+        }
+        return null;
+    }
+
+    private static List<string>? ReadStrings(JsonElement args, string name)
+    {
+        if (!args.TryGetProperty(name, out var array) || array.ValueKind != JsonValueKind.Array)
+            return null;
+        return array.EnumerateArray().Select(v => v.GetString() ?? "").ToList();
+    }
+
+    private static List<long>? ReadIds(JsonElement args)
+    {
+        if (!args.TryGetProperty("element_ids", out var array) || array.ValueKind != JsonValueKind.Array)
+            return null;
+        return array.EnumerateArray().Select(v => v.GetInt64()).ToList();
+    }
+}